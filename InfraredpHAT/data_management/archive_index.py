@@ -0,0 +1,270 @@
+# data_management/archive_index.py
+# -*- coding: utf-8 -*-
+"""
+Time index for gzipped sensor data archives.
+
+At rollover the rolled CSV log is compressed as a series of independent gzip
+members of BLOCK_LINES lines each. A multi-member file is still an ordinary
+.gz file, but every member can also be decompressed on its own, so the byte
+offset of each member is a seekable checkpoint.
+
+Next to each archive a small JSON sidecar (<archive>.idx.json) records the
+archive's first and last timestamp, row count, per-metric min/max/count, and
+the offset, length and time range of every block. ArchiveCatalog uses the
+sidecars to answer time-range queries by decompressing only the overlapping
+blocks of the overlapping archives.
+"""
+import gzip
+import json
+import logging
+import os
+import re
+import zlib
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx.json"
+BLOCK_LINES = 4096
+
+_ARCHIVE_RE = re.compile(r"sensor_data_\d{8}_\d{6}(_\d+)?\.log\.gz$")
+
+
+def index_path(archive_path):
+    """Returns the sidecar index path for an archive."""
+    return archive_path + INDEX_SUFFIX
+
+
+def _parse_line(line):
+    """Returns (timestamp_ms, sensor_type, metric_type, value) for a data line, or None."""
+    fields = line.rsplit(' - ', 1)[-1].split(',')
+    if len(fields) < 5 or not fields[0].isdigit():
+        return None
+    try:
+        value = float(fields[4])
+    except ValueError:
+        value = None
+    return int(fields[0]), fields[2], fields[3], value
+
+
+class _IndexBuilder:
+    """Accumulates archive-level and block-level statistics while lines are written."""
+    def __init__(self, file_name):
+        self.index = {
+            'version': INDEX_VERSION,
+            'file': file_name,
+            'first_ts_ms': None,
+            'last_ts_ms': None,
+            'rows': 0,
+            'metrics': {},
+            'blocks': [],
+        }
+
+    def add_block(self, lines, offset, length):
+        first_ts_ms = last_ts_ms = None
+        rows = 0
+        metrics = self.index['metrics']
+        for line in lines:
+            parsed = _parse_line(line)
+            if parsed is None:
+                continue
+            timestamp_ms, sensor_type, metric_type, value = parsed
+            rows += 1
+            first_ts_ms = timestamp_ms if first_ts_ms is None else min(first_ts_ms, timestamp_ms)
+            last_ts_ms = timestamp_ms if last_ts_ms is None else max(last_ts_ms, timestamp_ms)
+            if value is None or value != value:
+                continue
+            stats = metrics.setdefault(f"{sensor_type}/{metric_type}", {'min': value, 'max': value, 'count': 0})
+            stats['min'] = min(stats['min'], value)
+            stats['max'] = max(stats['max'], value)
+            stats['count'] += 1
+
+        self.index['blocks'].append({'offset': offset, 'length': length, 'rows': rows,
+                                     'first_ts_ms': first_ts_ms, 'last_ts_ms': last_ts_ms})
+        if rows:
+            self.index['rows'] += rows
+            if self.index['first_ts_ms'] is None or first_ts_ms < self.index['first_ts_ms']:
+                self.index['first_ts_ms'] = first_ts_ms
+            if self.index['last_ts_ms'] is None or last_ts_ms > self.index['last_ts_ms']:
+                self.index['last_ts_ms'] = last_ts_ms
+
+
+def _write_index(archive_path, index):
+    """Writes the sidecar atomically, so readers never see a partial index."""
+    temp_path = index_path(archive_path) + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.replace(temp_path, index_path(archive_path))
+
+
+def write_indexed_archive(source_path, archive_path, block_lines=BLOCK_LINES):
+    """
+    Compresses a rolled CSV log into archive_path as one gzip member per
+    block_lines lines and writes its sidecar index.
+    :return: The index dictionary.
+    """
+    builder = _IndexBuilder(os.path.basename(archive_path))
+    # Written under a temporary name so the archive never appears half-written.
+    temp_path = archive_path + ".tmp"
+    with open(source_path, 'r', encoding='utf-8', errors='replace') as f_in, open(temp_path, 'wb') as f_out:
+        lines = []
+        for line in f_in:
+            lines.append(line)
+            if len(lines) >= block_lines:
+                _write_block(f_out, lines, builder)
+                lines = []
+        if lines or not builder.index['blocks']:
+            _write_block(f_out, lines, builder)
+    os.replace(temp_path, archive_path)
+    index = builder.index
+    index['size'] = os.path.getsize(archive_path)
+    _write_index(archive_path, index)
+    logger.debug(f"ArchiveIndex: Wrote {len(index['blocks'])} block(s), {index['rows']} row(s) for '{archive_path}'.")
+    return index
+
+
+def _write_block(f_out, lines, builder):
+    offset = f_out.tell()
+    f_out.write(gzip.compress(''.join(lines).encode('utf-8')))
+    builder.add_block(lines, offset, f_out.tell() - offset)
+
+
+def build_index(archive_path):
+    """
+    Indexes an archive written without a sidecar (e.g. before indexing existed).
+    The file is scanned once; since it may be a single gzip member it is
+    indexed as one block covering the whole file.
+    :return: The index dictionary.
+    """
+    builder = _IndexBuilder(os.path.basename(archive_path))
+    with gzip.open(archive_path, 'rt', encoding='utf-8', errors='replace') as f:
+        lines = f.readlines()
+    size = os.path.getsize(archive_path)
+    builder.add_block(lines, 0, size)
+    index = builder.index
+    index['size'] = size
+    _write_index(archive_path, index)
+    logger.info(f"ArchiveIndex: Built index for '{archive_path}' ({index['rows']} rows).")
+    return index
+
+
+def load_index(archive_path):
+    """
+    Loads the sidecar index of an archive. Returns None if it is missing,
+    unreadable, from another format version or does not match the archive size.
+    """
+    try:
+        with open(index_path(archive_path), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if index.get('version') != INDEX_VERSION or index.get('size') != os.path.getsize(archive_path):
+        logger.warning(f"ArchiveIndex: Ignoring stale index for '{archive_path}'.")
+        return None
+    return index
+
+
+def _overlaps(first_ts_ms, last_ts_ms, start_ms, end_ms):
+    if first_ts_ms is None:
+        return False
+    return (end_ms is None or first_ts_ms <= end_ms) and (start_ms is None or last_ts_ms >= start_ms)
+
+
+def read_archive_lines(archive_path, start_ms=None, end_ms=None, index=None):
+    """
+    Returns the lines of an archive whose blocks overlap [start_ms, end_ms].
+    Only the overlapping blocks are decompressed when the archive has an index;
+    otherwise the whole archive is. Lines are not filtered individually.
+    """
+    if index is None:
+        index = load_index(archive_path)
+    if index is None:
+        with gzip.open(archive_path, 'rt', encoding='utf-8', errors='replace') as f:
+            return f.read().split('\n')
+
+    lines = []
+    with open(archive_path, 'rb') as f:
+        for block in index['blocks']:
+            if not _overlaps(block['first_ts_ms'], block['last_ts_ms'], start_ms, end_ms):
+                continue
+            f.seek(block['offset'])
+            data = f.read(block['length'])
+            if len(index['blocks']) == 1:
+                # Possibly a multi-member file indexed as a single block.
+                text = gzip.decompress(data)
+            else:
+                text = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(data)
+            lines.extend(text.decode('utf-8', errors='replace').split('\n'))
+    return lines
+
+
+def remove_index(archive_path):
+    """Deletes the sidecar of an archive, if any."""
+    try:
+        os.remove(index_path(archive_path))
+    except FileNotFoundError:
+        pass
+
+
+class ArchiveCatalog:
+    """
+    Time-indexed view of the gzipped archives in a directory, built from their
+    sidecar indexes.
+    """
+    def __init__(self, archive_dir, build_missing=False):
+        """
+        :param archive_dir: Directory holding sensor_data_*.log.gz archives.
+        :param build_missing: Index archives that have no sidecar yet. This
+                              decompresses each such archive once.
+        """
+        self.archive_dir = archive_dir
+        self.build_missing = build_missing
+        self.entries = []
+        self.refresh()
+
+    def refresh(self):
+        """Rescans the archive directory."""
+        entries = []
+        if os.path.isdir(self.archive_dir):
+            for file_name in os.listdir(self.archive_dir):
+                if not _ARCHIVE_RE.match(file_name):
+                    continue
+                path = os.path.join(self.archive_dir, file_name)
+                index = load_index(path)
+                if index is None and self.build_missing:
+                    try:
+                        index = build_index(path)
+                    except (OSError, EOFError, zlib.error) as e:
+                        logger.error(f"ArchiveCatalog: Could not index '{path}': {e}")
+                entries.append((path, index))
+        # Unindexed archives sort first and are always treated as overlapping.
+        entries.sort(key=lambda entry: (entry[1] or {}).get('first_ts_ms') or 0)
+        self.entries = entries
+
+    def query(self, start_ms=None, end_ms=None):
+        """
+        Returns [(archive_path, index)] for archives that may hold data in
+        [start_ms, end_ms], oldest first. index is None for unindexed archives.
+        """
+        return [(path, index) for path, index in self.entries
+                if index is None or _overlaps(index['first_ts_ms'], index['last_ts_ms'], start_ms, end_ms)]
+
+    def metric_range(self, sensor_type, metric_type, start_ms=None, end_ms=None):
+        """
+        Returns (min, max) of a metric over the indexed archives overlapping the
+        range, from the sidecars alone, or None if no archive recorded it.
+        """
+        key = f"{sensor_type}/{metric_type}"
+        ranges = [index['metrics'][key] for _, index in self.query(start_ms, end_ms)
+                  if index is not None and key in index['metrics']]
+        if not ranges:
+            return None
+        return min(r['min'] for r in ranges), max(r['max'] for r in ranges)
+
+    def read_lines(self, start_ms=None, end_ms=None):
+        """
+        Yields the CSV lines of every archive block overlapping [start_ms, end_ms],
+        oldest archive first. Callers filter individual lines by timestamp.
+        """
+        for path, index in self.query(start_ms, end_ms):
+            yield from read_archive_lines(path, start_ms, end_ms, index=index)
@@ -0,0 +1,241 @@
+# data_management/binary_log.py
+# -*- coding: utf-8 -*-
+"""
+Compact append-only binary sensor log.
+
+File layout (little-endian):
+    Header, HEADER_SIZE bytes:
+        magic        8 bytes   b'ANAVIBL\\0'
+        version      uint16
+        record_size  uint16
+        data_offset  uint32    byte offset of the first record (== HEADER_SIZE)
+        table_length uint32    length of the metric table that follows
+        metric table UTF-8 JSON list of [sensor_type, metric_type] pairs; a
+                     record's metric_id is an index into this list. The rest of
+                     the header is zero padding.
+    Records, RECORD_DTYPE (14 bytes each):
+        timestamp_ms int64     capture time in epoch milliseconds
+        metric_id    uint16
+        value        float32   NaN for missing or non-numeric readings
+
+The metric table lives in the fixed-size header and is rewritten in place when a
+new metric appears, so records always start at the same offset and the whole
+record area can be memory-mapped as one NumPy structured array.
+
+Run as a module to export a binary log to CSV:
+    python -m data_management.binary_log Sensor_Logs/sensor_data.bin -o out.csv
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import struct
+import sys
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'ANAVIBL\0'
+FORMAT_VERSION = 1
+HEADER_SIZE = 4096
+_HEADER_STRUCT = struct.Struct('<8sHHII')
+
+RECORD_DTYPE = np.dtype([('timestamp_ms', '<i8'), ('metric_id', '<u2'), ('value', '<f4')])
+
+CSV_HEADER = "timestamp_ms,iso_timestamp,sensor_type,metric_type,value\n"
+
+
+class BinaryLogFormatError(ValueError):
+    """Raised when a file is not a binary sensor log this version can read."""
+
+
+def _encode_header(metric_keys):
+    table = json.dumps([list(key) for key in metric_keys], separators=(',', ':')).encode('utf-8')
+    if _HEADER_STRUCT.size + len(table) > HEADER_SIZE:
+        raise BinaryLogFormatError(f"Metric table of {len(metric_keys)} entries does not fit in the {HEADER_SIZE} byte header.")
+    header = _HEADER_STRUCT.pack(MAGIC, FORMAT_VERSION, RECORD_DTYPE.itemsize, HEADER_SIZE, len(table)) + table
+    return header.ljust(HEADER_SIZE, b'\0')
+
+
+def _decode_header(header_bytes, path):
+    if len(header_bytes) < _HEADER_STRUCT.size:
+        raise BinaryLogFormatError(f"'{path}' is too short to be a binary sensor log.")
+    magic, version, record_size, data_offset, table_length = _HEADER_STRUCT.unpack_from(header_bytes)
+    if magic != MAGIC:
+        raise BinaryLogFormatError(f"'{path}' is not a binary sensor log.")
+    if version != FORMAT_VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise BinaryLogFormatError(f"'{path}' uses unsupported format version {version} (record size {record_size}).")
+    table = header_bytes[_HEADER_STRUCT.size:_HEADER_STRUCT.size + table_length]
+    metric_keys = [tuple(pair) for pair in json.loads(table.decode('utf-8'))] if table_length else []
+    return metric_keys, data_offset
+
+
+def read_header(path):
+    """
+    Reads the header of a binary log.
+    :return: (metric_keys, data_offset) where metric_keys[metric_id] is (sensor_type, metric_type).
+    """
+    with open(path, 'rb') as f:
+        return _decode_header(f.read(HEADER_SIZE), path)
+
+
+def open_binary_log(path):
+    """
+    Memory-maps the records of a binary log for reading.
+    A trailing partial record (e.g. from a power cut mid-write) is ignored.
+    :return: (records, metric_keys) where records is a read-only structured array
+             with RECORD_DTYPE fields.
+    """
+    metric_keys, data_offset = read_header(path)
+    count = max(os.path.getsize(path) - data_offset, 0) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.empty(0, dtype=RECORD_DTYPE), metric_keys
+    records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=data_offset, shape=(count,))
+    return records, metric_keys
+
+
+def select_time_range(records, start_ms=None, end_ms=None):
+    """
+    Returns the records with start_ms <= timestamp_ms <= end_ms. Records are
+    appended in capture order, so this is a binary search plus a zero-copy slice.
+    """
+    timestamps = records['timestamp_ms']
+    lo = 0 if start_ms is None else int(np.searchsorted(timestamps, start_ms, side='left'))
+    hi = len(records) if end_ms is None else int(np.searchsorted(timestamps, end_ms, side='right'))
+    return records[lo:max(lo, hi)]
+
+
+class BinaryLogWriter:
+    """
+    Appends snapshots to a binary sensor log, creating the file if needed.
+    Each snapshot is written with a single write() call.
+    """
+    def __init__(self, path):
+        """
+        Opens or creates the log at path. An existing file must be a valid binary
+        log; a trailing partial record is truncated away before appending.
+        """
+        self.path = path
+        self._metric_ids = {}
+        self.metric_keys = []
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._file = open(path, 'r+b')
+            self.metric_keys, data_offset = _decode_header(self._file.read(HEADER_SIZE), path)
+            self._metric_ids = {key: index for index, key in enumerate(self.metric_keys)}
+            size = os.path.getsize(path)
+            complete = data_offset + max(size - data_offset, 0) // RECORD_DTYPE.itemsize * RECORD_DTYPE.itemsize
+            if complete != size:
+                logger.warning(f"BinaryLogWriter: Truncating {size - complete} bytes of partial record from '{path}'.")
+                self._file.truncate(complete)
+            self._file.seek(complete)
+        else:
+            self._file = open(path, 'w+b')
+            self._file.write(_encode_header(self.metric_keys))
+        logger.info(f"BinaryLogWriter: Opened '{path}' with {len(self.metric_keys)} known metrics.")
+
+    @property
+    def size(self):
+        """Current size of the file in bytes."""
+        return self._file.tell()
+
+    def _metric_id(self, key):
+        metric_id = self._metric_ids.get(key)
+        if metric_id is None:
+            self.metric_keys.append(key)
+            try:
+                header = _encode_header(self.metric_keys)
+            except BinaryLogFormatError:
+                self.metric_keys.pop()
+                raise
+            metric_id = len(self.metric_keys) - 1
+            self._metric_ids[key] = metric_id
+            position = self._file.tell()
+            self._file.seek(0)
+            self._file.write(header)
+            self._file.seek(position)
+        return metric_id
+
+    def append(self, timestamp_ms, sensors):
+        """
+        Appends one record per metric of a snapshot.
+        :param timestamp_ms: Capture time of the snapshot in epoch milliseconds.
+        :param sensors: Dictionary of {sensor_type: {metric_type: value}}.
+        :return: Number of records written.
+        """
+        rows = []
+        for sensor_type, metrics in sensors.items():
+            for metric_type, value in metrics.items():
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    value = np.nan
+                try:
+                    rows.append((timestamp_ms, self._metric_id((sensor_type, metric_type)), value))
+                except BinaryLogFormatError as e:
+                    logger.error(f"BinaryLogWriter: Skipping {sensor_type}/{metric_type}: {e}")
+        if rows:
+            self._file.write(np.array(rows, dtype=RECORD_DTYPE).tobytes())
+        return len(rows)
+
+    def flush(self):
+        self._file.flush()
+
+    def sync(self):
+        """Flushes and fsyncs the file."""
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def export_csv(binary_path, out, start_ms=None, end_ms=None, chunk_rows=65536):
+    """
+    Writes the records of a binary log as CSV.
+    :param out: Path of the CSV file to write, or an open text stream.
+    :param start_ms: Optional inclusive lower bound in epoch milliseconds.
+    :param end_ms: Optional inclusive upper bound in epoch milliseconds.
+    :return: Number of rows written.
+    """
+    records, metric_keys = open_binary_log(binary_path)
+    records = select_time_range(records, start_ms, end_ms)
+    names = [f"{sensor_type},{metric_type}" for sensor_type, metric_type in metric_keys]
+
+    stream = open(out, 'w', encoding='utf-8', newline='') if isinstance(out, str) else out
+    try:
+        stream.write(CSV_HEADER)
+        for chunk_start in range(0, len(records), chunk_rows):
+            chunk = records[chunk_start:chunk_start + chunk_rows]
+            lines = []
+            for timestamp_ms, metric_id, value in zip(chunk['timestamp_ms'].tolist(),
+                                                      chunk['metric_id'].tolist(),
+                                                      chunk['value'].tolist()):
+                iso_timestamp = datetime.datetime.fromtimestamp(timestamp_ms / 1000).isoformat()
+                value_str = "N/A" if value != value else f"{value:.2f}"
+                lines.append(f"{timestamp_ms},{iso_timestamp},{names[metric_id]},{value_str}\n")
+            stream.writelines(lines)
+    finally:
+        if stream is not out:
+            stream.close()
+    logger.info(f"Exported {len(records)} records from '{binary_path}' to CSV.")
+    return len(records)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a binary sensor log to CSV.")
+    parser.add_argument('binary_log', help="Path to a .bin sensor log.")
+    parser.add_argument('-o', '--output', help="CSV file to write (default: stdout).")
+    parser.add_argument('--start-ms', type=int, help="Only export records at or after this epoch-ms timestamp.")
+    parser.add_argument('--end-ms', type=int, help="Only export records at or before this epoch-ms timestamp.")
+    args = parser.parse_args(argv)
+    export_csv(args.binary_log, args.output or sys.stdout, args.start_ms, args.end_ms)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
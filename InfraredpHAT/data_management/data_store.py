@@ -5,8 +5,12 @@ import random
 import collections
 import logging
 import re
+import numpy as np
 from PyQt5.QtCore import pyqtSignal, QObject, pyqtSlot, QDateTime
 
+from data_management.history_buffer import ColumnarHistory
+from data_management.rollup import RollupTier, ROLLUP_TIER_WIDTHS_MS, tier_capacity
+
 logger = logging.getLogger(__name__)
 
 # MOCK_SENSORS is now only used as a fallback or for defining metric properties
@@ -26,6 +30,29 @@ MOCK_SENSORS = {
 }
 
 
+def epoch_ms_to_local_datetime64(timestamps_ms):
+    """
+    Converts epoch-millisecond timestamps to naive local-time datetime64[ms] values,
+    matching the naive local datetimes used elsewhere for plotting.
+    """
+    timestamps_ms = np.asarray(timestamps_ms, dtype=np.int64)
+    if len(timestamps_ms) == 0:
+        return timestamps_ms.astype('datetime64[ms]')
+
+    def offset_ms(ts):
+        return int(datetime.datetime.fromtimestamp(ts / 1000.0).astimezone().utcoffset().total_seconds() * 1000)
+
+    first_offset, last_offset = offset_ms(int(timestamps_ms[0])), offset_ms(int(timestamps_ms[-1]))
+    if first_offset == last_offset:
+        return (timestamps_ms + first_offset).astype('datetime64[ms]')
+    # The range spans a UTC offset change (e.g. DST); resolve each timestamp.
+    return np.array([ts + offset_ms(ts) for ts in timestamps_ms.tolist()], dtype=np.int64).astype('datetime64[ms]')
+
+
+# get_plot_series statistic that plots each rollup bucket as its min and max.
+PLOT_ENVELOPE = 'envelope'
+
+
 # FIX: Inherit from QObject to allow this class to have signals and slots.
 class SensorDataStore(QObject):
     """
@@ -35,6 +62,7 @@ class SensorDataStore(QObject):
     # FIX: Define signals directly in the class
     data_updated = pyqtSignal(dict)
     sensors_discovered = pyqtSignal(dict)
+    history_loaded = pyqtSignal(int)
 
     def __init__(self, settings_manager, parent=None):
         """
@@ -46,10 +74,16 @@ class SensorDataStore(QObject):
         
         self.settings_manager = settings_manager
         self.max_points = self.settings_manager.get_int_setting('General', 'data_store_max_points', fallback=1000)
-        self.data_history = collections.deque(maxlen=self.max_points)
+        self.sampling_interval_ms = self.settings_manager.get_int_setting('General', 'sampling_rate_ms', fallback=3000)
+        self.history = ColumnarHistory(self.max_points)
+        self.rollup_tiers = [RollupTier(width_ms, tier_capacity(width_ms, self.max_points, self.sampling_interval_ms))
+                             for width_ms in ROLLUP_TIER_WIDTHS_MS]
         self.latest_data = {}
         self.available_sensors = {}
         self.metric_info = self._initialize_metric_info()
+        # Bumped on every add_data call; plot series extracted for an older version are stale.
+        self.data_version = 0
+        self._series_cache = {}
         # The nested Signals class is no longer needed.
 
         logger.info(f"SensorDataStore initialized. Max data points: {self.max_points}")
@@ -71,8 +105,12 @@ class SensorDataStore(QObject):
         """
         Adds a new sensor data snapshot to the history.
         This is the primary slot for receiving data from the sensor reader thread.
+        Snapshots may be sparse, holding only the sensors and metrics that were
+        sampled; absent metrics are stored as gaps in the history, and the
+        latest value of each metric is kept for get_latest_data().
         """
-        timestamp = QDateTime.fromMSecsSinceEpoch(data_snapshot['timestamp']).toPyDateTime()
+        timestamp_ms = int(data_snapshot['timestamp'])
+        timestamp = QDateTime.fromMSecsSinceEpoch(timestamp_ms).toPyDateTime()
         
         formatted_snapshot = {
             'timestamp': timestamp,
@@ -83,8 +121,14 @@ class SensorDataStore(QObject):
             for metric_type, details in metrics.items():
                 formatted_snapshot['sensors'][sensor_type][metric_type] = details['value']
         
-        self.data_history.append(formatted_snapshot)
-        self.latest_data = formatted_snapshot
+        self.history.append(timestamp_ms, formatted_snapshot['sensors'])
+        for tier in self.rollup_tiers:
+            tier.add(timestamp_ms, formatted_snapshot['sensors'])
+        self.data_version += 1
+        latest_sensors = {sensor_type: dict(metrics) for sensor_type, metrics in self.latest_data.get('sensors', {}).items()}
+        for sensor_type, metrics in formatted_snapshot['sensors'].items():
+            latest_sensors.setdefault(sensor_type, {}).update(metrics)
+        self.latest_data = {'timestamp': timestamp, 'sensors': latest_sensors}
         self.data_updated.emit(formatted_snapshot) # Use the class's signal
         logger.debug(f"Sensor data added and updated: {timestamp.strftime('%H:%M:%S')}")
 
@@ -101,38 +145,271 @@ class SensorDataStore(QObject):
         """Returns the most recent sensor data snapshot."""
         return self.latest_data
 
-    def get_data_history(self, time_range=None, start_time=None, end_time=None):
+    def set_max_points(self, max_points):
         """
-        Returns a filtered subset of the data history based on a time range string or start/end datetimes.
+        Changes the number of snapshots kept in memory, retaining the newest ones.
+        """
+        self.max_points = int(max_points)
+        self.history.resize(self.max_points)
+        self._resize_rollup_tiers()
+        self.data_version += 1
+
+    def set_sampling_interval(self, sampling_interval_ms):
+        """
+        Updates the expected sampling interval, which sizes the rollup tiers so they
+        span roughly the same time window as the raw history.
+        """
+        self.sampling_interval_ms = int(sampling_interval_ms)
+        self._resize_rollup_tiers()
+        self.data_version += 1
+
+    def history_window_ms(self):
+        """Time span the in-memory history is sized to hold, in milliseconds."""
+        return self.max_points * self.sampling_interval_ms
+
+    def reserve_history(self, rows):
+        """
+        Sets aside room in front of the in-memory history for up to rows older
+        snapshots, so the blocks passed to prepend_history() are written in place.
+        """
+        self.history.reserve_front(rows)
+
+    @pyqtSlot(object)
+    def prepend_history(self, block):
+        """
+        Inserts older history, e.g. read back from the data logs at startup, in
+        front of the samples already in memory. Rows at or after the oldest
+        in-memory sample are ignored, so live data received meanwhile wins.
+        :param block: Tuple (timestamps_ms, columns) with sorted int64 epoch-ms
+                      timestamps and {(sensor_type, metric_type): float array}.
+        """
+        timestamps_ms, columns = block
+        if len(self.history):
+            live_timestamps = self.history.timestamps()
+            oldest_ms = int(live_timestamps[0] if self.history.is_sorted else live_timestamps.min())
+            keep = int(np.searchsorted(timestamps_ms, oldest_ms, side='left'))
+            timestamps_ms = timestamps_ms[:keep]
+            columns = {key: values[:keep] for key, values in columns.items()}
+
+        inserted = self.history.prepend(timestamps_ms, columns)
+        if not inserted:
+            return
+
+        # Chunks arrive newest first, so only the inserted rows need folding into the tiers.
+        timestamps_ms = timestamps_ms[-inserted:]
+        columns = {key: values[-inserted:] for key, values in columns.items()}
+        for tier in self.rollup_tiers:
+            tier.prepend(timestamps_ms, columns)
+
+        self.data_version += 1
+        logger.info(f"DataStore: Inserted {inserted} historical snapshots ({len(self.history)} in memory).")
+        self.history_loaded.emit(inserted)
+
+    def _resize_rollup_tiers(self):
+        for tier in self.rollup_tiers:
+            tier.resize(tier_capacity(tier.bucket_width_ms, self.max_points, self.sampling_interval_ms))
+
+    def get_series_arrays(self, sensor_type, metric_type, time_range=None, start_time=None, end_time=None,
+                          max_points=None, statistic='mean'):
+        """
+        Returns (timestamps_ms, values) as read-only NumPy arrays for one metric,
+        restricted to the same time range semantics as get_data_history().
+        Missing readings are NaN. Returns (timestamps_ms, None) if the metric has
+        never been recorded.
+        :param max_points: If given and the raw range holds more samples than this,
+                           values come from the coarsest rollup tier that still
+                           yields at least max_points buckets.
+        :param statistic: Rollup statistic to return ('mean', 'min' or 'max') when
+                          a tier is used.
+        """
+        selector = self.select_history_range(time_range, start_time, end_time)
+        tier, tier_selector = self._choose_rollup_tier(selector, max_points)
+        return self._series_from_source(sensor_type, metric_type, selector, tier, tier_selector, statistic)
+
+    def _series_from_source(self, sensor_type, metric_type, selector, tier, tier_selector, statistic='mean'):
+        """Reads (timestamps_ms, values) from a rollup tier if one was chosen, else from raw history."""
+        if tier is not None:
+            values = tier.statistic(sensor_type, metric_type, statistic)
+            return tier.bucket_starts()[tier_selector], (values[tier_selector] if values is not None else None)
+
+        timestamps = self.history.timestamps()[selector]
+        values = self.history.values(sensor_type, metric_type)
+        return timestamps, (values[selector] if values is not None else None)
+
+    def get_plot_series(self, sensor_type, metric_type, time_range=None, start_time=None, end_time=None, max_points=None,
+                        statistic=PLOT_ENVELOPE):
+        """
+        Returns (x, y) ready for MatplotlibWidget.plot_series: x as local-time
+        datetime64[ms] and y as float64, with missing readings removed.
+
+        When a rollup tier is used, the default PLOT_ENVELOPE statistic plots each
+        bucket as two points, its min then its max, so spikes and threshold
+        crossings stay visible on long ranges; the tier is picked so the envelope
+        still has about max_points points. Any RollupTier statistic ('mean',
+        'min', 'max') may be given instead. Raw samples are returned as they are.
+
+        Results are cached per (sensor, metric, statistic, source rows) and reused until
+        data_version changes. The source rows are the resolved raw slice or rollup
+        tier slice, so several tabs plotting the same metric on the same tick share
+        one extraction even if their canvases differ in width. The arrays are
+        read-only.
+        """
+        selector = self.select_history_range(time_range, start_time, end_time)
+        envelope = statistic == PLOT_ENVELOPE
+        tier, tier_selector = self._choose_rollup_tier(selector, max_points, points_per_bucket=2 if envelope else 1)
+        if tier is not None:
+            source_key = (tier.bucket_width_ms, tier_selector.start, tier_selector.stop)
+        elif isinstance(selector, slice):
+            source_key = (None, selector.start, selector.stop)
+        else:
+            source_key = (None, time_range, start_time, end_time)
+        key = (sensor_type, metric_type, statistic, source_key)
+        cached = self._series_cache.get(key)
+        if cached is not None and cached[0] == self.data_version:
+            return cached[1], cached[2]
+
+        if tier is not None and envelope:
+            timestamps, values = self._envelope_from_tier(sensor_type, metric_type, tier, tier_selector)
+        else:
+            timestamps, values = self._series_from_source(sensor_type, metric_type, selector, tier, tier_selector,
+                                                          'mean' if envelope else statistic)
+        if values is None:
+            x_data = np.empty(0, dtype='datetime64[ms]')
+            y_data = np.empty(0, dtype=np.float64)
+        else:
+            valid = ~np.isnan(values)
+            x_data = epoch_ms_to_local_datetime64(timestamps[valid])
+            y_data = np.array(values[valid], dtype=np.float64)
+        x_data.flags.writeable = False
+        y_data.flags.writeable = False
+
+        # Drop entries from older versions so the cache only ever holds the current tick.
+        self._series_cache = {k: v for k, v in self._series_cache.items() if v[0] == self.data_version}
+        self._series_cache[key] = (self.data_version, x_data, y_data)
+        return x_data, y_data
+
+    def _envelope_from_tier(self, sensor_type, metric_type, tier, tier_selector):
+        """
+        Reads (timestamps_ms, values) from a rollup tier as a min/max envelope:
+        two points per bucket at the bucket start, the min followed by the max.
+        """
+        mins = tier.statistic(sensor_type, metric_type, 'min')
+        if mins is None:
+            return tier.bucket_starts()[tier_selector], None
+        maxs = tier.statistic(sensor_type, metric_type, 'max')
+        timestamps = np.repeat(tier.bucket_starts()[tier_selector], 2)
+        values = np.column_stack((mins[tier_selector], maxs[tier_selector])).ravel()
+        return timestamps, values
+
+    def _choose_rollup_tier(self, selector, max_points, points_per_bucket=1):
+        """
+        Picks the coarsest rollup tier that still gives at least max_points points,
+        at points_per_bucket per bucket, over the rows picked by selector. Returns
+        (None, None) when the raw samples should be used instead.
+        """
+        if not max_points:
+            return None, None
+        timestamps = self.history.timestamps()[selector]
+        if len(timestamps) <= max_points:
+            return None, None
+
+        if self.history.is_sorted:
+            start_ms, end_ms = int(timestamps[0]), int(timestamps[-1])
+        else:
+            start_ms, end_ms = int(timestamps.min()), int(timestamps.max())
+        chosen = (None, None)
+        for tier in self.rollup_tiers:
+            tier_selector = tier.select(start_ms, end_ms)
+            if (tier_selector.stop - tier_selector.start) * points_per_bucket < max_points:
+                break
+            chosen = (tier, tier_selector)
+        if chosen[0] is not None:
+            logger.debug(f"DataStore: Using {chosen[0].bucket_width_ms} ms rollup tier for {len(timestamps)} raw points (target {max_points}).")
+        return chosen
+
+    def _parse_time_range(self, time_range):
+        """
+        Converts a 'Last N minutes/hours/days' string into a timedelta.
+        Returns None for "All History" or an unrecognized format.
+        """
+        match = re.match(r'Last (\d+) (minute|minutes|hour|hours|day|days)', time_range, re.IGNORECASE)
+        if not match:
+            return None
+        value = int(match.group(1))
+        unit = match.group(2).lower()
+        if 'minute' in unit:
+            return datetime.timedelta(minutes=value)
+        elif 'hour' in unit:
+            return datetime.timedelta(hours=value)
+        return datetime.timedelta(days=value)
+
+    def select_history_range(self, time_range=None, start_time=None, end_time=None):
+        """
+        Resolves a time range string or start/end datetimes into an index over the
+        history arrays. The timestamp column is sorted, so this is a binary search
+        returning a slice rather than a scan over every stored snapshot.
         """
         if start_time and end_time:
-            return [data for data in self.data_history if start_time <= data['timestamp'] <= end_time]
+            return self.history.select(int(start_time.timestamp() * 1000), int(end_time.timestamp() * 1000))
 
         if not time_range or time_range == "All History":
-            return list(self.data_history)
+            return self.history.select()
 
-        now = datetime.datetime.now()
-        time_delta = None
-        
-        match = re.match(r'Last (\d+) (minute|minutes|hour|hours|day|days)', time_range, re.IGNORECASE)
-        if match:
-            value = int(match.group(1))
-            unit = match.group(2).lower()
-            if 'minute' in unit:
-                time_delta = datetime.timedelta(minutes=value)
-            elif 'hour' in unit:
-                time_delta = datetime.timedelta(hours=value)
-            elif 'day' in unit:
-                time_delta = datetime.timedelta(days=value)
-        
+        time_delta = self._parse_time_range(time_range)
         if time_delta:
-            cutoff_time = now - time_delta
-            filtered_history = [data for data in self.data_history if data['timestamp'] >= cutoff_time]
-            logger.debug(f"Filtered data history for '{time_range}'. {len(filtered_history)} points retained.")
-            return filtered_history
+            cutoff_ms = int((datetime.datetime.now() - time_delta).timestamp() * 1000)
+            return self.history.select(start_ms=cutoff_ms)
 
         logger.warning(f"Unknown time range format: '{time_range}'. Returning all data history.")
-        return list(self.data_history)
+        return self.history.select()
+
+    def _snapshots_from_selector(self, selector):
+        """
+        Materializes history rows as {'timestamp': datetime, 'sensors': {...}} dictionaries.
+        :param selector: Slice or boolean mask over the history arrays.
+        """
+        timestamps = self.history.timestamps()[selector]
+        snapshots = [{'timestamp': datetime.datetime.fromtimestamp(ts / 1000.0), 'sensors': {}}
+                     for ts in timestamps.tolist()]
+
+        for sensor_type, metric_type in self.history.column_keys():
+            column = self.history.values(sensor_type, metric_type)[selector]
+            for snapshot, value in zip(snapshots, column.tolist()):
+                if value == value: # Skip NaN (missing reading)
+                    snapshot['sensors'].setdefault(sensor_type, {})[metric_type] = value
+        return snapshots
+
+    def _snapshots_from_rollup(self, tier, tier_selector):
+        """
+        Materializes rollup buckets as snapshot dictionaries holding the bucket mean
+        of each metric, timestamped at the bucket start.
+        """
+        starts = tier.bucket_starts()[tier_selector]
+        snapshots = [{'timestamp': datetime.datetime.fromtimestamp(ts / 1000.0), 'sensors': {}}
+                     for ts in starts.tolist()]
+
+        for sensor_type, metric_type in tier.column_keys():
+            means = tier.statistic(sensor_type, metric_type, 'mean')[tier_selector]
+            for snapshot, value in zip(snapshots, means.tolist()):
+                if value == value: # Skip empty buckets
+                    snapshot['sensors'].setdefault(sensor_type, {})[metric_type] = value
+        return snapshots
+
+    def get_data_history(self, time_range=None, start_time=None, end_time=None, max_points=None):
+        """
+        Returns a filtered subset of the data history based on a time range string or start/end datetimes.
+        If max_points is given and the range holds more raw samples than that, the
+        snapshots come from the coarsest rollup tier that still yields max_points
+        buckets (bucket means, timestamped at the bucket start).
+        """
+        selector = self.select_history_range(time_range, start_time, end_time)
+        tier, tier_selector = self._choose_rollup_tier(selector, max_points)
+        if tier is not None:
+            filtered_history = self._snapshots_from_rollup(tier, tier_selector)
+        else:
+            filtered_history = self._snapshots_from_selector(selector)
+        logger.debug(f"Filtered data history for '{time_range}'. {len(filtered_history)} points retained.")
+        return filtered_history
 
     def get_available_time_ranges(self):
         """
@@ -0,0 +1,283 @@
+# data_management/history_buffer.py
+# -*- coding: utf-8 -*-
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ColumnarHistory:
+    """
+    Columnar, preallocated ring buffer for sensor history.
+
+    Each (sensor_type, metric_type) pair is stored in its own float64 column and
+    all columns share a single int64 column of epoch-millisecond timestamps.
+    Missing readings are stored as NaN so every column has the same length.
+
+    The backing arrays are allocated with some slack beyond the capacity. Rows are
+    always appended at the end of the live window; when the slack is used up the
+    live window is moved back to the start of the arrays in one vectorized copy.
+    This keeps the live window contiguous, so timestamps and metric columns can be
+    handed out as zero-copy NumPy views.
+
+    Snapshots normally arrive in time order, so the timestamp column doubles as a
+    sorted index and time-range queries are answered by binary search.
+    """
+    # Fraction of the capacity allocated as slack. A larger slack means fewer
+    # compactions at the cost of extra memory.
+    SLACK_FRACTION = 0.25
+
+    def __init__(self, capacity):
+        """
+        Initializes an empty history buffer.
+        :param capacity: Maximum number of rows (snapshots) retained.
+        """
+        self._capacity = max(int(capacity), 1)
+        self._allocated = self._capacity + max(int(self._capacity * self.SLACK_FRACTION), 1)
+        self._start = 0
+        self._end = 0
+        self._timestamps = np.zeros(self._allocated, dtype=np.int64)
+        self._columns = {}
+        # Rows appended since creation, and the sequence number of the newest row
+        # that arrived with an older timestamp than its predecessor (-1 if none).
+        self._appended = 0
+        self._last_disorder_seq = -1
+        # Rows of older history still expected through prepend(), see reserve_front().
+        self._front_reserve = 0
+        logger.debug(f"ColumnarHistory: Allocated {self._allocated} rows for capacity {self._capacity}.")
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def capacity(self):
+        """Maximum number of rows retained."""
+        return self._capacity
+
+    def column_keys(self):
+        """Returns the list of (sensor_type, metric_type) pairs that have a column."""
+        return list(self._columns.keys())
+
+    def _ensure_column(self, key):
+        """Creates a NaN-filled column for a metric the first time it is seen."""
+        column = self._columns.get(key)
+        if column is None:
+            column = np.full(self._allocated, np.nan, dtype=np.float64)
+            self._columns[key] = column
+            logger.debug(f"ColumnarHistory: Created column for {key[0]}/{key[1]}.")
+        return column
+
+    def _front_room(self):
+        """Free rows to keep in front of the live window for reserved prepends."""
+        return max(min(self._front_reserve, self._capacity - len(self)), 0)
+
+    def _move_window(self, start):
+        """Moves the live window to begin at row start of the backing arrays."""
+        if start == self._start:
+            return
+        size = len(self)
+        # NumPy handles the overlap between source and destination.
+        self._timestamps[start:start + size] = self._timestamps[self._start:self._end]
+        for column in self._columns.values():
+            column[start:start + size] = column[self._start:self._end]
+        self._start = start
+        self._end = start + size
+
+    def _compact(self):
+        """Moves the live window back to the start of the backing arrays, after any reserved front room."""
+        self._move_window(self._front_room())
+
+    def reserve_front(self, rows):
+        """
+        Makes room for up to rows older rows in front of the live window, so that
+        prepend() fills it back to front without moving the live rows again.
+        Call once before prepending a known amount of history in several blocks.
+        :param rows: Number of rows expected, capped at the free capacity.
+        """
+        self._front_reserve = max(int(rows), 0)
+        if self._start < self._front_room():
+            self._move_window(self._front_room())
+
+    def append(self, timestamp_ms, sensors):
+        """
+        Appends one snapshot row.
+        :param timestamp_ms: Capture time of the snapshot in epoch milliseconds.
+        :param sensors: Dictionary of {sensor_type: {metric_type: value}}. Metrics
+                        that are absent or None are stored as NaN.
+        """
+        if self._end == self._allocated:
+            self._compact()
+
+        row = self._end
+        if row > self._start and timestamp_ms < self._timestamps[row - 1]:
+            if self.is_sorted:
+                logger.warning("ColumnarHistory: Out-of-order timestamp received. Range queries fall back to a linear scan.")
+            self._last_disorder_seq = self._appended
+        self._timestamps[row] = timestamp_ms
+        for column in self._columns.values():
+            column[row] = np.nan
+
+        for sensor_type, metrics in sensors.items():
+            for metric_type, value in metrics.items():
+                if value is None:
+                    continue
+                try:
+                    self._ensure_column((sensor_type, metric_type))[row] = float(value)
+                except (TypeError, ValueError):
+                    logger.warning(f"ColumnarHistory: Non-numeric value '{value}' for {sensor_type}/{metric_type}. Stored as NaN.")
+
+        self._end += 1
+        self._appended += 1
+        if self._end - self._start > self._capacity:
+            self._start += 1
+
+    def prepend(self, timestamps_ms, columns):
+        """
+        Inserts a block of older rows in front of the live window, e.g. history
+        read back from disk at startup. Rows that do not fit in the capacity are
+        dropped, oldest first. Within the room set aside by reserve_front() only
+        the block itself is written.
+        :param timestamps_ms: int64 array of epoch-millisecond timestamps, sorted
+                              ascending and older than the current oldest row.
+        :param columns: Dictionary of {(sensor_type, metric_type): float array}
+                        aligned with timestamps_ms, NaN for missing readings.
+        :return: Number of rows inserted.
+        """
+        size = len(self)
+        count = min(len(timestamps_ms), self._capacity - size)
+        if count <= 0:
+            return 0
+        first = len(timestamps_ms) - count
+        if self._start < count:
+            self._move_window(max(count, self._front_room()))
+
+        was_sorted = self.is_sorted
+        start = self._start - count
+        self._timestamps[start:self._start] = timestamps_ms[first:]
+        for key in columns:
+            self._ensure_column(key)
+        for key, column in self._columns.items():
+            values = columns.get(key)
+            column[start:self._start] = np.nan if values is None else values[first:]
+
+        self._start = start
+        self._front_reserve = max(self._front_reserve - count, 0)
+        # Count the rows as if they had been appended before the live window.
+        self._appended += count
+        # The live rows keep their order; only the block and the row after it need checking.
+        disorder_seq = -1 if was_sorted else self._last_disorder_seq + count
+        checked = self._timestamps[start:start + count + min(size, 1)]
+        disorder = np.flatnonzero(checked[1:] < checked[:-1])
+        if len(disorder):
+            disorder_seq = max(disorder_seq, self._appended - len(self) + int(disorder[-1]) + 1)
+        self._last_disorder_seq = disorder_seq
+        return count
+
+    @property
+    def is_sorted(self):
+        """True while the live timestamps are in non-decreasing order."""
+        # The disorder is gone once the out-of-order row is the oldest one left.
+        return self._last_disorder_seq <= self._appended - len(self)
+
+    def _rescan_disorder(self):
+        """Recomputes the out-of-order marker from the live timestamps."""
+        timestamps = self._timestamps[self._start:self._end]
+        disorder = np.flatnonzero(timestamps[1:] < timestamps[:-1])
+        if len(disorder):
+            self._last_disorder_seq = self._appended - len(self) + int(disorder[-1]) + 1
+        else:
+            self._last_disorder_seq = -1
+
+    def _readonly_view(self, array):
+        view = array[self._start:self._end]
+        view.flags.writeable = False
+        return view
+
+    def timestamps(self):
+        """Returns a read-only view of the epoch-millisecond timestamps, oldest first."""
+        return self._readonly_view(self._timestamps)
+
+    def values(self, sensor_type, metric_type):
+        """
+        Returns a read-only view of a metric column, aligned with timestamps().
+        Returns None if the metric has never been recorded.
+        """
+        column = self._columns.get((sensor_type, metric_type))
+        if column is None:
+            return None
+        return self._readonly_view(column)
+
+    def select(self, start_ms=None, end_ms=None):
+        """
+        Returns an index selecting the rows with start_ms <= timestamp <= end_ms,
+        relative to the views returned by timestamps() and values(). Either bound
+        may be None to leave that side open.
+
+        While timestamps are sorted this is a slice found by binary search, so
+        indexing a view with it is O(log n) and stays zero-copy. Otherwise a
+        boolean mask is returned.
+        """
+        timestamps = self._timestamps[self._start:self._end]
+        if self.is_sorted:
+            lo = 0 if start_ms is None else int(np.searchsorted(timestamps, start_ms, side='left'))
+            hi = len(timestamps) if end_ms is None else int(np.searchsorted(timestamps, end_ms, side='right'))
+            return slice(lo, max(lo, hi))
+
+        mask = np.ones(len(timestamps), dtype=bool)
+        if start_ms is not None:
+            mask &= timestamps >= start_ms
+        if end_ms is not None:
+            mask &= timestamps <= end_ms
+        return mask
+
+    def row(self, index):
+        """
+        Returns a single row as (timestamp_ms, {sensor_type: {metric_type: value}}).
+        NaN entries are omitted. Negative indexes count from the newest row.
+        """
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("ColumnarHistory row index out of range")
+        position = self._start + index
+        sensors = {}
+        for (sensor_type, metric_type), column in self._columns.items():
+            value = column[position]
+            if not np.isnan(value):
+                sensors.setdefault(sensor_type, {})[metric_type] = float(value)
+        return int(self._timestamps[position]), sensors
+
+    def resize(self, capacity):
+        """
+        Changes the capacity, keeping the newest rows that still fit.
+        :param capacity: New maximum number of rows.
+        """
+        capacity = max(int(capacity), 1)
+        keep = min(len(self), capacity)
+        old_start = self._end - keep
+        allocated = capacity + max(int(capacity * self.SLACK_FRACTION), 1)
+
+        timestamps = np.zeros(allocated, dtype=np.int64)
+        timestamps[:keep] = self._timestamps[old_start:self._end]
+        columns = {}
+        for key, column in self._columns.items():
+            new_column = np.full(allocated, np.nan, dtype=np.float64)
+            new_column[:keep] = column[old_start:self._end]
+            columns[key] = new_column
+
+        self._capacity = capacity
+        self._allocated = allocated
+        self._timestamps = timestamps
+        self._columns = columns
+        self._start = 0
+        self._end = keep
+        self._rescan_disorder()
+        logger.info(f"ColumnarHistory: Resized to capacity {capacity}. {keep} rows retained.")
+
+    def clear(self):
+        """Discards all rows while keeping the allocated columns."""
+        self._start = 0
+        self._end = 0
+        self._last_disorder_seq = -1
@@ -0,0 +1,250 @@
+# data_management/history_loader.py
+# -*- coding: utf-8 -*-
+import logging
+import os
+import re
+import time
+
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from data_management import binary_log
+from data_management.archive_index import read_archive_lines
+from data_management.logger import archive_sort_key
+
+logger = logging.getLogger(__name__)
+
+_ARCHIVE_TIME_RE = re.compile(r"sensor_data_(\d{8}_\d{6})(?:_\d+)?\.(?:log\.gz|log|bin)$")
+
+
+def _archive_time_ms(file_name):
+    """Returns the rollover time encoded in an archive file name, or None."""
+    match = _ARCHIVE_TIME_RE.match(file_name)
+    if not match:
+        return None
+    return int(time.mktime(time.strptime(match.group(1), "%Y%m%d_%H%M%S")) * 1000)
+
+
+def pivot_records(timestamps_ms, metric_ids, values, metric_keys):
+    """
+    Turns long-format records (one row per metric reading) into one row per
+    snapshot timestamp.
+    :return: (timestamps_ms, columns) with sorted unique int64 timestamps and
+             {(sensor_type, metric_type): float64 array}, NaN where a metric has
+             no reading for a snapshot.
+    """
+    unique_timestamps, row_index = np.unique(timestamps_ms, return_inverse=True)
+    columns = {}
+    for metric_id in np.unique(metric_ids):
+        selected = metric_ids == metric_id
+        column = np.full(len(unique_timestamps), np.nan, dtype=np.float64)
+        column[row_index[selected]] = values[selected]
+        columns[metric_keys[int(metric_id)]] = column
+    return unique_timestamps.astype(np.int64), columns
+
+
+def parse_csv_lines(lines):
+    """
+    Parses sensor data CSV log lines ('<asctime> - timestamp_ms,iso,sensor,metric,value,unit,is_alert').
+    Header, blank and malformed lines are skipped.
+    :return: (timestamps_ms, metric_ids, values, metric_keys) in long format.
+    """
+    timestamp_fields, key_fields, value_fields = [], [], []
+    for line in lines:
+        fields = line.rsplit(' - ', 1)[-1].split(',')
+        if len(fields) < 5 or not fields[0].isdigit():
+            continue
+        timestamp_fields.append(fields[0])
+        key_fields.append((fields[2], fields[3]))
+        value_fields.append(fields[4])
+    if not timestamp_fields:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64), []
+
+    metric_keys = sorted(set(key_fields))
+    key_index = {key: index for index, key in enumerate(metric_keys)}
+    timestamps_ms = np.array(timestamp_fields, dtype=np.int64)
+    metric_ids = np.array([key_index[key] for key in key_fields], dtype=np.int64)
+    # Column-wise conversion; "N/A" readings become NaN.
+    values = np.array(value_fields)
+    values[values == 'N/A'] = 'nan'
+    try:
+        values = values.astype(np.float64)
+    except ValueError:
+        values = np.array([_to_float(value) for value in values], dtype=np.float64)
+    return timestamps_ms, metric_ids, values, metric_keys
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+
+def read_csv_tail(path, start_ms, block_size=256 * 1024):
+    """
+    Reads the lines of an uncompressed CSV log from the end backwards, stopping
+    once a block starts with a record older than start_ms.
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b''
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+            # Skip the first, possibly partial, line when judging how far back we are.
+            lines = data.split(b'\n', 2)
+            probe = lines[1] if position > 0 and len(lines) > 1 else lines[0]
+            fields = probe.decode('utf-8', errors='replace').rsplit(' - ', 1)[-1].split(',', 1)
+            if fields[0].isdigit() and int(fields[0]) < start_ms:
+                break
+    text = data.decode('utf-8', errors='replace')
+    lines = text.split('\n')
+    if position > 0:
+        lines = lines[1:]
+    return lines
+
+
+class HistoryLoader(QObject):
+    """
+    Reads recent sensor history back from the data logs, newest data first, and
+    emits it in blocks so plots fill in progressively while the UI is already up.
+
+    The compact binary logs are read first: they are memory-mapped and the window
+    is found by binary search. The part of the window older than the binary logs
+    is read from the CSV logs: only the tail of the current log is read, only
+    archives rolled over after the start of the window are opened, and of indexed
+    archives only the blocks that overlap the window are decompressed.
+
+    Meant to be moved to a QThread; connect the thread's started signal to run().
+    """
+    chunk_loaded = pyqtSignal(object)  # (timestamps_ms, {(sensor_type, metric_type): values})
+    finished = pyqtSignal(int)
+
+    CHUNK_ROWS = 5000
+
+    def __init__(self, log_dir, archive_dir, start_ms, end_ms, max_rows, parent=None):
+        """
+        :param log_dir: Directory holding sensor_data.log / sensor_data.bin.
+        :param archive_dir: Directory holding archived logs.
+        :param start_ms: Oldest timestamp to load, in epoch milliseconds.
+        :param end_ms: Load only snapshots older than this, in epoch milliseconds.
+        :param max_rows: Stop after this many snapshots.
+        """
+        super().__init__(parent)
+        self.log_dir = log_dir
+        self.archive_dir = archive_dir
+        self.start_ms = int(start_ms)
+        self.end_ms = int(end_ms)
+        self.max_rows = int(max_rows)
+        self._is_running = True
+        self._rows_loaded = 0
+
+    def stop(self):
+        self._is_running = False
+
+    def _list_archives(self, directory, suffixes):
+        """Archive files in directory whose rollover time is inside the window, newest first."""
+        if not os.path.isdir(directory):
+            return []
+        files = []
+        for file_name in os.listdir(directory):
+            if not file_name.endswith(suffixes):
+                continue
+            rolled_ms = _archive_time_ms(file_name)
+            # An archive only holds data from before it was rolled over.
+            if rolled_ms is not None and rolled_ms >= self.start_ms:
+                files.append(file_name)
+        return [os.path.join(directory, f) for f in sorted(files, key=archive_sort_key, reverse=True)]
+
+    def _binary_sources(self):
+        current = os.path.join(self.log_dir, "sensor_data.bin")
+        if not os.path.exists(current):
+            return []
+        return [current] + self._list_archives(self.archive_dir, ('.bin',))
+
+    def _csv_sources(self):
+        current = os.path.join(self.log_dir, "sensor_data.log")
+        sources = [current] if os.path.exists(current) else []
+        # Rolled logs still waiting to be gzipped are newer than any archive.
+        return (sources + self._list_archives(self.log_dir, ('.log',))
+                + self._list_archives(self.archive_dir, ('.log.gz',)))
+
+    def _read_binary(self, path):
+        records, metric_keys = binary_log.open_binary_log(path)
+        records = binary_log.select_time_range(records, self.start_ms, self.end_ms - 1)
+        if len(records) == 0:
+            return None
+        return pivot_records(records['timestamp_ms'], records['metric_id'],
+                             records['value'].astype(np.float64), metric_keys)
+
+    def _read_csv(self, path):
+        if path.endswith('.gz'):
+            # Decompresses only the blocks overlapping the window if the archive is indexed.
+            lines = read_archive_lines(path, self.start_ms, self.end_ms - 1)
+        else:
+            lines = read_csv_tail(path, self.start_ms)
+        timestamps_ms, metric_ids, values, metric_keys = parse_csv_lines(lines)
+        in_window = (timestamps_ms >= self.start_ms) & (timestamps_ms < self.end_ms)
+        if not in_window.any():
+            return None
+        return pivot_records(timestamps_ms[in_window], metric_ids[in_window], values[in_window], metric_keys)
+
+    def _emit_newest_first(self, timestamps_ms, columns):
+        """Emits a block in CHUNK_ROWS pieces, newest piece first. Returns False when done."""
+        remaining = self.max_rows - self._rows_loaded
+        if len(timestamps_ms) > remaining:
+            timestamps_ms = timestamps_ms[-remaining:]
+            columns = {key: values[-remaining:] for key, values in columns.items()}
+        end = len(timestamps_ms)
+        while end > 0 and self._is_running:
+            start = max(end - self.CHUNK_ROWS, 0)
+            self.chunk_loaded.emit((timestamps_ms[start:end].copy(),
+                                    {key: values[start:end].copy() for key, values in columns.items()}))
+            self._rows_loaded += end - start
+            end = start
+        return self._rows_loaded < self.max_rows
+
+    def _load_sources(self, sources, reader):
+        """
+        Emits the window's rows from sources, each older than the one before it.
+        Returns False once loading is complete (window or row budget exhausted, or stopped).
+        """
+        for path in sources:
+            if not self._is_running:
+                return False
+            try:
+                block = reader(path)
+            except Exception as e:
+                logger.error(f"HistoryLoader: Could not read '{path}': {e}", exc_info=True)
+                continue
+            if block is None:
+                continue
+            timestamps_ms, columns = block
+            # Later sources must stay older than everything emitted so far.
+            self.end_ms = min(self.end_ms, int(timestamps_ms[0]))
+            if not self._emit_newest_first(timestamps_ms, columns):
+                return False
+            if timestamps_ms[0] <= self.start_ms:
+                return False
+        return self._is_running
+
+    @pyqtSlot()
+    def run(self):
+        """
+        Loads the history window from the binary logs, then from the CSV logs for
+        whatever part of the window the binary logs do not reach back to.
+        """
+        started = time.monotonic()
+        binary_sources = self._binary_sources()
+        logger.info(f"HistoryLoader: Loading history from {len(binary_sources)} binary log file(s).")
+        if self._load_sources(binary_sources, self._read_binary) and self.end_ms > self.start_ms:
+            csv_sources = self._csv_sources()
+            logger.info(f"HistoryLoader: Loading older history from {len(csv_sources)} CSV log file(s).")
+            self._load_sources(csv_sources, self._read_csv)
+
+        logger.info(f"HistoryLoader: Loaded {self._rows_loaded} snapshots in {time.monotonic() - started:.2f} s.")
+        self.finished.emit(self._rows_loaded)
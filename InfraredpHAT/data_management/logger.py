@@ -1,90 +1,183 @@
 # data_management/logger.py
 import logging
-import logging.handlers # For RotatingFileHandler
 import os
 import datetime
-import gzip # For gzipping old log files
 import shutil # For moving files
 import re # For parsing filenames for archive management
 import sys # Import sys for sys.is_finalizing()
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from data_management.binary_log import BinaryLogWriter, BinaryLogFormatError
+from data_management.archive_index import write_indexed_archive, remove_index
 
 logger = logging.getLogger(__name__)
 
+CSV_HEADER = "timestamp_ms,iso_timestamp,sensor_type,metric_type,value,unit,is_alert\n"
+
+# fsync policies for the data log files.
+FSYNC_NEVER = 'never'        # Leave write-back to the OS.
+FSYNC_INTERVAL = 'interval'  # fsync at most once per fsync_interval_s.
+FSYNC_BATCH = 'batch'        # fsync after every batch.
+FSYNC_POLICIES = (FSYNC_NEVER, FSYNC_INTERVAL, FSYNC_BATCH)
+
+_STOP = object()
+
+_ARCHIVE_NAME_RE = re.compile(r"sensor_data_(\d{8}_\d{6})(?:_(\d+))?\.")
+
+
+def archive_sort_key(file_name):
+    """
+    Sort key putting archive file names in rollover order, including the numeric
+    suffix added when several files are rolled over within the same second.
+    """
+    match = _ARCHIVE_NAME_RE.match(file_name)
+    if not match:
+        return (file_name, 0)
+    return (match.group(1), int(match.group(2) or 0))
+
+
+# Gzipping and pruning run on one process-wide worker, one job at a time, in
+# submission order. It outlives the SensorLogger instances, so a logger can be
+# closed and replaced while its archive jobs are still running.
+_archiver = None
+_archiver_lock = threading.Lock()
+
+
+def _get_archiver():
+    global _archiver
+    with _archiver_lock:
+        if _archiver is None:
+            _archiver = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SensorLogArchiver")
+        return _archiver
+
+
+def shutdown_archiver(wait=True):
+    """
+    Stops the archive worker, by default after the pending gzip and prune jobs
+    have finished. Call at application exit, after closing the SensorLogger.
+    """
+    global _archiver
+    with _archiver_lock:
+        archiver, _archiver = _archiver, None
+    if archiver is not None:
+        archiver.shutdown(wait=wait)
+
+
 class SensorLogger:
     """
     Manages logging of sensor data to a file, with rotation and archiving.
-    It uses Python's standard logging module for basic file handling and then
-    implements custom logic for gzipping and moving old logs to an archive directory.
+
+    log_sensor_data() only puts the snapshot on a bounded queue, so it is cheap
+    enough to call from the GUI thread. A writer thread formats and writes the
+    queued snapshots in batches, flushing when batch_size snapshots are waiting
+    or flush_interval_s has passed since the oldest one arrived. Full log files
+    are renamed on the writer thread; gzipping them into the archive directory
+    together with a time index, and pruning old archives, run on a separate
+    background worker (see shutdown_archiver()), so slow SD-card I/O never
+    blocks the dashboard.
+
+    Optionally, the same data is also appended to a compact binary log
+    (see data_management.binary_log), which is rotated into the archive directory
+    uncompressed so archived files stay memory-mappable.
     """
-    def __init__(self, log_dir="Sensor_Logs", archive_dir="Archive_Sensor_Logs", 
-                 max_file_size_mb=5.0, max_rotations=5):
+    ARCHIVE_PATTERN = r"sensor_data_\d{8}_\d{6}(_\d+)?\.log\.gz"
+    BINARY_ARCHIVE_PATTERN = r"sensor_data_\d{8}_\d{6}(_\d+)?\.bin"
+
+    def __init__(self, log_dir="Sensor_Logs", archive_dir="Archive_Sensor_Logs",
+                 max_file_size_mb=5.0, max_rotations=5, binary_log_enabled=True,
+                 queue_size=1000, batch_size=50, flush_interval_s=5.0,
+                 fsync_policy=FSYNC_INTERVAL, fsync_interval_s=30.0):
         """
-        Initializes the SensorLogger.
+        Initializes the SensorLogger and starts its writer thread.
         :param log_dir: Absolute path to directory where current log files are stored.
         :param archive_dir: Absolute path to directory where old, gzipped log files are archived.
         :param max_file_size_mb: Maximum size of a single log file before rotation (in MB).
         :param max_rotations: Maximum number of rotated files to keep in the archive.
+        :param binary_log_enabled: Also write the compact binary log next to the CSV.
+        :param queue_size: Maximum number of snapshots waiting to be written. When
+                           the queue is full new snapshots are dropped.
+        :param batch_size: Number of queued snapshots that triggers a write.
+        :param flush_interval_s: Maximum time a snapshot waits before being written.
+        :param fsync_policy: One of FSYNC_POLICIES.
+        :param fsync_interval_s: Minimum time between fsyncs with FSYNC_INTERVAL.
         """
         self.log_dir = log_dir
         self.archive_dir = archive_dir
-        self.max_bytes = max_file_size_mb * 1024 * 1024 
-        self.max_rotations = max_rotations 
+        self.max_bytes = max_file_size_mb * 1024 * 1024
+        self.max_rotations = max_rotations
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_interval_s = max(float(flush_interval_s), 0.0)
+        if fsync_policy not in FSYNC_POLICIES:
+            logger.warning(f"SensorLogger: Unknown fsync policy '{fsync_policy}'. Using '{FSYNC_INTERVAL}'.")
+            fsync_policy = FSYNC_INTERVAL
+        self.fsync_policy = fsync_policy
+        self.fsync_interval_s = max(float(fsync_interval_s), 0.0)
+        self._last_fsync = time.monotonic()
+        self.dropped_snapshots = 0
 
         os.makedirs(self.log_dir, exist_ok=True)
         os.makedirs(self.archive_dir, exist_ok=True)
         logger.info(f"SensorLogger: Log directory ensured: {self.log_dir}")
         logger.info(f"SensorLogger: Archive directory ensured: {self.archive_dir}")
 
-
         self.log_file_base = os.path.join(self.log_dir, "sensor_data.log")
-        
-        self._sensor_logger = logging.getLogger('sensor_data_logger')
-        self._sensor_logger.setLevel(logging.INFO) 
-        self._sensor_logger.propagate = False 
-
-        for handler in self._sensor_logger.handlers[:]:
-            self._sensor_logger.removeHandler(handler)
-
-        self._handler = logging.handlers.RotatingFileHandler(
-            self.log_file_base, 
-            maxBytes=self.max_bytes, 
-            backupCount=1, 
-            encoding='utf-8'
-        )
-        formatter = logging.Formatter('%(asctime)s - %(message)s')
-        self._handler.setFormatter(formatter)
-        self._sensor_logger.addHandler(self._handler)
-
+        self._log_file = None
         self._ensure_log_header()
+        self._open_log_file()
+
+        self.binary_log_path = os.path.join(self.log_dir, "sensor_data.bin")
+        self._binary_writer = None
+        if binary_log_enabled:
+            self._open_binary_log()
+
+        self._archiver = _get_archiver()
+        self._queue = queue.Queue(maxsize=max(int(queue_size), 1))
+        self._closed = False
+        self._writer_thread = threading.Thread(target=self._writer_loop, name="SensorLogWriter", daemon=True)
+        self._writer_thread.start()
 
         logger.info(f"SensorLogger initialized. Sensor data log file: {self.log_file_base}")
         logger.info(f"Max sensor log file size: {max_file_size_mb} MB, Max archived rotations: {max_rotations}")
+        logger.info(f"SensorLogger: Batch size {self.batch_size}, flush interval {self.flush_interval_s} s, fsync policy '{self.fsync_policy}'.")
 
     def _ensure_log_header(self):
         """
         Ensures the log file has a CSV header. If the file is new or empty, writes the header.
-        This must be called before the first log entry or after a rollover.
+        This must be called before the log file is opened for appending.
         """
-        # Temporarily remove handler to write directly to file without triggering rollover logic
-        if self._handler in self._sensor_logger.handlers:
-            self._sensor_logger.removeHandler(self._handler)
-
         if not os.path.exists(self.log_file_base) or os.stat(self.log_file_base).st_size == 0:
             try:
                 with open(self.log_file_base, 'w', encoding='utf-8', errors='replace') as f:
-                    f.write("timestamp_ms,iso_timestamp,sensor_type,metric_type,value,unit,is_alert\n")
+                    f.write(CSV_HEADER)
                 logger.info(f"SensorLogger: Wrote header to new or empty log file: {self.log_file_base}")
             except Exception as e:
                 logger.error(f"SensorLogger: Failed to write CSV header to {self.log_file_base}: {e}", exc_info=True)
-        
-        # Add handler back
-        if self._handler not in self._sensor_logger.handlers:
-            self._sensor_logger.addHandler(self._handler)
 
+    def _open_log_file(self):
+        try:
+            self._log_file = open(self.log_file_base, 'a', encoding='utf-8', errors='replace')
+        except OSError as e:
+            logger.error(f"SensorLogger: Could not open log file '{self.log_file_base}': {e}", exc_info=True)
+            self._log_file = None
+
+    def _open_binary_log(self):
+        """Opens the binary log, archiving an existing file that cannot be appended to."""
+        try:
+            self._binary_writer = BinaryLogWriter(self.binary_log_path)
+        except BinaryLogFormatError as e:
+            logger.error(f"SensorLogger: {e} Archiving it and starting a new binary log.")
+            self._archive_binary_log()
+            self._binary_writer = BinaryLogWriter(self.binary_log_path)
+        except OSError as e:
+            logger.error(f"SensorLogger: Could not open binary log '{self.binary_log_path}': {e}", exc_info=True)
+            self._binary_writer = None
 
     def log_sensor_data(self, data_snapshot, settings_manager):
         """
-        Logs a snapshot of sensor data to the log file.
+        Queues a snapshot of sensor data for the writer thread. Never blocks.
         :param data_snapshot: A dictionary containing timestamp and sensor data.
                              Expected format: {'timestamp': datetime_object, 'sensors': {...}}
         :param settings_manager: An instance of SettingsManager to retrieve units.
@@ -92,88 +185,219 @@ class SensorLogger:
         if not isinstance(data_snapshot, dict) or 'timestamp' not in data_snapshot or 'sensors' not in data_snapshot:
             logger.error(f"Invalid data snapshot format received by SensorLogger: {data_snapshot}")
             return
+        if self._closed:
+            return
 
-        timestamp_dt = data_snapshot['timestamp']
+        sensors = {sensor_type: dict(metrics) for sensor_type, metrics in data_snapshot['sensors'].items()}
+        try:
+            self._queue.put_nowait((data_snapshot['timestamp'], sensors, settings_manager))
+        except queue.Full:
+            self.dropped_snapshots += 1
+            if self.dropped_snapshots == 1 or self.dropped_snapshots % 100 == 0:
+                logger.warning(f"SensorLogger: Write queue full, dropped {self.dropped_snapshots} snapshot(s) so far.")
+
+    def _writer_loop(self):
+        """Collects queued snapshots and writes them in batches until stopped."""
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                if batch:
+                    self._write_batch(batch)
+                break
+            if item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval_s
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write_batch(batch)
+                batch = []
+                deadline = None
+
+    def _format_lines(self, timestamp_dt, sensors, settings_manager):
         snapshot_timestamp_ms = int(timestamp_dt.timestamp() * 1000)
         iso_timestamp = timestamp_dt.isoformat()
-        
-        for sensor_type, metrics in data_snapshot['sensors'].items():
+        # Same prefix the logging.Formatter('%(asctime)s - %(message)s') used to add.
+        asctime = f"{timestamp_dt.strftime('%Y-%m-%d %H:%M:%S')},{timestamp_dt.microsecond // 1000:03d}"
+        lines = []
+        for sensor_type, metrics in sensors.items():
             for metric_type, value in metrics.items():
-                is_alert = False 
+                is_alert = False
+
+                unit = settings_manager.get_unit(sensor_type, metric_type)
 
-                unit = settings_manager.get_unit(sensor_type, metric_type) 
-                
                 value_str = f"{value:.2f}" if isinstance(value, (int, float)) and value is not None else "N/A"
                 unit_str = str(unit) if unit is not None else ""
-                
-                line = f"{snapshot_timestamp_ms},{iso_timestamp},{sensor_type},{metric_type},{value_str},{unit_str},{is_alert}\n"
-                
-                self._sensor_logger.info(line.strip())
 
-        logger.debug(f"SensorLogger: Logged data for snapshot {timestamp_dt}.")
+                lines.append(f"{asctime} - {snapshot_timestamp_ms},{iso_timestamp},{sensor_type},{metric_type},{value_str},{unit_str},{is_alert}\n")
+        return snapshot_timestamp_ms, lines
+
+    def _write_batch(self, batch):
+        """Writes a batch of snapshots to the CSV and binary logs. Runs on the writer thread."""
+        try:
+            lines = []
+            for timestamp_dt, sensors, settings_manager in batch:
+                snapshot_timestamp_ms, snapshot_lines = self._format_lines(timestamp_dt, sensors, settings_manager)
+                lines.extend(snapshot_lines)
+                if self._binary_writer is not None:
+                    self._binary_writer.append(snapshot_timestamp_ms, sensors)
+
+            if self._log_file is not None:
+                self._log_file.write("".join(lines))
+                self._log_file.flush()
+            if self._binary_writer is not None:
+                self._binary_writer.flush()
+            self._sync_if_due()
+            logger.debug(f"SensorLogger: Wrote batch of {len(batch)} snapshot(s), {len(lines)} line(s).")
+
+            if self._log_file is not None and self._log_file.tell() >= self.max_bytes:
+                self._rollover_log_file()
+            if self._binary_writer is not None and self._binary_writer.size >= self.max_bytes:
+                self._rollover_binary_log()
+        except Exception as e:
+            logger.error(f"SensorLogger: Error writing batch of {len(batch)} snapshot(s): {e}", exc_info=True)
+
+    def _sync_if_due(self, force=False):
+        """fsyncs the open log files according to the fsync policy."""
+        if self.fsync_policy == FSYNC_NEVER and not force:
+            return
+        now = time.monotonic()
+        if self.fsync_policy == FSYNC_INTERVAL and not force and now - self._last_fsync < self.fsync_interval_s:
+            return
+        if self._log_file is not None and not self._log_file.closed:
+            os.fsync(self._log_file.fileno())
+        if self._binary_writer is not None:
+            self._binary_writer.sync()
+        self._last_fsync = now
+
+    def _archive_path(self, extension):
+        """
+        Returns an unused archive path named after the current time. For gzipped
+        logs the name of the rolled file still waiting to be compressed must be
+        free as well.
+        """
+        timestamp_for_archive = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        counter = 0
+        while True:
+            suffix = f"_{counter}" if counter else ""
+            archive_file_path = os.path.join(self.archive_dir, f"sensor_data_{timestamp_for_archive}{suffix}{extension}")
+            pending_file_path = os.path.join(self.log_dir, os.path.basename(archive_file_path)[:-len(".gz")])
+            if not os.path.exists(archive_file_path) and not (extension.endswith(".gz") and os.path.exists(pending_file_path)):
+                return archive_file_path
+            counter += 1
 
-        self._manage_archived_files_after_rollover()
+    def _rollover_log_file(self):
+        """
+        Renames the full CSV log out of the way, starts a new one and hands the
+        rolled file to the archiver. Runs on the writer thread.
+        """
+        self._sync_if_due(force=self.fsync_policy != FSYNC_NEVER)
+        self._log_file.close()
+        archive_file_path = self._archive_path(".log.gz")
+        # Named after its archive, so a slow archiver never has a pending file overwritten.
+        rolled_file_path = os.path.join(self.log_dir, os.path.basename(archive_file_path)[:-len(".gz")])
+        try:
+            os.replace(self.log_file_base, rolled_file_path)
+        except OSError as e:
+            logger.error(f"SensorLogger: Error rolling over log file '{self.log_file_base}': {e}", exc_info=True)
+            rolled_file_path = None
+        self._ensure_log_header()
+        self._open_log_file()
+        if rolled_file_path:
+            self._archiver.submit(self._manage_archived_files_after_rollover, rolled_file_path, archive_file_path)
 
-    def _manage_archived_files_after_rollover(self):
+    def _manage_archived_files_after_rollover(self, rolled_file_path, archive_file_path):
         """
-        This method is called after RotatingFileHandler has performed its rollover.
-        It takes the .1 file (the old log), gzipps it, moves it to the archive,
-        and then prunes old archives.
+        Gzips a rolled log file into the archive, writes its time index sidecar
+        (see data_management.archive_index) and prunes old archives.
+        Runs on the archiver worker.
         """
-        rolled_file_path = f"{self.log_file_base}.1" 
-        
         if os.path.exists(rolled_file_path):
-            timestamp_for_archive = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            archive_file_name = f"sensor_data_{timestamp_for_archive}.log.gz"
-            archive_file_path = os.path.join(self.archive_dir, archive_file_name)
-            
             try:
-                with open(rolled_file_path, 'rb') as f_in:
-                    with gzip.open(archive_file_path, 'wb') as f_out:
-                        shutil.copyfileobj(f_in, f_out)
-                os.remove(rolled_file_path) 
+                write_indexed_archive(rolled_file_path, archive_file_path)
+                os.remove(rolled_file_path)
                 logger.info(f"SensorLogger: Archived '{rolled_file_path}' to '{archive_file_path}'.")
             except Exception as e:
                 logger.error(f"SensorLogger: Error gzipping and archiving file '{rolled_file_path}': {e}", exc_info=True)
         else:
-            logger.debug(f"SensorLogger: Rolled file expected at '{rolled_file_path}' not found for archiving after rollover. This is normal if no rollover occurred.")
+            logger.warning(f"SensorLogger: Rolled file expected at '{rolled_file_path}' not found for archiving.")
 
         self._prune_old_archives()
 
-    def _prune_old_archives(self):
+    def _archive_binary_log(self):
+        """Moves the current binary log into the archive directory, uncompressed."""
+        if not os.path.exists(self.binary_log_path):
+            return
+        archive_file_path = self._archive_path(".bin")
+        try:
+            shutil.move(self.binary_log_path, archive_file_path)
+            logger.info(f"SensorLogger: Archived '{self.binary_log_path}' to '{archive_file_path}'.")
+        except Exception as e:
+            logger.error(f"SensorLogger: Error archiving binary log '{self.binary_log_path}': {e}", exc_info=True)
+
+    def _rollover_binary_log(self):
+        """Archives the full binary log, starts a new one and prunes old binary archives."""
+        self._binary_writer.close()
+        self._archive_binary_log()
+        self._open_binary_log()
+        self._archiver.submit(self._prune_old_archives, self.BINARY_ARCHIVE_PATTERN)
+
+    def _prune_old_archives(self, pattern=ARCHIVE_PATTERN):
         """
-        Deletes oldest archived log files (gzipped) to maintain the maximum number of rotations.
+        Deletes oldest archived log files matching pattern (gzipped CSV by default)
+        to maintain the maximum number of rotations.
         """
-        archived_files = [f for f in os.listdir(self.archive_dir) if re.match(r"sensor_data_\d{8}_\d{6}\.log\.gz", f)]
-        
-        archived_files.sort()
-        
+        archived_files = [f for f in os.listdir(self.archive_dir) if re.fullmatch(pattern, f)]
+
+        archived_files.sort(key=archive_sort_key)
+
         while len(archived_files) > self.max_rotations:
-            oldest_file = archived_files.pop(0) 
+            oldest_file = archived_files.pop(0)
             oldest_file_path = os.path.join(self.archive_dir, oldest_file)
             try:
                 os.remove(oldest_file_path)
+                remove_index(oldest_file_path)
                 logger.info(f"SensorLogger: Deleted oldest archived log file: {oldest_file_path}")
             except Exception as e:
                 logger.error(f"SensorLogger: Error deleting old archived log file '{oldest_file_path}': {e}")
 
     def close(self):
-        """Cleans up logger resources (e.g., closes file handlers)."""
-        # Remove handlers from logger before closing them to prevent issues during interpreter shutdown
-        for handler in self._sensor_logger.handlers[:]:
+        """
+        Stops the writer thread after it has written everything still queued and
+        closes the log files. Pending archive jobs keep running on the shared
+        archive worker; shutdown_archiver() waits for them.
+        """
+        if getattr(self, '_closed', True):
+            return
+        self._closed = True
+        # Blocks only if the queue is full, until the writer has made room.
+        self._queue.put(_STOP)
+        self._writer_thread.join()
+
+        try:
+            self._sync_if_due(force=self.fsync_policy != FSYNC_NEVER)
+        except Exception as e:
+            if not sys.is_finalizing():
+                logger.error(f"SensorLogger: Error syncing log files: {e}", exc_info=True)
+        for f in (self._log_file, self._binary_writer):
+            if f is None:
+                continue
             try:
-                self._sensor_logger.removeHandler(handler)
-                handler.close()
+                f.close()
             except Exception as e:
                 # Catch exceptions, especially NameError if 'open' is gone during shutdown
                 if not sys.is_finalizing(): # Only log if not during finalization
-                    logger.error(f"SensorLogger: Error closing handler {handler}: {e}", exc_info=True)
-                else:
-                    # During finalization, just ignore errors as objects are being torn down
-                    pass
+                    logger.error(f"SensorLogger: Error closing {f}: {e}", exc_info=True)
         # Only log this if not during interpreter finalization
         if not sys.is_finalizing():
-            logger.info("SensorLogger: All logging handlers closed.")
+            logger.info(f"SensorLogger: Writer stopped and log files closed. {self.dropped_snapshots} snapshot(s) dropped.")
 
     def cleanup(self):
         """Provides an explicit cleanup method for consistency."""
@@ -0,0 +1,270 @@
+# data_management/rollup.py
+# -*- coding: utf-8 -*-
+import logging
+import math
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bucket widths of the rollup tiers kept next to the raw history, finest first.
+ROLLUP_TIER_WIDTHS_MS = (
+    10 * 1000,        # 10 seconds
+    60 * 1000,        # 1 minute
+    10 * 60 * 1000,   # 10 minutes
+    60 * 60 * 1000,   # 1 hour
+)
+
+ROLLUP_STATISTICS = ('mean', 'min', 'max', 'count')
+
+
+class RollupTier:
+    """
+    Fixed-width time buckets holding min/max/sum/count per (sensor_type, metric_type).
+
+    Samples are folded into the newest bucket as they arrive, so keeping a tier up
+    to date costs O(1) per snapshot. Buckets are stored in the same contiguous
+    ring layout as ColumnarHistory, so range queries use the same binary search.
+    """
+    SLACK_FRACTION = 0.25
+
+    def __init__(self, bucket_width_ms, capacity):
+        """
+        Initializes an empty tier.
+        :param bucket_width_ms: Width of one bucket in milliseconds.
+        :param capacity: Maximum number of buckets retained.
+        """
+        self.bucket_width_ms = int(bucket_width_ms)
+        self._capacity = max(int(capacity), 1)
+        self._allocated = self._capacity + max(int(self._capacity * self.SLACK_FRACTION), 1)
+        self._start = 0
+        self._end = 0
+        self._bucket_starts = np.zeros(self._allocated, dtype=np.int64)
+        # (sensor_type, metric_type) -> [mins, maxs, sums, counts]
+        self._stats = {}
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def capacity(self):
+        """Maximum number of buckets retained."""
+        return self._capacity
+
+    def _new_stats(self, allocated):
+        return [np.full(allocated, np.nan, dtype=np.float64),
+                np.full(allocated, np.nan, dtype=np.float64),
+                np.zeros(allocated, dtype=np.float64),
+                np.zeros(allocated, dtype=np.int32)]
+
+    def _compact(self):
+        size = len(self)
+        self._bucket_starts[:size] = self._bucket_starts[self._start:self._end]
+        for arrays in self._stats.values():
+            for array in arrays:
+                array[:size] = array[self._start:self._end]
+        self._start = 0
+        self._end = size
+
+    def _open_bucket(self, bucket_start):
+        if self._end == self._allocated:
+            self._compact()
+        row = self._end
+        self._bucket_starts[row] = bucket_start
+        for mins, maxs, sums, counts in self._stats.values():
+            mins[row] = np.nan
+            maxs[row] = np.nan
+            sums[row] = 0.0
+            counts[row] = 0
+        self._end += 1
+        if self._end - self._start > self._capacity:
+            self._start += 1
+        return row
+
+    def add(self, timestamp_ms, sensors):
+        """
+        Folds one snapshot into the tier.
+        :param timestamp_ms: Capture time of the snapshot in epoch milliseconds.
+        :param sensors: Dictionary of {sensor_type: {metric_type: value}}.
+        """
+        bucket_start = timestamp_ms - timestamp_ms % self.bucket_width_ms
+        if len(self) and bucket_start == self._bucket_starts[self._end - 1]:
+            row = self._end - 1
+        elif len(self) and bucket_start < self._bucket_starts[self._end - 1]:
+            # Late sample for a bucket that is already closed; rollups only move forward.
+            return
+        else:
+            row = self._open_bucket(bucket_start)
+
+        for sensor_type, metrics in sensors.items():
+            for metric_type, value in metrics.items():
+                if value is None:
+                    continue
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue
+                if value != value:
+                    continue
+                arrays = self._stats.get((sensor_type, metric_type))
+                if arrays is None:
+                    arrays = self._new_stats(self._allocated)
+                    self._stats[(sensor_type, metric_type)] = arrays
+                mins, maxs, sums, counts = arrays
+                if counts[row] == 0:
+                    mins[row] = value
+                    maxs[row] = value
+                else:
+                    if value < mins[row]:
+                        mins[row] = value
+                    if value > maxs[row]:
+                        maxs[row] = value
+                sums[row] += value
+                counts[row] += 1
+
+    def _block_rollups(self, timestamps_ms, columns):
+        """
+        Rolls a block of sorted raw rows up into buckets in one vectorized pass
+        per metric. Returns (bucket_starts, {key: (mins, maxs, sums, counts)}).
+        """
+        bucket_ids = timestamps_ms - timestamps_ms % self.bucket_width_ms
+        bucket_starts, starts = np.unique(bucket_ids, return_index=True)
+        stats = {}
+        for key, values in columns.items():
+            valid = ~np.isnan(values)
+            with np.errstate(invalid='ignore'):
+                # fmin/fmax skip NaN unless the whole bucket is NaN.
+                mins = np.fmin.reduceat(values, starts)
+                maxs = np.fmax.reduceat(values, starts)
+            sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+            counts = np.add.reduceat(valid.astype(np.int32), starts)
+            stats[key] = (mins, maxs, sums, counts)
+        return bucket_starts, stats
+
+    def prepend(self, timestamps_ms, columns):
+        """
+        Folds a block of raw rows that are older than the tier's buckets in front
+        of them, e.g. history read back from disk at startup. Costs O(block size
+        + tier size); the rows already in the tier are not re-read. Buckets that
+        do not fit in the capacity are dropped, oldest first.
+        :param timestamps_ms: int64 array of epoch-millisecond timestamps, sorted ascending.
+        :param columns: Dictionary of {(sensor_type, metric_type): float array}
+                        aligned with timestamps_ms, NaN for missing readings.
+        """
+        if len(timestamps_ms) == 0:
+            return
+        size = len(self)
+        oldest_bucket = self._bucket_starts[self._start] if size else None
+        if size >= self._capacity and timestamps_ms[-1] < oldest_bucket:
+            return
+        bucket_starts, stats = self._block_rollups(timestamps_ms, columns)
+        for key in stats:
+            if key not in self._stats:
+                self._stats[key] = self._new_stats(self._allocated)
+
+        if size:
+            # Buckets at or after the oldest one are folded into it, or ignored
+            # if newer; rollups of the newer rows are already in the tier.
+            keep = int(np.searchsorted(bucket_starts, oldest_bucket, side='left'))
+            if keep < len(bucket_starts) and bucket_starts[keep] == oldest_bucket:
+                row = self._start
+                for key, (mins, maxs, sums, counts) in stats.items():
+                    tier_mins, tier_maxs, tier_sums, tier_counts = self._stats[key]
+                    tier_mins[row] = np.fmin(tier_mins[row], mins[keep])
+                    tier_maxs[row] = np.fmax(tier_maxs[row], maxs[keep])
+                    tier_sums[row] += sums[keep]
+                    tier_counts[row] += counts[keep]
+            bucket_starts = bucket_starts[:keep]
+
+        count = min(len(bucket_starts), self._capacity - size)
+        if count <= 0:
+            return
+        first = len(bucket_starts) - count
+
+        # Shift the existing buckets right to make room; NumPy handles the overlap.
+        self._bucket_starts[count:count + size] = self._bucket_starts[self._start:self._end]
+        self._bucket_starts[:count] = bucket_starts[first:]
+        for key, arrays in self._stats.items():
+            block = stats.get(key)
+            for i, (array, empty) in enumerate(zip(arrays, (np.nan, np.nan, 0.0, 0))):
+                array[count:count + size] = array[self._start:self._end]
+                array[:count] = empty if block is None else block[i][first:first + count]
+        self._start = 0
+        self._end = count + size
+
+    def bucket_starts(self):
+        """Returns a read-only view of bucket start times in epoch milliseconds."""
+        view = self._bucket_starts[self._start:self._end]
+        view.flags.writeable = False
+        return view
+
+    def column_keys(self):
+        """Returns the list of (sensor_type, metric_type) pairs with rollups."""
+        return list(self._stats.keys())
+
+    def statistic(self, sensor_type, metric_type, statistic='mean'):
+        """
+        Returns one statistic per bucket, aligned with bucket_starts().
+        :param statistic: One of 'mean', 'min', 'max' or 'count'. Empty buckets
+                          yield NaN (or 0 for 'count').
+        Returns None if the metric has never been recorded.
+        """
+        arrays = self._stats.get((sensor_type, metric_type))
+        if arrays is None:
+            return None
+        mins, maxs, sums, counts = (array[self._start:self._end] for array in arrays)
+        if statistic == 'min':
+            return mins.copy()
+        if statistic == 'max':
+            return maxs.copy()
+        if statistic == 'count':
+            return counts.copy()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+    def select(self, start_ms=None, end_ms=None):
+        """
+        Returns a slice of the buckets overlapping [start_ms, end_ms]. Either bound
+        may be None to leave that side open.
+        """
+        starts = self._bucket_starts[self._start:self._end]
+        lo = 0 if start_ms is None else int(np.searchsorted(starts, start_ms - self.bucket_width_ms, side='right'))
+        hi = len(starts) if end_ms is None else int(np.searchsorted(starts, end_ms, side='right'))
+        return slice(lo, max(lo, hi))
+
+    def resize(self, capacity):
+        """Changes the capacity, keeping the newest buckets that still fit."""
+        capacity = max(int(capacity), 1)
+        keep = min(len(self), capacity)
+        old_start = self._end - keep
+        allocated = capacity + max(int(capacity * self.SLACK_FRACTION), 1)
+
+        bucket_starts = np.zeros(allocated, dtype=np.int64)
+        bucket_starts[:keep] = self._bucket_starts[old_start:self._end]
+        stats = {}
+        for key, arrays in self._stats.items():
+            new_arrays = self._new_stats(allocated)
+            for new_array, array in zip(new_arrays, arrays):
+                new_array[:keep] = array[old_start:self._end]
+            stats[key] = new_arrays
+
+        self._capacity = capacity
+        self._allocated = allocated
+        self._bucket_starts = bucket_starts
+        self._stats = stats
+        self._start = 0
+        self._end = keep
+
+    def clear(self):
+        """Discards all buckets."""
+        self._start = 0
+        self._end = 0
+
+
+def tier_capacity(bucket_width_ms, max_points, sampling_interval_ms):
+    """
+    Number of buckets a tier needs to span the same time window as a raw history
+    of max_points samples taken every sampling_interval_ms.
+    """
+    span_ms = max(int(max_points), 1) * max(int(sampling_interval_ms), 1)
+    return max(math.ceil(span_ms / bucket_width_ms) + 1, 2)
@@ -40,6 +40,11 @@ class SettingsManager(QObject):
             'data_log_enabled': True,
             'data_log_max_size_mb': 5.0,
             'data_log_max_rotations': 5,
+            'data_log_binary_enabled': True,
+            'data_log_batch_size': 50,
+            'data_log_flush_interval_s': 5.0,
+            'data_log_fsync_policy': 'interval',
+            'history_warm_start_enabled': True,
             'notification_method': 'Status Bar',
             'data_store_max_points': 1000,
             'alert_sound_file': 'alert.wav',
@@ -57,8 +62,11 @@ class SettingsManager(QObject):
             'gauge_type': 'Digital - Classic',
             'gauge_style': 'Full',
             'hide_matplotlib_toolbar': False,
+            'plot_decimation': 'Min/Max Envelope',
             'plot_font_size': 10,
             'plot_font_family': 'Inter',
+            # Upper bound for gauge repaints per second, see widgets/repaint_scheduler.py
+            'gauge_max_fps': 15,
             'matplotlib_line_colors': ["#1F3A60", "#4682B4", "#87CEFA", "#ADD8E6", "#6A96C2", "#2C3E50", "#3498DB", "#9B59B6", "#E74C3C", "#F1C40F"]
         },
         'Sensor_Presence': {
@@ -80,6 +88,28 @@ class SettingsManager(QObject):
             'bmp180_altitude_precision': 2,
             'bh1750_light_precision': 2
         },
+        # Sampling intervals in ms. 0 inherits: a metric falls back to its
+        # sensor's interval, a sensor to General/sampling_rate_ms.
+        'Sensor_Sampling': {
+            'htu21d_interval_ms': 0,
+            'htu21d_temperature_interval_ms': 0,
+            'htu21d_humidity_interval_ms': 0,
+            'bmp180_interval_ms': 0,
+            'bmp180_temperature_interval_ms': 0,
+            'bmp180_pressure_interval_ms': 0,
+            'bmp180_altitude_interval_ms': 0,
+            'bh1750_interval_ms': 0,
+            'bh1750_light_interval_ms': 0
+        },
+        # Driver options applied to the sensor hardware.
+        'Sensor_Hardware': {
+            'bh1750_mode': 'continuous_high_res',
+            'bh1750_mtreg': 69,
+            'htu21d_resolution': 'RH12_T14',
+            'bmp180_oversampling': 3,
+            'bmp180_temperature_every': 5,
+            'bmp180_pipeline_pressure': False
+        },
         'Sensor_Ranges': {
             'htu21d_temperature_min': -40.0,
             'htu21d_temperature_max': 125.0,
@@ -183,13 +213,15 @@ class SettingsManager(QObject):
         self.config = configparser.ConfigParser()
         self.current_stylesheet = ""
         self._theme_colors = {} 
+        # Bumped whenever _theme_colors is replaced or changed, see theme_version().
+        self._theme_version = 0
 
         try:
             self.load_settings()
         except Exception as e:
             logger.critical(f"A critical error occurred during SettingsManager initialization: {e}", exc_info=True)
             self.config = configparser.ConfigParser() 
-            self._theme_colors = {}
+            self._set_theme_colors({})
             self.set_default_settings() 
 
     def get_resource_path(self, file_name, sub_folder=None, resource_type=None):
@@ -353,6 +385,7 @@ class SettingsManager(QObject):
     def set_theme_color(self, key, value):
         """Manually sets or overrides a single theme color property in _theme_colors."""
         self._theme_colors[key] = value
+        self._theme_version += 1
         logger.debug(f"SettingsManager: Manually set theme property '{key}'.")            
 
     def get_sensor_configurations(self):
@@ -413,6 +446,43 @@ class SettingsManager(QObject):
     def get_precision(self, sensor_type, metric_type):
         return self.get_int_setting('Sensor_Precision', f"{sensor_type.lower()}_{metric_type.lower()}_precision", 2)
     
+    def get_sampling_interval(self, sensor_type, metric_type=None):
+        """
+        Returns the sampling interval in ms of a sensor, or of one of its metrics.
+        Unset or zero intervals inherit from the sensor, then from General/sampling_rate_ms.
+        """
+        interval_ms = 0
+        if metric_type is not None:
+            interval_ms = self.get_int_setting('Sensor_Sampling', f"{sensor_type.lower()}_{metric_type.lower()}_interval_ms", 0)
+        if interval_ms <= 0:
+            interval_ms = self.get_int_setting('Sensor_Sampling', f"{sensor_type.lower()}_interval_ms", 0)
+        if interval_ms <= 0:
+            interval_ms = self.get_int_setting('General', 'sampling_rate_ms', 3000)
+        return interval_ms
+
+    def get_sampling_intervals(self):
+        """Returns {sensor_type: {metric_type: interval_ms}} for every known sensor metric."""
+        return {sensor_type: {metric_type: self.get_sampling_interval(sensor_type, metric_type) for metric_type in metrics}
+                for sensor_type, metrics in self.DEFAULT_METRIC_INFO.items()}
+
+    def get_sensor_options(self):
+        """Returns {sensor_type: {option: value}}, the keyword arguments for each sensor driver."""
+        defaults = self.DEFAULT_SETTINGS['Sensor_Hardware']
+        return {
+            'BH1750': {
+                'mode': self.get_setting('Sensor_Hardware', 'bh1750_mode', fallback=defaults['bh1750_mode']),
+                'mtreg': self.get_int_setting('Sensor_Hardware', 'bh1750_mtreg', fallback=defaults['bh1750_mtreg'])
+            },
+            'HTU21D': {
+                'resolution': self.get_setting('Sensor_Hardware', 'htu21d_resolution', fallback=defaults['htu21d_resolution'])
+            },
+            'BMP180': {
+                'oversampling': self.get_int_setting('Sensor_Hardware', 'bmp180_oversampling', fallback=defaults['bmp180_oversampling']),
+                'temperature_every': self.get_int_setting('Sensor_Hardware', 'bmp180_temperature_every', fallback=defaults['bmp180_temperature_every']),
+                'pipeline_pressure': self.get_boolean_setting('Sensor_Hardware', 'bmp180_pipeline_pressure', fallback=defaults['bmp180_pipeline_pressure'])
+            }
+        }
+
     def get_gauge_type(self, sensor_type=None, metric_type=None):
         return self.get_setting('UI', 'gauge_type', fallback='Analog')
 
@@ -532,7 +602,7 @@ class SettingsManager(QObject):
         theme_path = self.get_resource_path(file_name=theme_file_name, sub_folder='themes')
         if not os.path.exists(theme_path):
             logger.error(f"SettingsManager.get_theme_stylesheet: Theme file not found: {theme_path}. No QSS theme will be applied.")
-            self._theme_colors = {} 
+            self._set_theme_colors({})
             return ""
 
         try:
@@ -542,12 +612,12 @@ class SettingsManager(QObject):
             separator = '/* --- QSS Styling Rules --- */'
             if separator not in qss_content:
                 logger.error(f"SettingsManager.get_theme_stylesheet: Stylesheet {theme_path} is missing the separator: '{separator}'")
-                self._theme_colors = {} 
+                self._set_theme_colors({})
                 return qss_content
 
             variable_part, rules_part = qss_content.split(separator, 1)
 
-            self._theme_colors = QSSParser.parse_variables(variable_part)
+            self._set_theme_colors(QSSParser.parse_variables(variable_part))
             if not self._theme_colors:
                 logger.error("SettingsManager.get_theme_stylesheet: Parsing variables from QSS returned an empty dictionary. Theming might fail.")
                 
@@ -587,9 +657,20 @@ class SettingsManager(QObject):
 
         except Exception as e:
             logger.exception(f"An unexpected error occurred while processing stylesheet {theme_path}: {e}")
-            self._theme_colors = {} 
+            self._set_theme_colors({})
             return ""
 
+    def _set_theme_colors(self, theme_colors):
+        self._theme_colors = theme_colors
+        self._theme_version += 1
+
+    def theme_version(self):
+        """
+        Returns a number that changes whenever the theme colors are loaded or
+        changed. Caches of values derived from the theme colors key on it.
+        """
+        return self._theme_version
+
     def get_theme_color(self, key, fallback=None):
         """Gets a specific color or value from the theme dictionary."""
         color = self._theme_colors.get(key, fallback)
@@ -5,7 +5,6 @@ import os
 import logging
 import configparser
 from datetime import datetime, timedelta
-import collections 
 
 from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QStackedWidget, QMessageBox, QTabWidget, QSpacerItem, QSizePolicy, QStatusBar
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal, pyqtSlot, QUrl, QThread, QObject, QLocale
@@ -14,9 +13,11 @@ from PyQt5.QtGui import QIcon, QFont, QFontDatabase, QPalette, QColor, QBrush, Q
 # Import custom modules
 from data_management.data_store import SensorDataStore
 from data_management.settings import SettingsManager
-from data_management.logger import SensorLogger 
+from data_management.logger import SensorLogger, shutdown_archiver
+from data_management.history_loader import HistoryLoader
 from ui import AnaviSensorUI
 from sensors.sensor_reader import SensorReaderThread
+from widgets.repaint_scheduler import repaint_scheduler, DEFAULT_MAX_FPS
 
 # Get the logger for this module. Configuration will be applied later by setup_logging.
 logger = logging.getLogger(__name__)
@@ -97,6 +98,7 @@ class MainWindow(QMainWindow):
         self._setup_data_logger_with_config() 
         
         # --- UI Initialization ---
+        repaint_scheduler().set_max_fps(self.settings_manager.get_int_setting('UI', 'gauge_max_fps', fallback=DEFAULT_MAX_FPS))
         initial_gauge_type = self.settings_manager.get_setting('UI', 'gauge_type', fallback='Standard')
         initial_gauge_style = self.settings_manager.get_setting('UI', 'gauge_style', fallback='Full')
         initial_dashboard_plot_time_range = self.settings_manager.get_setting('General', 'dashboard_plot_time_range', fallback='Last 30 minutes')
@@ -133,6 +135,7 @@ class MainWindow(QMainWindow):
         self.setup_connections() 
 
         self.setup_sensor_thread() 
+        self.setup_history_loader()
         self.setup_alert_timer() 
 
         logger.info("Application starting up.")
@@ -228,6 +231,10 @@ class MainWindow(QMainWindow):
         if data_log_enabled:
             max_size_mb = self.settings_manager.get_float_setting('General', 'data_log_max_size_mb', fallback=5.0)
             max_rotations = self.settings_manager.get_int_setting('General', 'data_log_max_rotations', fallback=5)
+            binary_log_enabled = self.settings_manager.get_boolean_setting('General', 'data_log_binary_enabled', fallback=True)
+            batch_size = self.settings_manager.get_int_setting('General', 'data_log_batch_size', fallback=50)
+            flush_interval_s = self.settings_manager.get_float_setting('General', 'data_log_flush_interval_s', fallback=5.0)
+            fsync_policy = self.settings_manager.get_setting('General', 'data_log_fsync_policy', fallback='interval')
             
             if self.sensor_logger:
                 self.sensor_logger.close() 
@@ -236,24 +243,25 @@ class MainWindow(QMainWindow):
                 log_dir=self.get_resource_path("Sensor_Logs", "logs"), 
                 archive_dir=self.get_resource_path("Archive_Sensor_Logs", "logs"),
                 max_file_size_mb=max_size_mb,
-                max_rotations=max_rotations
-            )
-            self.data_store.data_updated.connect(
-                lambda data: self.sensor_logger.log_sensor_data(data, self.settings_manager)
+                max_rotations=max_rotations,
+                binary_log_enabled=binary_log_enabled,
+                batch_size=batch_size,
+                flush_interval_s=flush_interval_s,
+                fsync_policy=fsync_policy
             )
             logger.info("Sensor data logging ENABLED.")
         else:
             if self.sensor_logger:
-                try:
-                    self.data_store.data_updated.disconnect(
-                        lambda data: self.sensor_logger.log_sensor_data(data, self.settings_manager)
-                    )
-                except (TypeError, RuntimeError):
-                    pass
                 self.sensor_logger.close()
                 self.sensor_logger = None
             logger.info("Sensor data logging DISABLED.")    
 
+    @pyqtSlot(dict)
+    def _log_sensor_snapshot(self, data_snapshot):
+        """Queues a snapshot for the sensor data logger, if logging is enabled."""
+        if self.sensor_logger:
+            self.sensor_logger.log_sensor_data(data_snapshot, self.settings_manager)
+
     def load_custom_font(self):
         """Loads a custom font (e.g., Inter) from resources if available."""
         font_path = self.get_resource_path("Inter-Regular.ttf", "fonts")
@@ -274,6 +282,7 @@ class MainWindow(QMainWindow):
     def setup_connections(self):
         """Sets up connections for signals and slots."""
         self.data_store.data_updated.connect(self.ui_tabs.update_sensor_values) 
+        self.data_store.data_updated.connect(self._log_sensor_snapshot)
         self.ui_tabs.ui_customization_changed.connect(self.handle_ui_customization_change)
         self.ui_tabs.theme_changed.connect(self.apply_stylesheet_by_name)
         self.ui_tabs.thresholds_updated.connect(self.update_thresholds)
@@ -287,21 +296,35 @@ class MainWindow(QMainWindow):
         """
         Slot to handle general settings updates.
         """
-        if section == 'General' and key in ['data_log_enabled', 'data_log_max_size_mb', 'data_log_max_rotations']:
+        if section == 'General' and key in ['data_log_enabled', 'data_log_max_size_mb', 'data_log_max_rotations',
+                                            'data_log_binary_enabled', 'data_log_batch_size',
+                                            'data_log_flush_interval_s', 'data_log_fsync_policy']:
             self._setup_data_logger_with_config() 
         
         if section == 'General' and key == 'sampling_rate_ms':
             if hasattr(self, 'sensor_reader') and self.sensor_reader:
                 self.sensor_reader.set_sampling_rate(int(value))
+            self.data_store.set_sampling_interval(int(value))
+
+        if (section == 'General' and key == 'sampling_rate_ms') or section == 'Sensor_Sampling':
+            if hasattr(self, 'sensor_reader') and self.sensor_reader:
+                self.sensor_reader.set_sampling_intervals(self.settings_manager.get_sampling_intervals())
+
+        if section == 'Sensor_Hardware':
+            if hasattr(self, 'sensor_reader') and self.sensor_reader:
+                self.sensor_reader.set_sensor_options(self.settings_manager.get_sensor_options())
 
         if section == 'General' and key == 'data_store_max_points':
-            self.data_store.max_points = int(value)
-            self.data_store.data_history = collections.deque(self.data_store.data_history, maxlen=int(value))
+            self.data_store.set_max_points(int(value))
+
+        if section == 'UI' and key == 'gauge_max_fps':
+            repaint_scheduler().set_max_fps(self.settings_manager.get_int_setting('UI', 'gauge_max_fps', fallback=DEFAULT_MAX_FPS))
 
     def setup_sensor_thread(self):
-        """Sets up a QThread for sensor data acquisition using SensorReaderThread."""
-        self.sensor_thread = QThread()
-        
+        """
+        Sets up sensor data acquisition using SensorReaderThread. The reader runs
+        its own acquisition thread and emits data_ready on the GUI thread.
+        """
         sensor_config = self.settings_manager.get_sensor_configurations()
         mock_mode = self.settings_manager.get_boolean_setting('General', 'mock_mode')
         sampling_rate = self.settings_manager.get_int_setting('General', 'sampling_rate_ms')
@@ -310,19 +333,59 @@ class MainWindow(QMainWindow):
             data_store=self.data_store,
             mock_mode=mock_mode,
             sampling_rate_ms=sampling_rate,
-            sensor_config=sensor_config
+            sensor_config=sensor_config,
+            sampling_intervals=self.settings_manager.get_sampling_intervals(),
+            sensor_options=self.settings_manager.get_sensor_options(),
+            parent=self
         )
-        self.sensor_reader.moveToThread(self.sensor_thread)
-
-        self.sensor_thread.started.connect(self.sensor_reader.run)
-        self.sensor_reader.finished.connect(self.sensor_thread.quit)
-        self.sensor_reader.finished.connect(self.sensor_reader.deleteLater)
-        self.sensor_thread.finished.connect(self.sensor_thread.deleteLater)
 
         self.sensor_reader.data_ready.connect(self.data_store.add_data)
         self.sensor_reader.sensors_discovered.connect(self.data_store.update_available_sensors)
 
-        self.sensor_thread.start()
+        self.sensor_reader.run()
+
+    def setup_history_loader(self):
+        """
+        Reloads recent history from the sensor data logs on a background QThread,
+        so plots are not blank after a restart. Blocks arrive newest first.
+        """
+        self.history_thread = None
+        self.history_loader = None
+        if not self.settings_manager.get_boolean_setting('General', 'history_warm_start_enabled', fallback=True):
+            logger.info("History warm start DISABLED.")
+            return
+
+        now_ms = int(datetime.now().timestamp() * 1000)
+        self.history_thread = QThread()
+        self.history_loader = HistoryLoader(
+            log_dir=self.get_resource_path("Sensor_Logs", "logs"),
+            archive_dir=self.get_resource_path("Archive_Sensor_Logs", "logs"),
+            start_ms=now_ms - self.data_store.history_window_ms(),
+            end_ms=now_ms,
+            max_rows=self.data_store.max_points
+        )
+        self.history_loader.moveToThread(self.history_thread)
+        self.data_store.reserve_history(self.history_loader.max_rows)
+
+        self.history_thread.started.connect(self.history_loader.run)
+        self.history_loader.chunk_loaded.connect(self.data_store.prepend_history)
+        self.history_loader.finished.connect(self.history_thread.quit)
+        self.history_loader.finished.connect(self.history_loader.deleteLater)
+        self.history_loader.finished.connect(self._on_history_loaded)
+        self.history_thread.finished.connect(self.history_thread.deleteLater)
+        self.history_thread.finished.connect(self._on_history_loader_finished)
+
+        self.history_thread.start()
+
+    @pyqtSlot(int)
+    def _on_history_loaded(self, rows):
+        # The loader deletes itself once finished; don't keep a reference to it.
+        self.history_loader = None
+
+    @pyqtSlot()
+    def _on_history_loader_finished(self):
+        self.history_thread = None
+        self.history_loader = None
 
     def setup_alert_timer(self):
         """Sets up a timer for clearing temporary alerts."""
@@ -446,16 +509,25 @@ class MainWindow(QMainWindow):
         """Handles the close event of the main window."""
         logger.info("Application closing down.")
         if hasattr(self, 'sensor_reader') and self.sensor_reader:
+            # Cancels the acquisition loop; returns within the read in progress.
             self.sensor_reader.stop()
-        if hasattr(self, 'sensor_thread') and self.sensor_thread.isRunning():
-            self.sensor_thread.quit()
-            self.sensor_thread.wait(5000) 
-            if self.sensor_thread.isRunning():
-                self.sensor_thread.terminate() 
+
+        if self.history_thread is not None:
+            # Either object may already have been deleted by deleteLater before
+            # the queued slots clearing these references ran.
+            try:
+                if self.history_loader is not None:
+                    self.history_loader.stop()
+                self.history_thread.quit()
+                self.history_thread.wait(5000)
+            except RuntimeError:
+                pass
         
         if self.sensor_logger:
             self.sensor_logger.close() 
             self.sensor_logger.cleanup() 
+        # Lets archive jobs started by any logger, including replaced ones, finish.
+        shutdown_archiver()
         
         self.data_store.cleanup()
         self.settings_manager.save_settings() 
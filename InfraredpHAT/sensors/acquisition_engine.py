@@ -0,0 +1,395 @@
+# sensors/acquisition_engine.py
+# -*- coding: utf-8 -*-
+import asyncio
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sensors.device_health import DeviceHealth
+
+logger = logging.getLogger(__name__)
+
+
+class AcquisitionEngine:
+    """
+    Reads sensors on an asyncio event loop running in a dedicated thread.
+
+    Each sensor is polled on its own cadence: a min-heap of (due time, sensor)
+    decides which device is read next. A sensor is read as often as its most
+    frequently sampled metric needs, and each metric is only reported once its
+    own interval has passed, so snapshots are sparse and may hold only some
+    sensors and metrics. Sensors that fall due together are reported together.
+
+    Drivers with a read_data_async() coroutine are awaited directly, so their
+    conversion waits overlap on the loop. Other drivers are read on a
+    single-threaded worker per device. A device is never read twice at the
+    same time, and every reading carries the time it was captured.
+
+    A sensor whose read fails (raises or returns no values) is backed off
+    exponentially and, after repeated failures, no longer read but probed in
+    the background until it can be re-initialised (see sensors.device_health).
+    A failing device therefore never holds up the others.
+
+    Snapshots are put on output_queue (a thread-safe queue.Queue) and
+    on_output() is called from the engine thread after each one, so the
+    consumer can schedule draining the queue on its own thread.
+
+    All public methods are safe to call from any thread. Reconfiguration wakes
+    the loop and takes effect immediately; stop() cancels the loop, so it
+    returns within the read that is in progress rather than a sampling period.
+    """
+    def __init__(self, sensor_instances, sensor_config, output_queue, sampling_rate_ms=5000,
+                 sampling_intervals=None, on_output=None):
+        """
+        :param sensor_instances: {sensor_type: driver} of the sensors to read.
+        :param sensor_config: Enabled sensors; only sensor types present here are read.
+        :param output_queue: queue.Queue receiving the snapshot dictionaries.
+        :param sampling_rate_ms: Interval for sensors without an entry in sampling_intervals.
+        :param sampling_intervals: Optional {sensor_type: {metric_type: interval_ms}}.
+        :param on_output: Optional callable invoked after each snapshot is queued.
+        """
+        self.sensor_instances = dict(sensor_instances)
+        self.sensor_config = sensor_config
+        self.output_queue = output_queue
+        self.on_output = on_output
+        self._sampling_rate_ms = sampling_rate_ms
+        self._sampling_intervals = sampling_intervals if sampling_intervals is not None else {}
+
+        self._thread = None
+        self._loop = None
+        self._main_task = None
+        self._wake = None
+        self._device_workers = {}
+        self._pending_reads = {}
+        self._probes = {}
+        self._health = {}
+        self._schedule = []
+        self._schedule_dirty = True
+        self._batches = []
+        self._last_reported_ms = {}
+        # Timestamp of the last snapshot put on output_queue; snapshot timestamps never go back.
+        self._last_snapshot_ms = None
+
+    # --- Control (any thread) ---
+
+    def start(self):
+        """Starts the engine thread. Returns once its event loop is running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._thread_main, args=(started,),
+                                        name="AcquisitionEngine", daemon=True)
+        self._thread.start()
+        started.wait()
+        logger.info("AcquisitionEngine: Started.")
+
+    def stop(self, timeout_s=2.0):
+        """
+        Cancels the acquisition loop and waits up to timeout_s for the thread to exit.
+        :return: True if the engine thread has stopped.
+        """
+        if self._thread is None:
+            return True
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._cancel)
+            except RuntimeError:
+                pass # The loop already shut down.
+        self._thread.join(timeout_s)
+        stopped = not self._thread.is_alive()
+        if stopped:
+            self._thread = None
+            logger.info("AcquisitionEngine: Stopped.")
+        else:
+            logger.error(f"AcquisitionEngine: Thread did not stop within {timeout_s} s.")
+        return stopped
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def device_states(self):
+        """{sensor_type: DeviceHealth state} of the sensors read so far."""
+        return {sensor_type: health.state for sensor_type, health in list(self._health.items())}
+
+    def set_sampling_rate(self, rate_ms):
+        self._call_in_loop(self._configure, sampling_rate_ms=rate_ms)
+
+    def set_sampling_intervals(self, sampling_intervals):
+        self._call_in_loop(self._configure, sampling_intervals=dict(sampling_intervals))
+
+    def _call_in_loop(self, callback, **kwargs):
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(lambda: callback(**kwargs))
+                return
+            except RuntimeError:
+                pass
+        # Not running: apply directly, it is picked up on the next start().
+        callback(**kwargs)
+
+    # --- Engine thread ---
+
+    def _thread_main(self, started):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        try:
+            self._wake = asyncio.Event()
+            self._main_task = loop.create_task(self._run())
+            loop.call_soon(started.set)
+            loop.run_until_complete(self._main_task)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"AcquisitionEngine: Acquisition loop failed: {e}", exc_info=True)
+        finally:
+            started.set()
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                self._loop = None
+                loop.close()
+                # Reads on worker threads cannot be interrupted; let the one in
+                # progress finish so its sensor is not closed under it.
+                for worker in self._device_workers.values():
+                    worker.shutdown(wait=True)
+                self._device_workers = {}
+
+    def _cancel(self):
+        if self._main_task is not None:
+            self._main_task.cancel()
+
+    def _configure(self, sampling_rate_ms=None, sampling_intervals=None):
+        if sampling_rate_ms is not None:
+            self._sampling_rate_ms = sampling_rate_ms
+        if sampling_intervals is not None:
+            self._sampling_intervals = sampling_intervals
+        self._schedule_dirty = True
+        if self._wake is not None:
+            self._wake.set()
+        logger.info(f"AcquisitionEngine: Sampling rate {self._sampling_rate_ms} ms, intervals {self._sampling_intervals}.")
+
+    def _sensor_interval_ms(self, sensor_type):
+        """A sensor is read as often as its most frequently sampled metric needs."""
+        intervals = [interval_ms for interval_ms in self._sampling_intervals.get(sensor_type, {}).values() if interval_ms > 0]
+        return max(min(intervals) if intervals else self._sampling_rate_ms, 1)
+
+    def _metric_interval_ms(self, sensor_type, metric_type):
+        interval_ms = self._sampling_intervals.get(sensor_type, {}).get(metric_type, 0)
+        return interval_ms if interval_ms > 0 else self._sensor_interval_ms(sensor_type)
+
+    def _device_worker(self, sensor_type):
+        """Returns the single-threaded worker for drivers that can only be read blocking."""
+        worker = self._device_workers.get(sensor_type)
+        if worker is None:
+            worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{sensor_type}Reader")
+            self._device_workers[sensor_type] = worker
+        return worker
+
+    async def _read_sensor(self, sensor_type, sensor_instance):
+        """
+        Reads one sensor.
+        :return: (capture_ms, data), capture_ms being the time the reading completed.
+        """
+        if hasattr(sensor_instance, 'read_data_async'):
+            data = await sensor_instance.read_data_async()
+        else:
+            data = await asyncio.get_running_loop().run_in_executor(self._device_worker(sensor_type),
+                                                                     sensor_instance.read_data)
+        return int(time.time() * 1000), data
+
+    def _device_health(self, sensor_type):
+        health = self._health.get(sensor_type)
+        if health is None:
+            health = DeviceHealth(sensor_type)
+            self._health[sensor_type] = health
+        return health
+
+    def _record_read(self, sensor_type, data):
+        """Updates the device health after a read. A read without any value counts as a failure."""
+        now = asyncio.get_running_loop().time()
+        if data and any(value is not None for value in data.values()):
+            self._device_health(sensor_type).record_success(now)
+        else:
+            self._device_health(sensor_type).record_failure(now)
+
+    async def _probe_sensor(self, sensor_type, sensor_instance):
+        """
+        Tries to re-initialise a sensor whose circuit is open. Drivers without
+        reinitialize() are probed with a plain read.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            if hasattr(sensor_instance, 'reinitialize'):
+                recovered = await loop.run_in_executor(self._device_worker(sensor_type), sensor_instance.reinitialize)
+            else:
+                _, data = await self._read_sensor(sensor_type, sensor_instance)
+                recovered = bool(data) and any(value is not None for value in data.values())
+        except Exception as e:
+            logger.debug(f"AcquisitionEngine: Probing {sensor_type} failed: {e}")
+            recovered = False
+        finally:
+            self._probes.pop(sensor_type, None)
+        if recovered:
+            self._device_health(sensor_type).record_success(loop.time())
+        else:
+            self._device_health(sensor_type).record_failure(loop.time())
+
+    def _reschedule(self, now):
+        """Makes every configured sensor due now, e.g. after the intervals changed."""
+        self._schedule = [(now, sensor_type) for sensor_type in self.sensor_instances
+                          if sensor_type in self.sensor_config]
+        heapq.heapify(self._schedule)
+        self._schedule_dirty = False
+
+    def _start_due_reads(self, now):
+        """
+        Pops every sensor that is due from the schedule, starts its read and pushes
+        its next due time. Returns the sensor types whose reads were started.
+        """
+        started = []
+        while self._schedule and self._schedule[0][0] <= now:
+            due_time, sensor_type = heapq.heappop(self._schedule)
+            sensor_instance = self.sensor_instances.get(sensor_type)
+            if sensor_instance is None or sensor_type not in self.sensor_config:
+                continue
+            interval_s = self._sensor_interval_ms(sensor_type) / 1000.0
+            next_due = due_time + interval_s
+            if next_due <= now:
+                # Fell behind (e.g. the read was slow); skip the missed slots.
+                next_due = now + interval_s
+            heapq.heappush(self._schedule, (next_due, sensor_type))
+
+            if sensor_type in self._pending_reads or sensor_type in self._probes:
+                logger.debug(f"AcquisitionEngine: {sensor_type} read still in progress, skipping this slot.")
+                continue
+            health = self._device_health(sensor_type)
+            if not health.can_attempt(now):
+                continue
+            if health.is_open:
+                self._probes[sensor_type] = asyncio.ensure_future(self._probe_sensor(sensor_type, sensor_instance))
+                continue
+            self._pending_reads[sensor_type] = asyncio.ensure_future(self._read_sensor(sensor_type, sensor_instance))
+            started.append(sensor_type)
+        return started
+
+    def _emit_completed_batches(self, now):
+        """
+        Queues a snapshot for every batch whose reads have all completed. A batch
+        whose deadline has passed is queued with the reads that did complete;
+        the stragglers form a batch of their own.
+        """
+        remaining = []
+        for deadline, sensor_types in self._batches:
+            running = [s for s in sensor_types if s in self._pending_reads and not self._pending_reads[s].done()]
+            if running and now < deadline:
+                remaining.append((deadline, sensor_types))
+                continue
+            snapshot = self._collect_reads([s for s in sensor_types if s not in running])
+            if snapshot is not None:
+                self.output_queue.put(snapshot)
+                if self.on_output is not None:
+                    self.on_output()
+            if running:
+                logger.debug(f"AcquisitionEngine: Reads of {running} still in progress, collecting them later.")
+                remaining.append((now + min(self._sensor_interval_ms(s) for s in running) / 1000.0, running))
+        self._batches = remaining
+
+    def _collect_reads(self, sensor_types):
+        """
+        Builds a snapshot from the completed reads of sensor_types. Metrics whose
+        own interval has not yet passed since they were last reported are left out.
+        """
+        sensor_data = {}
+        capture_times = []
+        for sensor_type in sensor_types:
+            task = self._pending_reads.pop(sensor_type, None)
+            if task is None:
+                continue
+            try:
+                capture_ms, data = task.result()
+            except Exception as e:
+                logger.error(f"AcquisitionEngine: Reading {sensor_type} failed: {e}", exc_info=True)
+                self._record_read(sensor_type, None)
+                continue
+            self._record_read(sensor_type, data)
+            if not data:
+                continue
+
+            # Half a read interval of slack, so a metric whose interval is a
+            # multiple of the sensor's is not pushed back by jitter.
+            slack_ms = self._sensor_interval_ms(sensor_type) // 2
+            metrics = {}
+            for metric_type, value in data.items():
+                last_ms = self._last_reported_ms.get((sensor_type, metric_type))
+                if last_ms is not None and capture_ms - last_ms < self._metric_interval_ms(sensor_type, metric_type) - slack_ms:
+                    continue
+                self._last_reported_ms[(sensor_type, metric_type)] = capture_ms
+                metrics[metric_type] = {
+                    'value': value,
+                    'is_alert': False, # Alert status is determined later
+                    'timestamp': capture_ms
+                }
+            if metrics:
+                sensor_data[sensor_type] = metrics
+                capture_times.append(capture_ms)
+
+        if not sensor_data:
+            return None
+        # Batches complete independently, so a batch started later can be emitted
+        # first. The snapshot is stamped with its newest capture time, clamped so
+        # the stream stays in time order for the history, rollups and logs.
+        timestamp_ms = max(capture_times)
+        if self._last_snapshot_ms is not None:
+            timestamp_ms = max(timestamp_ms, self._last_snapshot_ms)
+        self._last_snapshot_ms = timestamp_ms
+        return {
+            'timestamp': timestamp_ms,
+            'data': sensor_data
+        }
+
+    async def _run(self):
+        """
+        The acquisition loop. Sleeps until the next sensor is due, a read
+        completes or the engine is reconfigured, whichever comes first.
+        """
+        loop = asyncio.get_running_loop()
+        wake_task = None
+        try:
+            while True:
+                now = loop.time()
+                if self._schedule_dirty:
+                    self._reschedule(now)
+
+                started = self._start_due_reads(now)
+                if started:
+                    # Reads that fall due together are reported together, as long as
+                    # they complete before the fastest of them is due again.
+                    deadline = now + min(self._sensor_interval_ms(s) for s in started) / 1000.0
+                    self._batches.append((deadline, started))
+
+                wake_times = [self._schedule[0][0]] if self._schedule else []
+                wake_times += [deadline for deadline, _ in self._batches]
+                timeout_s = max(min(wake_times) - loop.time(), 0) if wake_times else None
+
+                if wake_task is None or wake_task.done():
+                    self._wake.clear()
+                    wake_task = asyncio.ensure_future(self._wake.wait())
+                running = [task for task in self._pending_reads.values() if not task.done()]
+                await asyncio.wait(running + [wake_task], timeout=timeout_s, return_when=asyncio.FIRST_COMPLETED)
+
+                self._emit_completed_batches(loop.time())
+        finally:
+            if wake_task is not None:
+                wake_task.cancel()
+            pending = list(self._pending_reads.values()) + list(self._probes.values())
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            self._pending_reads = {}
+            self._probes = {}
+            self._batches = []
@@ -2,21 +2,46 @@
 # This file contains the implementation for reading data from the BH1750 sensor.
 # Adapted from: https://github.com/AnaviTechnology/anavi-examples/blob/master/sensors/BH1750/python/bh1750.py
 
-import smbus2 
 import time
 import logging
 import random # For mock mode
 
+from sensors.conversion import run_blocking, run_async
+from sensors.device_health import backoff_delay, CONNECT_RETRY_BASE_S, READ_RETRY_DELAY_S
+from sensors.i2c_bus import bus_manager
+
 logger = logging.getLogger(__name__)
 
 # BH1750 Address
 BH1750_ADDR = 0x23
 
 # BH1750 Commands
+BH1750_POWER_DOWN = 0x00 # Power Down
 BH1750_POWER_ON = 0x01   # Power On
 # Changed to ONE_TIME_HIGH_RES_MODE for more reliable single measurements
 BH1750_MEASUREMENT_MODE = 0x20 # One-time measurement mode, high resolution (1 lux)
-# BH1750_CONTINUOUS_HIGH_RES_MODE = 0x10 # Keep for reference if continuous mode is desired later
+BH1750_CONTINUOUS_HIGH_RES_MODE = 0x10
+BH1750_MTREG_HIGH_BITS = 0x40 # OR'ed with MTreg bits 7..5
+BH1750_MTREG_LOW_BITS = 0x60  # OR'ed with MTreg bits 4..0
+
+# Measurement modes by settings name: (command, continuous, lux per count divisor
+# at the default MTreg, maximum measurement time in seconds at the default MTreg).
+# The high resolution times are the datasheet maximum (typ. 120 ms), which proved
+# reliable in testing.
+BH1750_MODES = {
+    'continuous_high_res': (BH1750_CONTINUOUS_HIGH_RES_MODE, True, 1.2, 0.18),   # 1 lx
+    'continuous_high_res2': (0x11, True, 2.4, 0.18),                             # 0.5 lx
+    'continuous_low_res': (0x13, True, 1.2, 0.024),                              # 4 lx
+    'one_time_high_res': (BH1750_MEASUREMENT_MODE, False, 1.2, 0.18),
+    'one_time_high_res2': (0x21, False, 2.4, 0.18),
+    'one_time_low_res': (0x23, False, 1.2, 0.024),
+}
+DEFAULT_MODE = 'continuous_high_res'
+
+# Measurement time register: longer integration raises sensitivity and conversion time.
+BH1750_MTREG_DEFAULT = 69
+BH1750_MTREG_MIN = 31
+BH1750_MTREG_MAX = 254
 
 # I2C bus number (typically 1 for Raspberry Pi)
 I2C_BUS = 1
@@ -25,19 +50,30 @@ class BH1750:
     """
     Class to interface with the BH1750 ambient light sensor.
     Supports both mock mode (for development without hardware) and actual I2C communication.
+
+    In the continuous modes the sensor is configured once and keeps converting
+    on its own, so a read returns the latest conversion without waiting. The
+    one-time modes start a conversion and wait for it on every read.
     """
-    def __init__(self, bus_number=I2C_BUS, mock_mode=False):
+    def __init__(self, bus_number=I2C_BUS, mock_mode=False, mode=DEFAULT_MODE, mtreg=BH1750_MTREG_DEFAULT):
         """
         Initializes the BH1750 sensor.
         :param bus_number (int): The I2C bus number (typically 1 for Raspberry Pi).
         :param mock_mode (bool): If True, operates in mock mode (generates random data).
                                   If False, attempts to initialize I2C bus for hardware communication.
+        :param mode (str): Measurement mode, one of BH1750_MODES.
+        :param mtreg (int): Measurement time register, BH1750_MTREG_MIN to BH1750_MTREG_MAX.
         """
         self.bus_number = bus_number
         self.mock_mode = mock_mode
         self.bus = None # Initialize bus to None
+        self.mode = DEFAULT_MODE
+        self.mtreg = BH1750_MTREG_DEFAULT
+        # Monotonic time at which the first continuous conversion is complete.
+        self._conversion_ready_at = 0.0
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.logger.info(f"BH1750 sensor initializing (mock_mode={self.mock_mode}).")
+        self._set_options(mode, mtreg)
+        self.logger.info(f"BH1750 sensor initializing (mock_mode={self.mock_mode}, mode={self.mode}, MTreg={self.mtreg}).")
 
         # Mock data initialization
         self._mock_light = 300.0 # Initial mock light value
@@ -59,7 +95,7 @@ class BH1750:
     def connect_and_power_on(self, retries=3):
         """
         Attempts to connect to the I2C bus and power on the sensor with retries.
-        Uses smbus2 for I2C communication.
+        The bus is shared with the other sensors (see sensors.i2c_bus).
         Raises IOError if connection fails after retries.
         """
         if self.mock_mode: # Should not be called in mock mode, but safety check
@@ -67,44 +103,103 @@ class BH1750:
 
         for i in range(retries):
             try:
-                if self.bus: # Close existing bus if any
-                    try:
-                        self.bus.close()
-                        self.logger.debug(f"BH1750: Closed existing I2C bus {self.bus_number} connection.")
-                    except Exception as close_e:
-                        self.logger.warning(f"BH1750: Error closing existing I2C bus {self.bus_number}: {close_e}")
-
-                self.bus = smbus2.SMBus(self.bus_number)
+                if self.bus is None:
+                    self.bus = bus_manager.acquire(self.bus_number)
                 self.bus.write_byte(BH1750_ADDR, BH1750_POWER_ON) # Ensure sensor is powered on
                 time.sleep(0.001) # Small delay after power on
+                self._apply_configuration()
                 self.logger.info(f"BH1750 sensor initialized and powered on I2C bus {self.bus_number} (Attempt {i+1}/{retries}).")
                 return True
             except FileNotFoundError:
                 self.logger.error(f"Attempt {i+1}/{retries}: Could not open I2C bus {self.bus_number}. Ensure I2C is enabled and 'smbus2' library is installed and permissions are correct.")
-                time.sleep(1) # Wait before retrying
             except IOError as e: # Catch IOError specifically for bus/sensor issues
-                self.logger.warning(f"Attempt {i+1}/{retries}: I/O Error connecting to BH1750 sensor or powering on: {e}. Retrying...")
-                time.sleep(1)
+                self.logger.warning(f"Attempt {i+1}/{retries}: I/O Error connecting to BH1750 sensor or powering on: {e}.")
             except Exception as e:
-                self.logger.warning(f"Attempt {i+1}/{retries}: Unexpected error during BH1750 connection or power on: {e}. Retrying...", exc_info=True)
-                time.sleep(1)
+                self.logger.warning(f"Attempt {i+1}/{retries}: Unexpected error during BH1750 connection or power on: {e}.", exc_info=True)
+            if i + 1 < retries:
+                time.sleep(backoff_delay(i + 1, CONNECT_RETRY_BASE_S)) # 50 ms, 100 ms, ...
         
         self.logger.error(f"Failed to initialize BH1750 sensor after {retries} attempts.")
         if self.bus:
-            try:
-                self.bus.close()
-            except Exception as e:
-                self.logger.error(f"Error closing BH1750 I2C bus {self.bus_number} during failed init cleanup: {e}", exc_info=True)
-            finally:
-                self.bus = None # Ensure bus is None on failure
+            bus_manager.release(self.bus)
+            self.bus = None # Ensure bus is None on failure
         raise IOError("BH1750 sensor initialization failed. Check connections and I2C setup.")
 
 
-    def read_light(self):
+    def reinitialize(self):
         """
-        Reads ambient light from the BH1750 sensor in Lux.
-        Returns:
-            float: Light intensity in Lux, or None if reading fails.
+        Reconnects a sensor that stopped responding, e.g. after it was unplugged
+        and plugged back in. Makes a single attempt without waiting; the caller
+        decides when to try again.
+        :return: True if the sensor responds again.
+        """
+        if self.mock_mode:
+            return True
+        try:
+            return self.connect_and_power_on(retries=1)
+        except IOError:
+            return False
+
+    def _set_options(self, mode, mtreg):
+        if mode not in BH1750_MODES:
+            self.logger.warning(f"BH1750: Unknown measurement mode '{mode}'. Using '{DEFAULT_MODE}'.")
+            mode = DEFAULT_MODE
+        mtreg = int(mtreg)
+        if not BH1750_MTREG_MIN <= mtreg <= BH1750_MTREG_MAX:
+            self.logger.warning(f"BH1750: MTreg {mtreg} out of range {BH1750_MTREG_MIN}-{BH1750_MTREG_MAX}. Clamping.")
+            mtreg = max(BH1750_MTREG_MIN, min(BH1750_MTREG_MAX, mtreg))
+        self.mode = mode
+        self.mtreg = mtreg
+
+    @property
+    def is_continuous(self):
+        return BH1750_MODES[self.mode][1]
+
+    @property
+    def measurement_time_s(self):
+        """Maximum conversion time for the current mode and MTreg."""
+        return BH1750_MODES[self.mode][3] * self.mtreg / BH1750_MTREG_DEFAULT
+
+    def _raw_to_lux(self, raw_value):
+        return raw_value / BH1750_MODES[self.mode][2] * BH1750_MTREG_DEFAULT / self.mtreg
+
+    def _apply_configuration(self):
+        """Writes MTreg and, in a continuous mode, starts continuous measurement."""
+        self.bus.write_byte(BH1750_ADDR, BH1750_MTREG_HIGH_BITS | (self.mtreg >> 5))
+        self.bus.write_byte(BH1750_ADDR, BH1750_MTREG_LOW_BITS | (self.mtreg & 0x1F))
+        if self.is_continuous:
+            self.bus.write_byte(BH1750_ADDR, BH1750_MODES[self.mode][0])
+            self._conversion_ready_at = time.monotonic() + self.measurement_time_s
+
+    def configure(self, mode=None, mtreg=None):
+        """
+        Changes the measurement mode and/or MTreg. Must not be called while a
+        read is in progress.
+        """
+        self._set_options(self.mode if mode is None else mode, self.mtreg if mtreg is None else mtreg)
+        self.logger.info(f"BH1750: Mode set to '{self.mode}', MTreg {self.mtreg}.")
+        if self.mock_mode or self.bus is None:
+            return
+        try:
+            if not self.is_continuous:
+                # Leaves continuous measurement; the sensor powers down after each one-time reading.
+                self.bus.write_byte(BH1750_ADDR, BH1750_POWER_ON)
+            self._apply_configuration()
+        except IOError as e:
+            self.logger.error(f"BH1750: Failed to apply configuration: {e}")
+
+    def _read_result(self):
+        """
+        Reads the two result bytes. This is a plain read: a register-style read
+        would first write a command byte, and 0x00 is Power Down, which would
+        stop continuous measurement.
+        """
+        return self.bus.read_bytes(BH1750_ADDR, 2)
+
+    def _measure_light(self):
+        """
+        Measurement steps for one light reading (see sensors.conversion): yields
+        the conversion and retry waits, returns the light intensity in Lux or None.
         """
         if self.mock_mode:
             # Simulate light change with some noise
@@ -120,17 +215,21 @@ class BH1750:
 
         for attempt in range(3): # Retry reading up to 3 times
             try:
-                # Send the One-Time High Resolution Mode command before each read
-                self.bus.write_byte(BH1750_ADDR, BH1750_MEASUREMENT_MODE)
-                # Use a slightly longer delay for reliability with one-time mode, as per your testing
-                time.sleep(0.18) 
+                if self.is_continuous:
+                    # Only the first conversion after (re)configuring has to be waited for.
+                    remaining_s = self._conversion_ready_at - time.monotonic()
+                    if remaining_s > 0:
+                        yield remaining_s
+                else:
+                    # Send the one-time measurement command before each read
+                    self.bus.write_byte(BH1750_ADDR, BH1750_MODES[self.mode][0])
+                    yield self.measurement_time_s
 
-                # Read two bytes of data
-                data = self.bus.read_i2c_block_data(BH1750_ADDR, 0, 2)
+                data = self._read_result()
                 
                 # Convert the data to lux
                 raw_value = (data[0] << 8) + data[1] # Store raw 16-bit value
-                light_value = raw_value / 1.2 # Divide by 1.2 as per datasheet for Lux for High Resolution Mode
+                light_value = self._raw_to_lux(raw_value)
                 
                 # Enhanced logging to see the raw 16-bit value and bytes
                 self.logger.debug("BH1750 - Raw Bytes: [{} {}], Raw 16-bit Value: {}, Calc Light: {:.2f}lx".format(
@@ -143,14 +242,29 @@ class BH1750:
                 return light_value
             except IOError as e:
                 self.logger.warning(f"Attempt {attempt+1}/3: Failed to read light from BH1750 (0x{BH1750_ADDR:02x}): {e}. Retrying...")
-                time.sleep(0.5) # Longer delay for I/O errors
+                yield READ_RETRY_DELAY_S
+                if self.is_continuous:
+                    # The sensor may have been power cycled; restart continuous measurement.
+                    try:
+                        self.bus.write_byte(BH1750_ADDR, BH1750_POWER_ON)
+                        self._apply_configuration()
+                    except IOError as e:
+                        self.logger.warning(f"BH1750: Failed to restart continuous measurement: {e}")
             except Exception as e:
                 self.logger.warning(f"Attempt {attempt+1}/3: Unexpected error reading light from BH1750: {e}. Retrying...", exc_info=True)
-                time.sleep(0.1)
+                yield READ_RETRY_DELAY_S
         
         self.logger.error(f"Failed to read light from BH1750 (0x{BH1750_ADDR:02x}) after 3 attempts.")
         return None
 
+    def read_light(self):
+        """
+        Reads ambient light from the BH1750 sensor in Lux.
+        Returns:
+            float: Light intensity in Lux, or None if reading fails.
+        """
+        return run_blocking(self._measure_light())
+
     def read_data(self):
         """
         Reads ambient light from the BH1750 sensor.
@@ -160,18 +274,28 @@ class BH1750:
         light = self.read_light()
         return {'light': light}
 
+    async def read_data_async(self):
+        """
+        Same as read_data(), but awaits the conversion time on the running event
+        loop instead of blocking the thread.
+        """
+        light = await run_async(self._measure_light())
+        return {'light': light}
+
     def close(self):
         """
-        Closes the I2C bus connection.
+        Releases the I2C bus; it is closed once no other sensor uses it.
         """
         if not self.mock_mode and self.bus: # Only close if not in mock mode and bus was actually opened
             try:
-                self.bus.close()
-                self.logger.info(f"BH1750 I2C bus {self.bus_number} closed.")
+                if self.is_continuous:
+                    # Stop continuous measurement.
+                    self.bus.write_byte(BH1750_ADDR, BH1750_POWER_DOWN)
             except Exception as e:
-                self.logger.error(f"Error closing BH1750 I2C bus {self.bus_number}: {e}", exc_info=True)
-            finally:
-                self.bus = None # Ensure bus is set to None after attempt to close
+                self.logger.warning(f"BH1750: Failed to power down sensor: {e}")
+            bus_manager.release(self.bus)
+            self.bus = None # Ensure bus is set to None after attempt to close
+            self.logger.info(f"BH1750 released I2C bus {self.bus_number}.")
 
     def cleanup(self):
         """
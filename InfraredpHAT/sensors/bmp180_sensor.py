@@ -2,10 +2,17 @@
 # This file contains the implementation for reading data from the BMP180 sensor.
 # Adapted from: https://github.com/AnaviTechnology/anavi-examples/blob/master/sensors/BMP180/python/BMP180.py
 
-import smbus2 
 import time
 import logging
 import random # For mock mode
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+from sensors.conversion import run_blocking, run_async
+from sensors.device_health import backoff_delay, CONNECT_RETRY_BASE_S, READ_RETRY_DELAY_S
+from sensors.i2c_bus import bus_manager
 
 logger = logging.getLogger(__name__)
 
@@ -18,46 +25,153 @@ BMP180_CONTROL = 0xF4    # W   Control register
 BMP180_TEMPDATA = 0xF6   # R   Temperature data (16 bits)
 BMP180_PRESSUREDATA = 0xF6 # R   Pressure data (16-19 bits)
 
-# Calibration values (read from EEPROM) - make these class attributes or pass them around if needed
-# For now, let's keep them as globals for simplicity as per original
-_ac1 = 0
-_ac2 = 0
-_ac3 = 0
-_ac4 = 0
-_ac5 = 0
-_ac6 = 0
-_b1 = 0
-_b2 = 0
-_mb = 0
-_mc = 0
-_md = 0
+# Calibration coefficients (read from EEPROM), kept per sensor instance.
+BMP180Calibration = namedtuple('BMP180Calibration', 'ac1 ac2 ac3 ac4 ac5 ac6 b1 b2 mb mc md')
+# The eleven coefficients are stored big-endian from 0xAA to 0xBF; AC4-AC6 are unsigned.
+_CALIBRATION_STRUCT = struct.Struct('>hhhHHHhhhhh')
+BMP180_CALIB_LENGTH = _CALIBRATION_STRUCT.size # 22 bytes
+
+# Reasonable calibration values for mock mode (the datasheet example).
+MOCK_CALIBRATION = BMP180Calibration(ac1=408, ac2=-72, ac3=-14383, ac4=32741, ac5=32757, ac6=23153,
+                                     b1=6190, b2=4, mb=-32768, mc=-8711, md=2868)
 
 # Oversampling settings
 # Mode 0: ultra low power, 1 sample, 4.5ms
 # Mode 1: standard, 2 samples, 7.5ms
 # Mode 2: high resolution, 4 samples, 13.5ms
 # Mode 3: ultra high resolution, 8 samples, 25.5ms
-OVERSAMPLING_SETTING = 3 # Ultra high resolution
+OVERSAMPLING_SETTING = 3 # Ultra high resolution, the default per instance
+# Wait after starting a pressure conversion, by oversampling setting
+PRESSURE_CONVERSION_TIME_S = (0.005, 0.008, 0.014, 0.026)
+TEMPERATURE_CONVERSION_TIME_S = 0.005 # 4.5ms
+
+# Temperature reuse: pressure compensation needs a temperature, but it changes
+# slowly, so by default it is measured only with every fifth pressure reading,
+# at least every 30 s, and on every reading while it is still changing by more
+# than TEMPERATURE_DRIFT_C between measurements.
+TEMPERATURE_EVERY = 5
+TEMPERATURE_MAX_AGE_S = 30.0
+TEMPERATURE_DRIFT_C = 0.2
 
 # I2C bus number (typically 1 for Raspberry Pi)
 I2C_BUS = 1
 
+
+def parse_calibration(data):
+    """
+    Decodes the 22 calibration bytes read from 0xAA.
+    Raises IOError if a coefficient reads as 0x0000 or 0xFFFF, which the
+    datasheet says indicates a failed read.
+    """
+    if len(data) != BMP180_CALIB_LENGTH:
+        raise IOError(f"BMP180 calibration data has {len(data)} bytes, expected {BMP180_CALIB_LENGTH}.")
+    words = struct.unpack('>11H', bytes(data))
+    if any(word in (0x0000, 0xFFFF) for word in words):
+        raise IOError("BMP180 calibration data incomplete or unreadable.")
+    return BMP180Calibration(*_CALIBRATION_STRUCT.unpack(bytes(data)))
+
+
+def _scalar_or_array(value):
+    """Returns single values as plain Python numbers and arrays unchanged."""
+    return value.item() if np.ndim(value) == 0 else value
+
+
+def compensate_temperature(ut, calibration):
+    """
+    Calculates true temperature from uncompensated temperature, using the
+    integer algorithm of the datasheet.
+    Pure function: works on a single raw value or on an array of raw values,
+    e.g. to re-process raw logs.
+    :return: (temperature in Celsius, b5); b5 is needed for pressure compensation.
+    """
+    c = calibration
+    ut = np.asarray(ut, dtype=np.int64)
+    x1 = ((ut - c.ac6) * c.ac5) >> 15
+    x2 = (c.mc << 11) // (x1 + c.md)
+    b5 = x1 + x2
+    temperature = ((b5 + 8) >> 4) / 10.0
+    return _scalar_or_array(temperature), _scalar_or_array(b5)
+
+
+def compensate_pressure(up, b5, calibration, oversampling):
+    """
+    Calculates true pressure from uncompensated pressure, using the integer
+    algorithm of the datasheet. Pure function: up and b5 may be single values
+    or arrays of the same shape.
+    :param oversampling: The oversampling setting (0-3) the pressure was measured with.
+    :return: Pressure in hPa.
+    """
+    c = calibration
+    up = np.asarray(up, dtype=np.int64)
+    b6 = np.asarray(b5, dtype=np.int64) - 4000
+
+    x1 = (c.b2 * ((b6 * b6) >> 12)) >> 11
+    x2 = (c.ac2 * b6) >> 11
+    x3 = x1 + x2
+    b3 = (((c.ac1 * 4 + x3) << oversampling) + 2) // 4
+
+    x1 = (c.ac3 * b6) >> 13
+    x2 = (c.b1 * ((b6 * b6) >> 12)) >> 16
+    x3 = ((x1 + x2) + 2) // 4
+    b4 = (c.ac4 * (x3 + 32768)) >> 15
+
+    b7 = (up - b3) * (50000 >> oversampling)
+    p = np.where(b7 < 0x80000000, (b7 * 2) // b4, (b7 // b4) * 2)
+
+    x1 = (p >> 8) * (p >> 8)
+    x1 = (x1 * 3038) >> 16
+    x2 = (-7357 * p) >> 16
+    pressure_pa = p + ((x1 + x2 + 3791) >> 4)
+    return _scalar_or_array(pressure_pa / 100.0) # Convert Pa to hPa (hectopascal)
+
+
+def pressure_to_altitude(pressure_hpa, sea_level_pressure_hpa=1013.25):
+    """
+    Calculates altitude in meters from pressure; works on single values or arrays.
+    Formula: altitude (m) = 44330 * [1 - (pressure / sea_level_pressure)^(1/5.255)]
+    """
+    return 44330 * (1 - np.power(np.divide(pressure_hpa, sea_level_pressure_hpa), 1 / 5.255))
+
+
 class BMP180:
     """
     Class to interface with the BMP180 barometric pressure and temperature sensor.
     Supports both mock mode (for development without hardware) and actual I2C communication.
+
+    The temperature conversion is reused across pressure readings (see
+    TEMPERATURE_EVERY). With pipelining enabled, the next pressure conversion
+    is started as soon as a result has been read, so the following read finds
+    it complete; each pressure value is then measured at the end of the
+    previous read rather than at the time of the read that returns it.
     """
-    def __init__(self, bus_number=I2C_BUS, mock_mode=False):
+    def __init__(self, bus_number=I2C_BUS, mock_mode=False, oversampling=OVERSAMPLING_SETTING,
+                 temperature_every=TEMPERATURE_EVERY, pipeline_pressure=False):
         """
         Initializes the BMP180 sensor and reads calibration data.
         :param bus_number (int): The I2C bus number (typically 1 for Raspberry Pi).
         :param mock_mode (bool): If True, operates in mock mode (generates random data).
                                   If False, attempts to initialize I2C bus for hardware communication.
+        :param oversampling (int): Pressure oversampling setting, 0 (ultra low power) to 3 (ultra high resolution).
+        :param temperature_every (int): Measure temperature with every Nth pressure reading; 1 measures it every time.
+        :param pipeline_pressure (bool): Start the next pressure conversion right after reading a result.
         """
         self.bus_number = bus_number
         self.mock_mode = mock_mode
         self.bus = None # Initialize bus to None
+        self.calibration = MOCK_CALIBRATION
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.oversampling = OVERSAMPLING_SETTING
+        self.temperature_every = TEMPERATURE_EVERY
+        self.pipeline_pressure = False
+        self.configure(oversampling=oversampling, temperature_every=temperature_every, pipeline_pressure=pipeline_pressure)
+        # Reused temperature state
+        self._temperature_c = None
+        self._b5 = None
+        self._temperature_measured_at = 0.0
+        self._reads_since_temperature = 0
+        self._temperature_drifting = False
+        # Pressure conversion in flight: (monotonic start time, oversampling), or None
+        self._pressure_conversion = None
         self.logger.info(f"BMP180 sensor initializing (mock_mode={self.mock_mode}).")
 
         # Mock data initialization
@@ -81,7 +195,7 @@ class BMP180:
     def connect_and_read_calibration(self, retries=3):
         """
         Attempts to connect to the I2C bus and read calibration data with retries.
-        Uses smbus2 for I2C communication.
+        The bus is shared with the other sensors (see sensors.i2c_bus).
         Raises IOError if connection fails after retries.
         """
         if self.mock_mode: # Should not be called in mock mode, but safety check
@@ -89,154 +203,61 @@ class BMP180:
 
         for i in range(retries):
             try:
-                if self.bus: # Close existing bus if any
-                    try:
-                        self.bus.close()
-                        self.logger.debug(f"BMP180: Closed existing I2C bus {self.bus_number} connection.")
-                    except Exception as close_e:
-                        self.logger.warning(f"BMP180: Error closing existing I2C bus {self.bus_number}: {close_e}")
-
-                self.bus = smbus2.SMBus(self.bus_number)
+                if self.bus is None:
+                    self.bus = bus_manager.acquire(self.bus_number)
                 self._read_calibration_data() # This will raise IOError if calibration fails
                 self.logger.info(f"BMP180 sensor initialized on I2C bus {self.bus_number} (Attempt {i+1}/{retries}).")
                 return True
             except FileNotFoundError:
                 self.logger.error(f"Attempt {i+1}/{retries}: Could not open I2C bus {self.bus_number}. Ensure I2C is enabled and 'smbus2' library is installed and permissions are correct.")
-                time.sleep(1) # Wait before retrying
             except IOError as e: # Catch IOError specifically for bus/calibration issues
-                self.logger.warning(f"Attempt {i+1}/{retries}: I/O Error during BMP180 connection or calibration: {e}. Retrying...")
-                time.sleep(1)
+                self.logger.warning(f"Attempt {i+1}/{retries}: I/O Error during BMP180 connection or calibration: {e}.")
             except Exception as e:
-                self.logger.warning(f"Attempt {i+1}/{retries}: Unexpected error during BMP180 connection or calibration: {e}. Retrying...", exc_info=True)
-                time.sleep(1)
+                self.logger.warning(f"Attempt {i+1}/{retries}: Unexpected error during BMP180 connection or calibration: {e}.", exc_info=True)
+            if i + 1 < retries:
+                time.sleep(backoff_delay(i + 1, CONNECT_RETRY_BASE_S)) # 50 ms, 100 ms, ...
         
         self.logger.error(f"Failed to initialize BMP180 sensor after {retries} attempts.")
         if self.bus:
-            try:
-                self.bus.close()
-            except Exception as e:
-                self.logger.error(f"Error closing BMP180 I2C bus {self.bus_number} during failed init cleanup: {e}", exc_info=True)
-            finally:
-                self.bus = None # Ensure bus is None on failure
+            bus_manager.release(self.bus)
+            self.bus = None # Ensure bus is None on failure
         raise IOError("BMP180 sensor initialization failed. Check connections and I2C setup.")
 
-    def _read_word_2c(self, register):
-        """Reads a signed 16-bit word from a register."""
-        if self.mock_mode:
-            self.logger.debug(f"Mock BMP180: Simulated read word 2c from 0x{register:02x}")
-            return random.randint(-32768, 32767) # Return a random 16-bit signed integer for mock
-
-        if self.bus is None:
-            self.logger.error(f"BMP180 - No I2C bus connected. Cannot read word from 0x{register:02x}.")
-            return None
-        try:
-            # Use i2c_rdwr for combining write (register address) and read operations
-            read_bytes = smbus2.i2c_msg.read(BMP180_ADDR, 2)
-            write_reg = smbus2.i2c_msg.write(BMP180_ADDR, [register])
-            self.bus.i2c_rdwr(write_reg, read_bytes)
-            
-            data = list(read_bytes) # Convert to list of integers
-            msb = data[0]
-            lsb = data[1]
-            
-            value = (msb << 8) + lsb
-            if value >= 0x8000:
-                return -((65535 - value) + 1)
-            else:
-                return value
-        except IOError as e:
-            self.logger.error(f"BMP180: I/O Error reading 2-byte signed word from register 0x{register:02x}: {e}")
-            return None
-        except Exception as e:
-            self.logger.error(f"BMP180: Error reading 2-byte signed word from register 0x{register:02x}: {e}", exc_info=True)
-            return None
-
-    def _read_unsigned_word(self, register):
-        """Reads an unsigned 16-bit word from a register."""
+    def reinitialize(self):
+        """
+        Reconnects a sensor that stopped responding, e.g. after it was unplugged
+        and plugged back in. Makes a single attempt without waiting; the caller
+        decides when to try again.
+        :return: True if the sensor responds again.
+        """
         if self.mock_mode:
-            self.logger.debug(f"Mock BMP180: Simulated read unsigned word from 0x{register:02x}")
-            return random.randint(0, 65535) # Return a random 16-bit unsigned integer for mock
-
-        if self.bus is None:
-            self.logger.error(f"BMP180 - No I2C bus connected. Cannot read unsigned word from 0x{register:02x}.")
-            return None
+            return True
+        # Nothing measured before the outage can be trusted to still be in the sensor.
+        self._pressure_conversion = None
+        self._b5 = None
+        self._temperature_c = None
         try:
-            read_bytes = smbus2.i2c_msg.read(BMP180_ADDR, 2)
-            write_reg = smbus2.i2c_msg.write(BMP180_ADDR, [register])
-            self.bus.i2c_rdwr(write_reg, read_bytes)
-            
-            data = list(read_bytes)
-            msb = data[0]
-            lsb = data[1]
-            return (msb << 8) + lsb
-        except IOError as e:
-            self.logger.error(f"BMP180: I/O Error reading 2-byte unsigned word from register 0x{register:02x}: {e}")
-            return None
-        except Exception as e:
-            self.logger.error(f"BMP180: Error reading 2-byte unsigned word from register 0x{register:02x}: {e}", exc_info=True)
-            return None
+            return self.connect_and_read_calibration(retries=1)
+        except IOError:
+            return False
 
     def _read_calibration_data(self):
-        """Reads the 11 calibration values from the BMP180's EEPROM."""
-        # Use local variables for calibration values to avoid global state issues if possible
-        # Or ensure they are class attributes if truly shared by instance methods only
-        # For now, keeping as globals as per original, but be aware of implications.
-        global _ac1, _ac2, _ac3, _ac4, _ac5, _ac6, _b1, _b2, _mb, _mc, _md
-
+        """Reads the 11 calibration values from the BMP180's EEPROM in one 22-byte burst."""
         if self.mock_mode: # In mock mode, use some reasonable default calibration values
             self.logger.debug("Mock BMP180: Simulating reading calibration data.")
-            _ac1 = 408
-            _ac2 = -72
-            _ac3 = -14383
-            _ac4 = 32741
-            _ac5 = 32757
-            _ac6 = 23153
-            _b1 = 6190
-            _b2 = 4
-            _mb = -32768
-            _mc = -8711
-            _md = 2868
+            self.calibration = MOCK_CALIBRATION
             return
 
-        # Using _read_word_2c and _read_unsigned_word which now include error handling and return None on failure
-        _ac1 = self._read_word_2c(0xAA)
-        _ac2 = self._read_word_2c(0xAC)
-        _ac3 = self._read_word_2c(0xAE)
-        _ac4 = self._read_unsigned_word(0xB0)
-        _ac5 = self._read_unsigned_word(0xB2)
-        _ac6 = self._read_unsigned_word(0xB4)
-        _b1 = self._read_word_2c(0xB6)
-        _b2 = self._read_word_2c(0xB8)
-        _mb = self._read_word_2c(0xBA)
-        _mc = self._read_word_2c(0xBC)
-        _md = self._read_word_2c(0xBE)
-
-        # Check if any crucial calibration value is None, if so, raise an error
-        # This will be caught by connect_and_read_calibration retries
-        if any(v is None for v in [_ac1, _ac2, _ac3, _ac4, _ac5, _ac6, _b1, _b2, _mb, _mc, _md]):
-            self.logger.error("Failed to read all BMP180 calibration values. Some are None.")
-            raise IOError("BMP180 calibration data incomplete or unreadable.")
-        
-        # Ensure all calibration values are integers as expected by calculations
-        _ac1 = int(_ac1)
-        _ac2 = int(_ac2)
-        _ac3 = int(_ac3)
-        _ac4 = int(_ac4)
-        _ac5 = int(_ac5)
-        _ac6 = int(_ac6)
-        _b1 = int(_b1)
-        _b2 = int(_b2)
-        _mb = int(_mb)
-        _mc = int(_mc)
-        _md = int(_md)
-
-        self.logger.debug("BMP180 Calibration Data Read: AC1={}, AC2={}, AC3={}, AC4={}, AC5={}, AC6={}, B1={}, B2={}, MB={}, MC={}, MD={}".format(
-            _ac1, _ac2, _ac3, _ac4, _ac5, _ac6, _b1, _b2, _mb, _mc, _md
-        ))
+        data = self.bus.read_register_block(BMP180_ADDR, BMP180_CALIB_AC1, BMP180_CALIB_LENGTH)
+        # Raises IOError on unreadable data; caught by connect_and_read_calibration retries.
+        self.calibration = parse_calibration(data)
+        self.logger.debug(f"BMP180 Calibration Data Read: {self.calibration}")
 
-
-    def _read_raw_temperature(self):
-        """Reads the uncompensated temperature value."""
+    def _measure_raw_temperature(self):
+        """
+        Measurement steps for the uncompensated temperature value (see
+        sensors.conversion): yields the conversion and retry waits, returns the value.
+        """
         if self.mock_mode:
             # Simulate a slowly changing temperature
             self._mock_temperature += random.uniform(-0.1, 0.1)
@@ -253,14 +274,10 @@ class BMP180:
             try:
                 # Write command to start temperature measurement
                 self.bus.write_byte_data(BMP180_ADDR, BMP180_CONTROL, 0x2E) 
-                time.sleep(0.005) # Wait for 4.5ms
+                yield TEMPERATURE_CONVERSION_TIME_S
 
                 # Read 2 bytes (temperature data)
-                read_msg = smbus2.i2c_msg.read(BMP180_ADDR, 2)
-                write_msg = smbus2.i2c_msg.write(BMP180_ADDR, [BMP180_TEMPDATA])
-                self.bus.i2c_rdwr(write_msg, read_msg)
-                
-                data = list(read_msg)
+                data = self.bus.read_register_block(BMP180_ADDR, BMP180_TEMPDATA, 2)
                 msb = data[0]
                 lsb = data[1]
                 ut = (msb << 8) + lsb
@@ -268,112 +285,121 @@ class BMP180:
                 return ut
             except IOError as e:
                 self.logger.warning(f"Attempt {attempt+1}/3: I/O Error reading raw temperature from BMP180: {e}. Retrying...")
-                time.sleep(0.5)
+                yield READ_RETRY_DELAY_S
             except Exception as e:
                 self.logger.warning(f"Attempt {attempt+1}/3: Unexpected error reading raw temperature from BMP180: {e}. Retrying...", exc_info=True)
-                time.sleep(0.1)
+                yield READ_RETRY_DELAY_S
         self.logger.error("Failed to read raw temperature from BMP180 after 3 attempts.")
         return None
 
-    def _read_raw_pressure(self):
-        """Reads the uncompensated pressure value."""
+    def _start_pressure_conversion(self):
+        # Send command for pressure measurement with oversampling setting
+        self.bus.write_byte_data(BMP180_ADDR, BMP180_CONTROL, 0x34 + (self.oversampling << 6))
+        self._pressure_conversion = (time.monotonic(), self.oversampling)
+
+    def _measure_raw_pressure(self):
+        """
+        Measurement steps for the uncompensated pressure value (see
+        sensors.conversion): yields the conversion and retry waits, returns
+        (value, oversampling setting it was measured with). A conversion that is
+        already in flight is waited for and read instead of starting a new one.
+        """
         if self.mock_mode:
             # Simulate a slowly changing pressure with some noise
             self._mock_pressure += random.uniform(-0.5, 0.5)
             self._mock_pressure = max(950.0, min(1050.0, self._mock_pressure)) # Clamp around reasonable values
             # Convert to a raw-like value for consistency with calculation function
             # This mapping is approximate
-            return int(self._mock_pressure * 100 * (1 << (8 - OVERSAMPLING_SETTING))) # Reverse pressure calculation for mock raw value
+            return int(self._mock_pressure * 100 * (1 << (8 - self.oversampling))), self.oversampling # Reverse pressure calculation for mock raw value
 
         if self.bus is None:
             self.logger.error("BMP180 - No I2C bus connected. Cannot read raw pressure.")
-            return None
+            return None, self.oversampling
 
         for attempt in range(3):
             try:
-                # Send command for pressure measurement with oversampling setting
-                self.bus.write_byte_data(BMP180_ADDR, BMP180_CONTROL, 0x34 + (OVERSAMPLING_SETTING << 6))
+                if self._pressure_conversion is None:
+                    self._start_pressure_conversion()
+                started_at, oversampling = self._pressure_conversion
                 
                 # Wait for measurement to complete based on oversampling setting
-                delay = [0.005, 0.008, 0.014, 0.026][OVERSAMPLING_SETTING]
-                time.sleep(delay)
+                remaining_s = started_at + PRESSURE_CONVERSION_TIME_S[oversampling] - time.monotonic()
+                if remaining_s > 0:
+                    yield remaining_s
+                self._pressure_conversion = None
 
                 # Read 3 bytes (MSB, LSB, XLSB) for pressure data
-                read_msg = smbus2.i2c_msg.read(BMP180_ADDR, 3)
-                write_msg = smbus2.i2c_msg.write(BMP180_ADDR, [BMP180_PRESSUREDATA])
-                self.bus.i2c_rdwr(write_msg, read_msg)
-
-                data = list(read_msg)
+                data = self.bus.read_register_block(BMP180_ADDR, BMP180_PRESSUREDATA, 3)
                 msb = data[0]
                 lsb = data[1]
                 xlsb = data[2]
                 
-                raw_pressure = ((msb << 16) + (lsb << 8) + xlsb) >> (8 - OVERSAMPLING_SETTING)
-                self.logger.debug(f"BMP180 - Raw Pressure: {raw_pressure}")
-                return raw_pressure
+                raw_pressure = ((msb << 16) + (lsb << 8) + xlsb) >> (8 - oversampling)
+                self.logger.debug(f"BMP180 - Raw Pressure: {raw_pressure} (OSS {oversampling})")
+                return raw_pressure, oversampling
             except IOError as e:
+                self._pressure_conversion = None
                 self.logger.warning(f"Attempt {attempt+1}/3: I/O Error reading raw pressure from BMP180: {e}. Retrying...")
-                time.sleep(0.5)
+                yield READ_RETRY_DELAY_S
             except Exception as e:
+                self._pressure_conversion = None
                 self.logger.warning(f"Attempt {attempt+1}/3: Unexpected error reading raw pressure from BMP180: {e}. Retrying...", exc_info=True)
-                time.sleep(0.1)
+                yield READ_RETRY_DELAY_S
         self.logger.error("Failed to read raw pressure from BMP180 after 3 attempts.")
-        return None
+        return None, self.oversampling
+
+    def _temperature_due(self):
+        """True if the next reading has to measure temperature instead of reusing the last one."""
+        return (self._b5 is None
+                or self._temperature_drifting
+                or self._reads_since_temperature >= self.temperature_every
+                or time.monotonic() - self._temperature_measured_at >= TEMPERATURE_MAX_AGE_S)
+
+    def _measure_temperature(self):
+        """Measurement steps that refresh the reused temperature and b5 (see sensors.conversion)."""
+        ut = yield from self._measure_raw_temperature()
+        temp_c, b5 = self._calculate_temperature(ut) # Get b5 from temperature calculation
+        if temp_c is None:
+            # Keep compensating with the previous b5, but try again next time.
+            self._temperature_c = None
+            self._temperature_drifting = True
+            return
+        self._temperature_drifting = (self._temperature_c is not None
+                                      and abs(temp_c - self._temperature_c) > TEMPERATURE_DRIFT_C)
+        self._temperature_c, self._b5 = temp_c, b5
+        self._temperature_measured_at = time.monotonic()
+        self._reads_since_temperature = 0
+
+    def configure(self, oversampling=None, temperature_every=None, pipeline_pressure=None):
+        """
+        Changes the acquisition policy. A pressure conversion already in flight
+        is still read with the oversampling it was started with.
+        """
+        if oversampling is not None:
+            oversampling = int(oversampling)
+            if oversampling not in range(len(PRESSURE_CONVERSION_TIME_S)):
+                self.logger.warning(f"BMP180: Invalid oversampling setting {oversampling}. Using {OVERSAMPLING_SETTING}.")
+                oversampling = OVERSAMPLING_SETTING
+            self.oversampling = oversampling
+        if temperature_every is not None:
+            self.temperature_every = max(int(temperature_every), 1)
+        if pipeline_pressure is not None:
+            self.pipeline_pressure = bool(pipeline_pressure)
+        self.logger.info(f"BMP180: Oversampling {self.oversampling}, temperature every {self.temperature_every} "
+                         f"read(s), pressure pipelining {'on' if self.pipeline_pressure else 'off'}.")
 
     def _calculate_temperature(self, ut):
         """Calculates true temperature from uncompensated temperature."""
         if ut is None:
             return None, None # Return None for temp and b5
-        
-        # All intermediate calculations for temperature compensation should be integer-based
-        x1 = ((ut - _ac6) * _ac5) >> 15
-        x2 = (int(_mc) << 11) // (x1 + int(_md)) # Explicit int cast for _mc and _md, use //
-        b5 = int(x1 + x2) # Explicitly ensure b5 is an integer
-        
-        # The final temperature is a float
-        temperature = ((b5 + 8) >> 4) / 10.0 
-        return temperature, b5 # Return b5 as it's needed for pressure calculation
+        return compensate_temperature(ut, self.calibration) # b5 is needed for pressure calculation
 
-    def _calculate_pressure(self, up, b5):
+    def _calculate_pressure(self, up, b5, oversampling=None):
         """Calculates true pressure from uncompensated pressure."""
         if up is None or b5 is None:
             return None
-
-        # All intermediate calculations should be integer-based
-        b5_int = int(b5) 
-
-        # Step 1: calculate B6
-        b6 = b5_int - 4000
-
-        # Step 2: calculate X1, X2, X3, B3
-        x1 = (_b2 * ((b6 * b6) >> 12)) >> 11
-        x2 = (_ac2 * b6) >> 11
-        x3 = x1 + x2
-        # b3 is typically int for bitwise shifts. Adjusted based on typical implementations for integer math.
-        b3 = ((_ac1 * 4 + x3) << OVERSAMPLING_SETTING + 2) // 4 
-
-        # Step 3: calculate X1, X2, X3, B4
-        x1 = (_ac3 * b6) >> 13
-        x2 = (_b1 * ((b6 * b6) >> 12)) >> 16
-        x3 = ((x1 + x2) + 2) // 2 
-        b4 = (_ac4 * (x3 + 32768)) >> 15
-
-        # Step 4: calculate B7
-        b7 = (int(up) - b3) * (50000 >> OVERSAMPLING_SETTING)
-
-        # Step 5: calculate p
-        if b7 < 0x80000000:
-            p = (b7 * 2) // b4
-        else:
-            p = (b7 // b4) * 2
-
-        # Step 6: calculate X1, X2 and final pressure compensation
-        x1 = (int(p) >> 8) * (int(p) >> 8) 
-        x1 = (x1 * 3038) >> 16
-        x2 = (-7357 * int(p)) >> 16
-        pressure_pa = int(p) + ((x1 + x2 + 3791) >> 4) 
-
-        return float(pressure_pa / 100.0) # Convert Pa to hPa (hectopascal) and return as float
+        oversampling = self.oversampling if oversampling is None else oversampling
+        return float(compensate_pressure(up, b5, self.calibration, oversampling))
 
     def calculate_altitude(self, pressure_hpa, sea_level_pressure_hpa=1013.25):
         """
@@ -386,19 +412,18 @@ class BMP180:
         if pressure_hpa is None:
             return None
         try:
-            altitude = 44330 * (1 - pow(pressure_hpa / sea_level_pressure_hpa, 1/5.255))
+            altitude = float(pressure_to_altitude(pressure_hpa, sea_level_pressure_hpa))
             return altitude
         except Exception as e:
             self.logger.error(f"Error calculating altitude: {e}")
             return None
 
 
-    def read_data(self):
+    def _measure(self):
         """
-        Reads both temperature and pressure from the BMP180 sensor.
-        Returns:
-            dict: A dictionary containing 'temperature', 'pressure', and 'altitude'.
-                  Returns None for a value if reading failed.
+        Measurement steps for a full reading (see sensors.conversion): yields the
+        conversion waits of the pressure conversion and, when it is due, the
+        temperature conversion, returns the reading dictionary.
         """
         if self.mock_mode:
             # Simulate a slowly changing temperature, pressure, and altitude
@@ -419,11 +444,25 @@ class BMP180:
             return {'temperature': self._mock_temperature, 'pressure': self._mock_pressure, 'altitude': self._mock_altitude}
 
         # Hardware mode
-        ut = self._read_raw_temperature()
-        temp_c, b5 = self._calculate_temperature(ut) # Get b5 from temperature calculation
-
-        up = self._read_raw_pressure()
-        pressure_hpa = self._calculate_pressure(up, b5) 
+        if self._pressure_conversion is None:
+            if self._temperature_due():
+                yield from self._measure_temperature()
+            up, oversampling = yield from self._measure_raw_pressure()
+        else:
+            # A pipelined conversion is in flight; it has to be read before the
+            # sensor can convert temperature.
+            up, oversampling = yield from self._measure_raw_pressure()
+            if self._temperature_due():
+                yield from self._measure_temperature()
+        self._reads_since_temperature += 1
+        temp_c = self._temperature_c
+        pressure_hpa = self._calculate_pressure(up, self._b5, oversampling)
+
+        if self.pipeline_pressure and self.bus is not None:
+            try:
+                self._start_pressure_conversion()
+            except IOError as e:
+                self.logger.warning(f"BMP180: Failed to start pipelined pressure conversion: {e}")
 
         altitude_m = self.calculate_altitude(pressure_hpa)
 
@@ -434,18 +473,30 @@ class BMP180:
         ))
         return {'temperature': temp_c, 'pressure': pressure_hpa, 'altitude': altitude_m}
 
+    def read_data(self):
+        """
+        Reads both temperature and pressure from the BMP180 sensor.
+        Returns:
+            dict: A dictionary containing 'temperature', 'pressure', and 'altitude'.
+                  Returns None for a value if reading failed.
+        """
+        return run_blocking(self._measure())
+
+    async def read_data_async(self):
+        """
+        Same as read_data(), but awaits the conversion times on the running event
+        loop instead of blocking the thread.
+        """
+        return await run_async(self._measure())
+
     def close(self):
         """
-        Closes the I2C bus connection.
+        Releases the I2C bus; it is closed once no other sensor uses it.
         """
         if not self.mock_mode and self.bus: # Only close if not in mock mode and bus was actually opened
-            try:
-                self.bus.close()
-                self.logger.info(f"BMP180 I2C bus {self.bus_number} closed.")
-            except Exception as e:
-                self.logger.error(f"Error closing BMP180 I2C bus {self.bus_number}: {e}", exc_info=True)
-            finally:
-                self.bus = None # Ensure bus is set to None after attempt to close
+            bus_manager.release(self.bus)
+            self.bus = None # Ensure bus is set to None after attempt to close
+            self.logger.info(f"BMP180 released I2C bus {self.bus_number}.")
 
     def cleanup(self):
         """
@@ -0,0 +1,36 @@
+# sensors/conversion.py
+# -*- coding: utf-8 -*-
+"""
+Helpers for running sensor measurements written as step generators.
+
+A driver describes a measurement as a generator that performs the I2C
+transfers and yields the number of seconds to wait whenever the device needs
+time to convert (or to recover before a retry). Its return value is the
+result. The same generator can then be run blocking, from a plain thread, or
+awaited on an asyncio event loop, where the conversion waits become
+asyncio.sleep() calls and other devices are served in the meantime.
+"""
+import asyncio
+import time
+
+
+def run_blocking(steps):
+    """Runs a measurement generator, sleeping the thread for every wait it yields."""
+    try:
+        delay_s = next(steps)
+        while True:
+            time.sleep(delay_s)
+            delay_s = steps.send(None)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def run_async(steps):
+    """Runs a measurement generator on the running event loop, awaiting every wait it yields."""
+    try:
+        delay_s = next(steps)
+        while True:
+            await asyncio.sleep(delay_s)
+            delay_s = steps.send(None)
+    except StopIteration as stop:
+        return stop.value
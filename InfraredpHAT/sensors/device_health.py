@@ -0,0 +1,80 @@
+# sensors/device_health.py
+# -*- coding: utf-8 -*-
+"""
+Per-device health tracking with exponential backoff and a circuit breaker.
+
+A device that fails is not read again until its backoff has passed; the wait
+doubles with every consecutive failure. After FAILURE_THRESHOLD consecutive
+failures the circuit opens: the device is no longer read at all, but probed
+(re-initialised) whenever the backoff has passed, and reads resume once a
+probe succeeds.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+FAILURE_THRESHOLD = 3
+BACKOFF_BASE_S = 1.0
+BACKOFF_MAX_S = 60.0
+
+# Drivers only retry quickly within a read and while connecting; longer
+# outages are handled by the backoff above, without blocking the caller.
+READ_RETRY_DELAY_S = 0.01
+CONNECT_RETRY_BASE_S = 0.05
+
+
+def backoff_delay(failures, base_s=BACKOFF_BASE_S, max_s=BACKOFF_MAX_S):
+    """Wait after the given number of consecutive failures: base_s, 2 * base_s, 4 * base_s, ... up to max_s."""
+    if failures <= 0:
+        return 0.0
+    return min(base_s * (2 ** (failures - 1)), max_s)
+
+
+class DeviceHealth:
+    """
+    Health state machine of one device. Times are monotonic seconds supplied
+    by the caller, so the same clock as the caller's scheduler is used.
+    """
+    HEALTHY = 'healthy'
+    FAILING = 'failing'
+    OPEN = 'open'
+
+    def __init__(self, name, failure_threshold=FAILURE_THRESHOLD, base_backoff_s=BACKOFF_BASE_S,
+                 max_backoff_s=BACKOFF_MAX_S):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff_s = base_backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.state = self.HEALTHY
+        self.consecutive_failures = 0
+        self.next_attempt_at = 0.0
+
+    @property
+    def is_open(self):
+        return self.state == self.OPEN
+
+    def can_attempt(self, now):
+        """True once the backoff after the last failure has passed."""
+        return now >= self.next_attempt_at
+
+    def record_success(self, now):
+        if self.state != self.HEALTHY:
+            logger.info(f"DeviceHealth: {self.name} recovered after {self.consecutive_failures} failure(s).")
+        self.state = self.HEALTHY
+        self.consecutive_failures = 0
+        self.next_attempt_at = now
+
+    def record_failure(self, now):
+        self.consecutive_failures += 1
+        delay_s = backoff_delay(self.consecutive_failures, self.base_backoff_s, self.max_backoff_s)
+        self.next_attempt_at = now + delay_s
+        if self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"DeviceHealth: {self.name} failed {self.consecutive_failures} times in a row. "
+                               f"Stopped polling it; probing again in {delay_s:g} s.")
+            else:
+                logger.debug(f"DeviceHealth: Probe of {self.name} failed; next probe in {delay_s:g} s.")
+            self.state = self.OPEN
+        else:
+            self.state = self.FAILING
+            logger.debug(f"DeviceHealth: {self.name} failed ({self.consecutive_failures}); backing off {delay_s:g} s.")
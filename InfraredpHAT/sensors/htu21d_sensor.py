@@ -5,12 +5,8 @@ import struct
 import logging
 import random
 
-try:
-    import smbus2
-    _SENSORS_AVAILABLE = True
-except ImportError:
-    _SENSORS_AVAILABLE = False
-    logging.warning("HTU21D: smbus2 library not found. Hardware sensor will not be available.")
+from sensors.conversion import run_blocking, run_async
+from sensors.i2c_bus import bus_manager, SMBUS_AVAILABLE
 
 
 logger = logging.getLogger(__name__)
@@ -20,39 +16,96 @@ HTU21D_ADDR = 0x40
 # FIX: Use the "hold master" commands for more reliable readings
 CMD_READ_TEMP_HOLD = 0xE3
 CMD_READ_HUM_HOLD = 0xE5
+# "No hold master" commands: the sensor NACKs reads until the conversion is done,
+# instead of stretching the clock and blocking the bus.
+CMD_READ_TEMP_NOHOLD = 0xF3
+CMD_READ_HUM_NOHOLD = 0xF5
+CMD_WRITE_USER_REG = 0xE6
+CMD_READ_USER_REG = 0xE7
 CMD_RESET = 0xFE
 
 # User Register bits
 USER_REGISTER_RESOLUTION_RH12_TEMP14 = 0x00
+USER_REGISTER_RESOLUTION_MASK = 0x81 # Resolution is set by bits 7 and 0
+
+# Resolutions by settings name: (user register bits, maximum temperature and
+# humidity conversion times in seconds, from the datasheet).
+RESOLUTIONS = {
+    'RH12_T14': (USER_REGISTER_RESOLUTION_RH12_TEMP14, 0.050, 0.016),
+    'RH8_T12': (0x01, 0.013, 0.003),
+    'RH10_T13': (0x80, 0.025, 0.005),
+    'RH11_T11': (0x81, 0.007, 0.008),
+}
+DEFAULT_RESOLUTION = 'RH12_T14'
+
+# Interval between polls once the maximum conversion time has passed.
+RESULT_POLL_INTERVAL_S = 0.002
+RESULT_POLL_ATTEMPTS = 10
+# Measurement attempts before giving up, e.g. after repeated CRC errors.
+MEASUREMENT_ATTEMPTS = 3
 
 # I2C bus number (typically 1 for Raspberry Pi)
 I2C_BUS = 1 
 
+
+def crc8(data):
+    """
+    CRC-8 of the HTU21D: polynomial x^8 + x^5 + x^4 + 1 (0x131), initial value 0.
+    :param data: Iterable of byte values.
+    """
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x131) if crc & 0x80 else (crc << 1)
+    return crc & 0xFF
+
+
+def check_frame(data):
+    """
+    Validates a 3-byte measurement frame (MSB, LSB, CRC).
+    :return: The raw 16-bit value with the status bits cleared, or None if the CRC does not match.
+    """
+    if crc8(data[:2]) != data[2]:
+        return None
+    return ((data[0] << 8) | data[1]) & 0xFFFC
+
+
 class HTU21D:
     """
     Driver for the HTU21D digital humidity and temperature sensor.
+
+    Measurements use the "no hold master" commands: a conversion is started,
+    the bus is free while the sensor converts, and the result is then read
+    (polled while the sensor still NACKs). Every frame's CRC-8 is checked and
+    corrupted frames are measured again rather than reported.
     """
 
-    def __init__(self, mock_mode=False):
+    def __init__(self, mock_mode=False, resolution=DEFAULT_RESOLUTION):
         """
         Initializes the HTU21D sensor.
+        :param resolution: Measurement resolution, one of RESOLUTIONS.
         """
         self.mock_mode = mock_mode
         self.bus = None
         self.address = HTU21D_ADDR
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.logger.info(f"HTU21D sensor initializing (mock_mode={self.mock_mode}).")
+        self.resolution = self._validate_resolution(resolution)
+        self.crc_errors = 0
+        self.logger.info(f"HTU21D sensor initializing (mock_mode={self.mock_mode}, resolution={self.resolution}).")
 
-        if not self.mock_mode and _SENSORS_AVAILABLE:
+        if not self.mock_mode and SMBUS_AVAILABLE:
             try:
-                self.bus = smbus2.SMBus(I2C_BUS)
+                self.bus = bus_manager.acquire(I2C_BUS)
                 self.soft_reset()
+                self._write_resolution()
                 self.logger.info(f"HTU21D hardware sensor initialized on I2C bus {I2C_BUS}.")
             except Exception as e:
                 self.logger.error(f"Failed to initialize HTU21D hardware sensor: {e}. Falling back to mock mode.", exc_info=True)
+                self.close()
                 self.mock_mode = True
         else:
-            if not _SENSORS_AVAILABLE:
+            if not SMBUS_AVAILABLE:
                 self.logger.warning("smbus2 not found, forcing HTU21D into mock mode.")
             self.mock_mode = True
 
@@ -61,6 +114,52 @@ class HTU21D:
             self._mock_temperature = 22.5
             self._mock_humidity = 55.0
 
+    def reinitialize(self):
+        """
+        Resets and reconfigures a sensor that stopped responding, e.g. after it
+        was unplugged and plugged back in. Makes a single attempt; the caller
+        decides when to try again.
+        :return: True if the sensor responds again.
+        """
+        if self.mock_mode:
+            return True
+        try:
+            if self.bus is None:
+                self.bus = bus_manager.acquire(I2C_BUS)
+            self.soft_reset()
+            self._write_resolution()
+            self.logger.info("HTU21D sensor re-initialized.")
+            return True
+        except OSError as e:
+            self.logger.debug(f"HTU21D: Re-initialization failed: {e}")
+            return False
+
+    def _validate_resolution(self, resolution):
+        if resolution not in RESOLUTIONS:
+            self.logger.warning(f"HTU21D: Unknown resolution '{resolution}'. Using '{DEFAULT_RESOLUTION}'.")
+            return DEFAULT_RESOLUTION
+        return resolution
+
+    def _write_resolution(self):
+        """Sets the resolution bits of the user register, keeping the reserved bits."""
+        user_register = self.bus.read_byte_data(self.address, CMD_READ_USER_REG)
+        user_register = (user_register & ~USER_REGISTER_RESOLUTION_MASK & 0xFF) | RESOLUTIONS[self.resolution][0]
+        self.bus.write_byte_data(self.address, CMD_WRITE_USER_REG, user_register)
+        self.logger.debug(f"HTU21D user register set to 0x{user_register:02x}.")
+
+    def configure(self, resolution=None):
+        """Changes the measurement resolution. Must not be called while a read is in progress."""
+        if resolution is None:
+            return
+        self.resolution = self._validate_resolution(resolution)
+        self.logger.info(f"HTU21D: Resolution set to '{self.resolution}'.")
+        if self.mock_mode or self.bus is None:
+            return
+        try:
+            self._write_resolution()
+        except Exception as e:
+            self.logger.error(f"HTU21D: Failed to set resolution: {e}")
+
     def soft_reset(self):
         """Performs a soft reset on the sensor."""
         if self.mock_mode or self.bus is None:
@@ -74,61 +173,101 @@ class HTU21D:
             self.logger.error(f"Failed to soft reset HTU21D: {e}")
             raise
 
-    def read_temperature(self):
-        """Reads temperature in Celsius."""
+    def _measure_raw(self, command, conversion_time_s):
+        """
+        Measurement steps for one raw value (see sensors.conversion): starts a
+        no-hold conversion, yields while the sensor converts, then polls for the
+        result. Frames failing the CRC check are measured again.
+        :return: The raw 16-bit value with the status bits cleared, or None.
+        """
+        for attempt in range(MEASUREMENT_ATTEMPTS):
+            self.bus.write_byte(self.address, command)
+            yield conversion_time_s
+            data = None
+            for _ in range(RESULT_POLL_ATTEMPTS):
+                try:
+                    data = self.bus.read_bytes(self.address, 3, nack_expected=True)
+                    break
+                except OSError:
+                    # NACK: the conversion is not finished yet.
+                    yield RESULT_POLL_INTERVAL_S
+            if data is None:
+                raise IOError(f"no result after {RESULT_POLL_ATTEMPTS} polls")
+
+            raw_value = check_frame(data)
+            if raw_value is not None:
+                return raw_value
+            self.crc_errors += 1
+            self.logger.warning(f"HTU21D: CRC mismatch in frame {data} (attempt {attempt+1}/{MEASUREMENT_ATTEMPTS}). Measuring again.")
+        return None
+
+    def _measure_temperature(self):
+        """Measurement steps for the temperature in Celsius (see sensors.conversion)."""
         if self.mock_mode:
             self._mock_temperature += random.uniform(-0.5, 0.5)
             return max(15.0, min(35.0, self._mock_temperature))
 
         if self.bus is None: return None
         try:
-            # FIX: Use read_i2c_block_data with the hold command
-            data = self.bus.read_i2c_block_data(self.address, CMD_READ_TEMP_HOLD, 3)
-            raw_temp = (data[0] << 8) | data[1]
-            # CRC check can be added here if needed
+            raw_temp = yield from self._measure_raw(CMD_READ_TEMP_NOHOLD, RESOLUTIONS[self.resolution][1])
+            if raw_temp is None:
+                return None
             temperature = -46.85 + 175.72 * raw_temp / 65536.0
             return temperature
         except Exception as e:
             self.logger.error(f"Failed to read HTU21D temperature: {e}")
             return None
 
-    def read_humidity(self):
-        """Reads relative humidity."""
+    def _measure_humidity(self):
+        """Measurement steps for the relative humidity (see sensors.conversion)."""
         if self.mock_mode:
             self._mock_humidity += random.uniform(-1.0, 1.0)
             return max(30.0, min(80.0, self._mock_humidity))
 
         if self.bus is None: return None
         try:
-            # FIX: Use read_i2c_block_data with the hold command
-            data = self.bus.read_i2c_block_data(self.address, CMD_READ_HUM_HOLD, 3)
-            raw_humid = (data[0] << 8) | data[1]
-            # CRC check can be added here if needed
+            raw_humid = yield from self._measure_raw(CMD_READ_HUM_NOHOLD, RESOLUTIONS[self.resolution][2])
+            if raw_humid is None:
+                return None
             humidity = -6.0 + 125.0 * raw_humid / 65536.0
             return humidity
         except Exception as e:
             self.logger.error(f"Failed to read HTU21D humidity: {e}")
             return None
 
+    def _measure(self):
+        temp = yield from self._measure_temperature()
+        humid = yield from self._measure_humidity()
+        return {'temperature': temp, 'humidity': humid}
+
+    def read_temperature(self):
+        """Reads temperature in Celsius."""
+        return run_blocking(self._measure_temperature())
+
+    def read_humidity(self):
+        """Reads relative humidity."""
+        return run_blocking(self._measure_humidity())
+
     def read_data(self):
         """
         Reads both temperature and humidity from the sensor.
         Returns a dictionary {'temperature': value, 'humidity': value}.
         """
-        temp = self.read_temperature()
-        humid = self.read_humidity()
-        return {'temperature': temp, 'humidity': humid}
+        return run_blocking(self._measure())
+
+    async def read_data_async(self):
+        """
+        Same as read_data(), but awaits the conversion times on the running event
+        loop instead of blocking the thread.
+        """
+        return await run_async(self._measure())
 
     def close(self):
-        """Closes the I2C bus connection."""
+        """Releases the I2C bus; it is closed once no other sensor uses it."""
         if not self.mock_mode and self.bus:
-            try:
-                self.bus.close()
-                self.logger.info("HTU21D I2C bus closed.")
-            except Exception as e:
-                self.logger.error(f"Error closing HTU21D I2C bus: {e}")
-            finally:
-                self.bus = None
+            bus_manager.release(self.bus)
+            self.bus = None
+            self.logger.info("HTU21D released I2C bus.")
 
     def cleanup(self):
         self.close()
@@ -0,0 +1,183 @@
+# sensors/i2c_bus.py
+# -*- coding: utf-8 -*-
+"""
+Shared access to the I2C buses.
+
+All sensors of the HAT sit on the same bus. Rather than every driver opening
+(and on errors closing and reopening) its own smbus2 handle, drivers acquire
+an I2CBus from bus_manager. There is one I2CBus per bus number, holding a
+single handle for as long as any driver uses it.
+
+Every transfer runs under the bus lock. smbus2 selects the device with an
+ioctl before each transfer, so two threads using one handle without the lock
+could address each other's device. transaction() holds the lock across
+several transfers that must not be interleaved with those of other devices.
+
+The bus also counts I/O errors per device address, so failing devices can be
+told apart from a failing bus.
+
+Tests can plug in a fake bus with bus_manager.set_bus_factory(): the factory
+is called with the bus number and returns an object with the smbus2.SMBus
+methods used here (write_byte, write_byte_data, read_byte_data, i2c_rdwr and
+close).
+"""
+import logging
+import threading
+from contextlib import contextmanager
+
+try:
+    import smbus2
+    SMBUS_AVAILABLE = True
+except ImportError:
+    SMBUS_AVAILABLE = False
+    logging.warning("I2C: smbus2 library not found. Hardware sensors will not be available.")
+
+logger = logging.getLogger(__name__)
+
+
+def _open_smbus(bus_number):
+    if not SMBUS_AVAILABLE:
+        raise IOError("smbus2 library not found")
+    return smbus2.SMBus(bus_number)
+
+
+class I2CBus:
+    """One open I2C bus, shared by every driver on it. Obtain it from I2CBusManager.acquire()."""
+    def __init__(self, bus_number, handle):
+        self.bus_number = bus_number
+        self.lock = threading.RLock()
+        self._handle = handle
+        self._users = 0
+        self._error_counts = {}
+        self._consecutive_errors = {}
+
+    @contextmanager
+    def transaction(self):
+        """Holds the bus for several transfers, e.g. a command and the read of its result."""
+        with self.lock:
+            yield self
+
+    def _transfer(self, address, method, *args, nack_expected=False):
+        with self.lock:
+            if self._handle is None:
+                raise IOError(f"I2C bus {self.bus_number} is closed")
+            try:
+                result = getattr(self._handle, method)(*args)
+            except OSError:
+                if not nack_expected:
+                    self._error_counts[address] = self._error_counts.get(address, 0) + 1
+                    self._consecutive_errors[address] = self._consecutive_errors.get(address, 0) + 1
+                raise
+            self._consecutive_errors[address] = 0
+            return result
+
+    def write_byte(self, address, value):
+        self._transfer(address, 'write_byte', address, value)
+
+    def write_byte_data(self, address, register, value):
+        self._transfer(address, 'write_byte_data', address, register, value)
+
+    def read_byte_data(self, address, register):
+        return self._transfer(address, 'read_byte_data', address, register)
+
+    def read_bytes(self, address, length, nack_expected=False):
+        """
+        Plain read of length bytes, without writing a register address first.
+        :param nack_expected: The device NACKs as part of normal operation (e.g.
+                              while a conversion is running); such errors are
+                              still raised but not counted.
+        """
+        read_msg = smbus2.i2c_msg.read(address, length)
+        self._transfer(address, 'i2c_rdwr', read_msg, nack_expected=nack_expected)
+        return list(read_msg)
+
+    def read_register_block(self, address, register, length):
+        """
+        Reads length bytes starting at register. The register write and the read
+        are sent as one combined transfer (repeated start), in a single ioctl.
+        """
+        write_msg = smbus2.i2c_msg.write(address, [register])
+        read_msg = smbus2.i2c_msg.read(address, length)
+        self._transfer(address, 'i2c_rdwr', write_msg, read_msg)
+        return list(read_msg)
+
+    def error_count(self, address):
+        """Total I/O errors of the device at address since the bus was opened."""
+        return self._error_counts.get(address, 0)
+
+    def consecutive_errors(self, address):
+        """I/O errors of the device at address since its last successful transfer."""
+        return self._consecutive_errors.get(address, 0)
+
+    def error_counts(self):
+        """{address: total I/O errors}"""
+        with self.lock:
+            return dict(self._error_counts)
+
+    def _close(self):
+        with self.lock:
+            if self._handle is None:
+                return
+            try:
+                self._handle.close()
+            finally:
+                self._handle = None
+
+
+class I2CBusManager:
+    """Hands out one shared I2CBus per bus number and closes it once the last user releases it."""
+    def __init__(self, bus_factory=None):
+        """
+        :param bus_factory: Callable taking a bus number and returning an
+                            smbus2.SMBus-like handle. Defaults to smbus2.SMBus.
+        """
+        self._bus_factory = bus_factory if bus_factory is not None else _open_smbus
+        self._buses = {}
+        self._lock = threading.Lock()
+
+    def set_bus_factory(self, bus_factory=None):
+        """
+        Replaces the factory used to open buses, e.g. with a fake bus in tests.
+        None restores smbus2. Buses that are already open are not affected.
+        """
+        self._bus_factory = bus_factory if bus_factory is not None else _open_smbus
+
+    def acquire(self, bus_number):
+        """
+        Returns the shared I2CBus for bus_number, opening it if nobody uses it yet.
+        Every acquire() must be paired with a release().
+        Raises OSError (e.g. FileNotFoundError) if the bus cannot be opened.
+        """
+        with self._lock:
+            bus = self._buses.get(bus_number)
+            if bus is None:
+                bus = I2CBus(bus_number, self._bus_factory(bus_number))
+                self._buses[bus_number] = bus
+                logger.info(f"I2CBusManager: Opened I2C bus {bus_number}.")
+            bus._users += 1
+            return bus
+
+    def release(self, bus):
+        """Gives up a bus obtained from acquire(). The last user closes it."""
+        with self._lock:
+            bus._users -= 1
+            if bus._users > 0:
+                return
+            if self._buses.get(bus.bus_number) is bus:
+                del self._buses[bus.bus_number]
+        try:
+            bus._close()
+            logger.info(f"I2CBusManager: Closed I2C bus {bus.bus_number}.")
+        except Exception as e:
+            logger.error(f"I2CBusManager: Error closing I2C bus {bus.bus_number}: {e}", exc_info=True)
+
+    def error_counts(self):
+        """{(bus_number, address): total I/O errors} over the open buses."""
+        with self._lock:
+            buses = list(self._buses.values())
+        return {(bus.bus_number, address): count
+                for bus in buses for address, count in bus.error_counts().items()}
+
+
+# The process-wide manager used by the sensor drivers.
+bus_manager = I2CBusManager()
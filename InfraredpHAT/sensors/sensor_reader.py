@@ -1,36 +1,56 @@
 # -*- coding: utf-8 -*-
-from PyQt5.QtCore import QThread, pyqtSignal, QTimer, QDateTime, QObject, pyqtSlot
-import time
+from PyQt5.QtCore import pyqtSignal, QObject, pyqtSlot
 import logging
-import random
-from collections import deque
+import queue
 
 # Import the actual sensor classes
 from sensors.htu21d_sensor import HTU21D
 from sensors.bmp180_sensor import BMP180
 from sensors.bh1750_sensor import BH1750
+from sensors.acquisition_engine import AcquisitionEngine
 
 logger = logging.getLogger(__name__)
 
 class SensorReaderThread(QObject):
     """
-    A QObject subclass to read sensor data in a separate thread.
-    It discovers available sensors on initialization and continuously
-    reads data from them, emitting signals with the results.
+    The Qt-facing side of sensor acquisition.
+    It discovers available sensors on initialization and reads them on an
+    AcquisitionEngine, an asyncio event loop in a dedicated thread, which
+    schedules every sensor on its own cadence and overlaps their conversion
+    waits. Snapshots are passed back through a thread-safe queue and emitted
+    from data_ready on the thread this object lives in, normally the GUI thread.
     """
+    # Stopping cancels the engine's loop; this only bounds a driver that hangs.
+    STOP_TIMEOUT_S = 2.0
+
     data_ready = pyqtSignal(dict)
     sensors_discovered = pyqtSignal(dict)
     finished = pyqtSignal()
+    # Emitted from the engine thread; delivered queued to _drain_output().
+    _output_available = pyqtSignal()
 
-    def __init__(self, data_store, mock_mode=False, sampling_rate_ms=5000, sensor_config=None, parent=None):
+    def __init__(self, data_store, mock_mode=False, sampling_rate_ms=5000, sensor_config=None,
+                 sampling_intervals=None, sensor_options=None, parent=None):
+        """
+        :param sampling_rate_ms: Interval for sensors without an entry in sampling_intervals.
+        :param sampling_intervals: Optional {sensor_type: {metric_type: interval_ms}},
+                                   e.g. from SettingsManager.get_sampling_intervals().
+        :param sensor_options: Optional {sensor_type: {option: value}} passed to the
+                               sensor drivers, e.g. from SettingsManager.get_sensor_options().
+        """
         super().__init__(parent)
         self.data_store = data_store
         self._running = False
         self._mock_mode = mock_mode
         self._sampling_rate_ms = sampling_rate_ms
+        self._sampling_intervals = sampling_intervals if sampling_intervals is not None else {}
         self._sensor_config = sensor_config if sensor_config is not None else {}
+        self._sensor_options = sensor_options if sensor_options is not None else {}
         
         self.sensor_instances = {}
+        self._output_queue = queue.Queue()
+        self._engine = None
+        self._output_available.connect(self._drain_output)
         self._initialize_sensors()
         logger.info(f"SensorReaderThread initialized. Mock Mode: {self._mock_mode}, Sampling Rate: {self._sampling_rate_ms}ms.")
 
@@ -48,7 +68,7 @@ class SensorReaderThread(QObject):
         # Attempt to initialize HTU21D
         if 'HTU21D' in self._sensor_config:
             try:
-                htu_sensor = HTU21D(mock_mode=self._mock_mode)
+                htu_sensor = HTU21D(mock_mode=self._mock_mode, **self._sensor_options.get('HTU21D', {}))
                 self.sensor_instances['HTU21D'] = htu_sensor
                 if not htu_sensor.mock_mode:
                     discovered['HTU21D'] = list(self.data_store.get_all_available_metrics().get('HTU21D', {}).keys())
@@ -61,7 +81,7 @@ class SensorReaderThread(QObject):
         # Attempt to initialize BMP180
         if 'BMP180' in self._sensor_config:
             try:
-                bmp_sensor = BMP180(mock_mode=self._mock_mode)
+                bmp_sensor = BMP180(mock_mode=self._mock_mode, **self._sensor_options.get('BMP180', {}))
                 self.sensor_instances['BMP180'] = bmp_sensor
                 if not bmp_sensor.mock_mode:
                     discovered['BMP180'] = list(self.data_store.get_all_available_metrics().get('BMP180', {}).keys())
@@ -74,7 +94,7 @@ class SensorReaderThread(QObject):
         # Attempt to initialize BH1750
         if 'BH1750' in self._sensor_config:
             try:
-                bh_sensor = BH1750(mock_mode=self._mock_mode)
+                bh_sensor = BH1750(mock_mode=self._mock_mode, **self._sensor_options.get('BH1750', {}))
                 self.sensor_instances['BH1750'] = bh_sensor
                 if not bh_sensor.mock_mode:
                     discovered['BH1750'] = list(self.data_store.get_all_available_metrics().get('BH1750', {}).keys())
@@ -87,49 +107,63 @@ class SensorReaderThread(QObject):
         self.sensors_discovered.emit(discovered)
         logger.info(f"Sensor discovery complete. Real sensors found: {list(discovered.keys())}")
 
+    def _create_engine(self):
+        return AcquisitionEngine(self.sensor_instances, self._sensor_config, self._output_queue,
+                                 sampling_rate_ms=self._sampling_rate_ms,
+                                 sampling_intervals=self._sampling_intervals,
+                                 on_output=self._output_available.emit)
+
     @pyqtSlot()
     def run(self):
-        """
-        The main loop of the thread where sensor data is continuously read.
-        """
+        """Starts acquisition. Returns immediately; readings arrive through data_ready."""
+        if self._engine is not None and self._engine.is_running():
+            return
         self._running = True
-        logger.info("SensorReaderThread: Starting data reading loop.")
-        while self._running:
-            start_time = time.time()
-            
-            sensor_data_snapshot = {
-                'timestamp': int(QDateTime.currentMSecsSinceEpoch()),
-                'data': {}
-            }
-
-            for sensor_type, sensor_instance in self.sensor_instances.items():
-                if sensor_type in self._sensor_config:
-                    # The read_data method in each sensor class handles both real and mock reading
-                    data = sensor_instance.read_data()
-                    if data:
-                        sensor_data_snapshot['data'][sensor_type] = {}
-                        for metric_type, value in data.items():
-                            sensor_data_snapshot['data'][sensor_type][metric_type] = {
-                                'value': value,
-                                'is_alert': False # Alert status is determined later
-                            }
-            
-            if sensor_data_snapshot['data']:
-                self.data_ready.emit(sensor_data_snapshot)
-            
-            elapsed_time_ms = (time.time() - start_time) * 1000
-            sleep_time_ms = self._sampling_rate_ms - elapsed_time_ms
-            if sleep_time_ms > 0:
-                QThread.msleep(int(sleep_time_ms))
-        
-        self._cleanup_sensors()
-        self.finished.emit()
-        logger.info("SensorReaderThread: Data reading loop stopped and finished.")
+        self._engine = self._create_engine()
+        self._engine.start()
+        logger.info("SensorReaderThread: Acquisition started.")
+
+    @pyqtSlot()
+    def _drain_output(self):
+        """Emits every snapshot the engine has queued so far."""
+        while True:
+            try:
+                snapshot = self._output_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.data_ready.emit(snapshot)
 
     def stop(self):
-        """Stops the sensor reading thread gracefully."""
+        """
+        Stops acquisition. The engine's loop is cancelled, so this returns within
+        the read in progress rather than a sampling period.
+        """
         logger.info("SensorReaderThread: stop() method called.")
+        was_running = self._running
         self._running = False
+        if self._stop_engine():
+            self._cleanup_sensors()
+        else:
+            logger.error("SensorReaderThread: A sensor read is still in progress; leaving sensor connections open.")
+        if was_running:
+            self.finished.emit()
+            logger.info("SensorReaderThread: Acquisition stopped and finished.")
+
+    def _stop_engine(self):
+        """
+        Stops the engine, waiting once more if a blocking driver read outlasts the
+        first timeout. Cancelling the loop does not interrupt a read running in an
+        executor worker, so while one is in progress the drivers must not be
+        closed, reconfigured or handed to another engine.
+        :return: True if no engine is running any more. Otherwise the engine is kept.
+        """
+        if self._engine is not None:
+            if not self._engine.stop(self.STOP_TIMEOUT_S) and not self._engine.stop(self.STOP_TIMEOUT_S):
+                return False
+            self._engine = None
+        # Snapshots read before the stop are still delivered.
+        self._drain_output()
+        return True
 
     def _cleanup_sensors(self):
         """Closes sensor connections."""
@@ -142,12 +176,52 @@ class SensorReaderThread(QObject):
     def set_mock_mode(self, enabled):
         """Sets the mock mode for the sensor reader."""
         if self._mock_mode != enabled:
+            restart = self._engine is not None
+            if not self._stop_engine():
+                logger.error(f"SensorReaderThread: Acquisition did not stop; mock mode left at {self._mock_mode}.")
+                return
             self._mock_mode = enabled
             logger.info(f"SensorReaderThread: Mock mode set to {self._mock_mode}. Re-initializing sensors.")
             self._cleanup_sensors()
+            self.sensor_instances = {}
             self._initialize_sensors()
+            if restart:
+                self._engine = self._create_engine()
+                self._engine.start()
 
     def set_sampling_rate(self, rate_ms):
         """Sets the sampling rate for the sensor reader."""
         self._sampling_rate_ms = rate_ms
+        if self._engine is not None:
+            self._engine.set_sampling_rate(rate_ms)
         logger.info(f"SensorReaderThread: Sampling rate set to {self._sampling_rate_ms} ms.")
+
+    def set_sampling_intervals(self, sampling_intervals):
+        """
+        Sets per-sensor, per-metric sampling intervals.
+        :param sampling_intervals: {sensor_type: {metric_type: interval_ms}}.
+        """
+        self._sampling_intervals = dict(sampling_intervals)
+        if self._engine is not None:
+            self._engine.set_sampling_intervals(self._sampling_intervals)
+        logger.info(f"SensorReaderThread: Sampling intervals set to {self._sampling_intervals}.")
+
+    def set_sensor_options(self, sensor_options):
+        """
+        Applies driver options, e.g. measurement modes, to the running sensors.
+        Acquisition is paused while the drivers are reconfigured.
+        :param sensor_options: {sensor_type: {option: value}}.
+        """
+        self._sensor_options = dict(sensor_options)
+        restart = self._engine is not None
+        if not self._stop_engine():
+            logger.error("SensorReaderThread: Acquisition did not stop; sensor options not applied to the running drivers.")
+            return
+        for sensor_type, options in self._sensor_options.items():
+            sensor_instance = self.sensor_instances.get(sensor_type)
+            if sensor_instance is not None and hasattr(sensor_instance, 'configure'):
+                sensor_instance.configure(**options)
+        if restart:
+            self._engine = self._create_engine()
+            self._engine.start()
+        logger.info(f"SensorReaderThread: Sensor options set to {self._sensor_options}.")
@@ -13,6 +13,7 @@ from widgets.plot_tab_widget import PlotTabWidget
 from widgets.settings_tab import SettingsTab
 from widgets.ui_customization_tab import UICustomizationTab
 from widgets.about_tab import AboutTab
+from widgets.render_scheduler import RenderScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,9 @@ class AnaviSensorUI(QWidget):
 
         self._setup_tabs()
         self._setup_connections()
+
+        # Only the visible tab renders; hidden tabs catch up when they are shown.
+        self.render_scheduler = RenderScheduler(self.tab_widget, window=self.main_window, parent=self)
         
         logger.info("AnaviSensorUI initialized.")
 
@@ -150,22 +154,16 @@ class AnaviSensorUI(QWidget):
     @pyqtSlot(int)
     def _on_tab_changed(self, index):
         """
-        Slot to handle tab changes, potentially updating plot intervals.
+        Slot to handle tab changes, applying the current plot update interval.
+        Pausing and resuming rendering is handled by the RenderScheduler.
         """
         current_widget = self.tab_widget.widget(index)
         logger.debug(f"AnaviSensorUI: Tab changed to: {current_widget.objectName()}")
 
         plot_update_interval = self.settings_manager.get_int_setting('General', 'plot_update_interval_ms')
         
-        if current_widget == self.dashboard_tab:
-            self.dashboard_tab.set_plot_update_interval(plot_update_interval)
-            self.dashboard_tab._on_plot_timer_timeout() 
-        elif current_widget == self.sensor_details_tab:
-            self.sensor_details_tab.set_plot_update_interval(plot_update_interval)
-            self.sensor_details_tab.update_all_plots() 
-        elif current_widget == self.plot_tab:
-            self.plot_tab.set_plot_update_interval(plot_update_interval) 
-            self.plot_tab.update_plot() 
+        if current_widget in (self.dashboard_tab, self.sensor_details_tab, self.plot_tab):
+            current_widget.set_plot_update_interval(plot_update_interval)
 
     @pyqtSlot(str, str)
     def handle_ui_customization_change(self, gauge_type, gauge_style):
@@ -3,7 +3,6 @@
 import logging
 import math
 import collections
-from datetime import datetime
 from itertools import combinations as itertools_combinations
 
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel, QProgressBar, QSizePolicy, QSpacerItem, QScrollArea, QComboBox, QFormLayout
@@ -57,6 +56,12 @@ class DashboardTab(QWidget):
         self.current_selected_dashboard_plot_metric_type = None
         self.dashboard_plot_metric_display_to_actual_map = {}
 
+        # Set by the RenderScheduler. While paused the plot timer is stopped and
+        # skipped refreshes are remembered so the plot catches up once on resume.
+        self._rendering_active = True
+        self._plot_dirty = False
+        self._plotted_data_version = None
+
         self._setup_ui()
 
         self.plot_update_timer = QTimer(self)
@@ -372,9 +377,28 @@ class DashboardTab(QWidget):
         self.plot_update_interval_ms = interval_ms
         if self.plot_update_timer.isActive():
             self.plot_update_timer.stop()
-        self.plot_update_timer.start(self.plot_update_interval_ms)
+        if self._rendering_active:
+            self.plot_update_timer.start(self.plot_update_interval_ms)
         logger.info(f"Plot update timer interval set to {self.plot_update_interval_ms} ms.")
 
+    def set_rendering_active(self, active):
+        """
+        Starts or pauses plot rendering. Called by the RenderScheduler when the tab
+        is shown or hidden, or the window is minimized. On resume the plot is
+        redrawn once if new data arrived or a refresh was skipped while paused.
+        """
+        if active == self._rendering_active:
+            return
+        self._rendering_active = active
+        logger.debug(f"DashboardTab: Rendering {'resumed' if active else 'paused'}.")
+        if not active:
+            self.plot_update_timer.stop()
+            return
+
+        self.plot_update_timer.start(self.plot_update_interval_ms)
+        if self._plot_dirty or self._plotted_data_version != self.data_store.data_version:
+            self._on_plot_timer_timeout()
+
     @pyqtSlot(str)
     def _on_plot_time_range_changed(self, time_range):
         """Handles plot time range changes from the UI."""
@@ -408,6 +432,12 @@ class DashboardTab(QWidget):
         Fetches data and updates the plot based on the current time range and selected metric(s).
         This method is called by the QTimer.
         """
+        if not self._rendering_active:
+            self._plot_dirty = True
+            return
+        self._plot_dirty = False
+        self._plotted_data_version = self.data_store.data_version
+
         logger.debug(f"DashboardTab._on_plot_timer_timeout: Updating plot via timer.")
         # Check for valid selections before proceeding
         if not self.current_selected_dashboard_plot_metric_type or "No Metrics" in self.current_selected_dashboard_plot_metric_type:
@@ -415,35 +445,11 @@ class DashboardTab(QWidget):
              return
 
         current_time_range = self.dashboard_plot_time_range_combo.currentText()
-        history = self.data_store.get_data_history(time_range=current_time_range)
-        logger.debug(f"  Full history fetched for dashboard plot. Number of data points: {len(history)}.")
-
-        if not history:
-            self.plot_widget.clear_plot("No data to plot for this time range.")
-            return
+        target_points = self.plot_widget.get_target_point_count()
 
         series_to_plot = []
-        all_y_data_collected = []
-
-        x_data_template = []
-        for dp in history:
-            ts = dp.get('timestamp')
-            if isinstance(ts, datetime):
-                x_data_template.append(ts)
-            elif isinstance(ts, str):
-                try:
-                    # Assuming format is like '2024-01-15T10:30:00.123Z' or similar ISO format
-                    dt_obj = datetime.fromisoformat(ts.replace('Z', '+00:00')) if 'Z' in ts else datetime.fromisoformat(ts)
-                    x_data_template.append(dt_obj)
-                except (ValueError, TypeError):
-                    try: # Fallback for time-only strings like HH:MM:SS
-                       dt_obj = datetime.strptime(ts, "%H:%M:%S")
-                       x_data_template.append(dt_obj)
-                    except (ValueError, TypeError):
-                       logger.warning(f"      Could not parse timestamp '{ts}'. Skipping this data point for X-axis.")
-                       x_data_template.append(None)
-            else:
-                x_data_template.append(None)
+        all_y_min = None
+        all_y_max = None
 
         metrics_to_plot_pairs = []
         selected_display_name = self.current_selected_dashboard_plot_metric_type
@@ -474,17 +480,15 @@ class DashboardTab(QWidget):
                 logger.debug(f"    Metric '{s_type}/{m_type}' is disabled. Skipping plot series.")
                 continue
 
-            y_data = [dp['sensors'].get(s_type, {}).get(m_type) for dp in history]
-
-            valid_data_points = [(x, y) for x, y in zip(x_data_template, y_data) if x is not None and y is not None]
-
-            if not valid_data_points:
+            x_data, y_data = self.data_store.get_plot_series(s_type, m_type, time_range=current_time_range,
+                                                             max_points=target_points)
+            if len(y_data) == 0:
                 logger.debug(f"    No valid data points for '{s_type}/{m_type}'. Skipping series.")
                 continue
 
-            x_data_filtered = [dp[0] for dp in valid_data_points]
-            y_data_filtered = [dp[1] for dp in valid_data_points]
-            all_y_data_collected.extend(y_data_filtered)
+            series_y_min, series_y_max = float(y_data.min()), float(y_data.max())
+            all_y_min = series_y_min if all_y_min is None else min(all_y_min, series_y_min)
+            all_y_max = series_y_max if all_y_max is None else max(all_y_max, series_y_max)
 
             unit = self.settings_manager.get_unit(s_type, m_type) or ""
 
@@ -493,15 +497,15 @@ class DashboardTab(QWidget):
 
             series_to_plot.append({
                 'label': f"{s_type} {m_type.capitalize()} ({unit})",
-                'x_data': x_data_filtered,
-                'y_data': y_data_filtered,
+                'x_data': x_data,
+                'y_data': y_data,
                 'low_threshold': low_threshold_value,
                 'high_threshold': high_threshold_value
             })
             has_any_valid_data = True
 
         if not has_any_valid_data:
-            self.plot_widget.clear_plot("No enabled sensor data to plot for this time range.")
+            self.plot_widget.clear_plot("No data to plot for this time range.")
             return
 
         y_label_text = "Value"
@@ -514,9 +518,9 @@ class DashboardTab(QWidget):
             y_label_text = f"Value ({list(all_units)[0]})"
         # If units are mixed, the generic "Value" is best.
 
-        if all_y_data_collected:
-            data_y_min = min(all_y_data_collected)
-            data_y_max = max(all_y_data_collected)
+        if all_y_min is not None:
+            data_y_min = all_y_min
+            data_y_max = all_y_max
 
             if data_y_min == data_y_max:
                 if data_y_max == 0.0:
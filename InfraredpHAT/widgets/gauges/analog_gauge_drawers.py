@@ -43,6 +43,19 @@ class AnalogGaugeDrawer(BaseGaugeDrawer):
             painter.restore() 
         painter.restore()
 
+    def _draw_frame(self, painter, center_x, center_y, radius, colors, gauge_style):
+        frame_rect = QRectF(center_x - radius, center_y - radius, radius * 2, radius * 2)
+        path = QPainterPath()
+        path.addEllipse(frame_rect)
+        self._apply_gauge_frame_and_style(painter, frame_rect, path, colors['background'], colors['gauge_border_color'], colors['gauge_border_width'], colors['gauge_border_style'], gauge_style)
+
+    def _draw_dial(self, painter, rect, center_x, center_y, radius, colors, gauge_style, **scale_args):
+        """Draws the frame and the scale from the cached 'dial' layer. scale_args go to _draw_scale_and_labels()."""
+        def draw_layer(layer_painter):
+            self._draw_frame(layer_painter, center_x, center_y, radius, colors, gauge_style)
+            self._draw_scale_and_labels(layer_painter, center_x, center_y, radius, colors['scale_color'], **scale_args)
+        self._draw_cached_layer(painter, 'dial', colors, gauge_style, draw_layer)
+
     def _draw_needle(self, painter, center_x, center_y, radius, needle_color, current_value_animated, min_value, max_value, start_angle, span_angle, needle_type='triangle'):
         painter.save() 
         painter.translate(center_x, center_y)
@@ -92,11 +105,7 @@ class AnalogGaugeDrawer(BaseGaugeDrawer):
         center_y = rect.center().y()
         radius = min(rect.width(), rect.height()) / 2 * 0.9 
         
-        path = QPainterPath()
-        path.addEllipse(QRectF(rect.center().x() - radius, rect.center().y() - radius, radius * 2, radius * 2))
-        self._apply_gauge_frame_and_style(painter, QRectF(rect.center().x() - radius, rect.center().y() - radius, radius * 2, radius * 2), path, colors['background'], colors['gauge_border_color'], colors['gauge_border_width'], colors['gauge_border_style'], gauge_style)
-
-        self._draw_scale_and_labels(painter, center_x, center_y, radius, colors['scale_color'], start_angle=225, span_angle=270, label_interval=10)
+        self._draw_dial(painter, rect, center_x, center_y, radius, colors, gauge_style, start_angle=225, span_angle=270, label_interval=10)
 
         if self.parent_widget._current_value is not None:
             self._draw_needle(painter, center_x, center_y, radius, colors['needle_color'], 
@@ -112,7 +121,7 @@ class AnalogGaugeDrawer(BaseGaugeDrawer):
         name_rect_width = rect.width() * 0.7
         name_rect = QRectF(0, 0, name_rect_width, name_rect_height)
         name_rect.moveCenter(QPointF(rect.center().x(), rect.y() + rect.height() * 0.30))
-        self._draw_sensor_name(painter, name_rect, sensor_name, colors)
+        self._draw_cached_sensor_name(painter, rect, name_rect, sensor_name, colors, gauge_style)
 
         self._draw_value_text(painter, 
                               rect.adjusted(rect.width() * 0.2, rect.height() * 0.4, -rect.width() * 0.2, -rect.height() * 0.1),
@@ -131,17 +140,15 @@ class AnalogBasicGaugeDrawer(AnalogGaugeDrawer):
         center_y = rect.center().y()
         radius = min(rect.width(), rect.height()) / 2 * 0.9
 
-        path = QPainterPath()
-        path.addEllipse(QRectF(center_x - radius, center_y - radius, radius * 2, radius * 2))
-        self._apply_gauge_frame_and_style(painter, QRectF(center_x - radius, center_y - radius, radius * 2, radius * 2), path, colors['background'], colors['gauge_border_color'], colors['gauge_border_width'], colors['gauge_border_style'], gauge_style)
-
-        self._draw_scale_and_labels(painter, center_x, center_y, radius, colors['scale_color'], start_angle=-120, span_angle=300, label_interval=10, label_start_angle_offset=0)
+        self._draw_dial(painter, rect, center_x, center_y, radius, colors, gauge_style, start_angle=-120, span_angle=300, label_interval=10, label_start_angle_offset=0)
 
         if self.parent_widget._current_value is not None:
             self._draw_needle(painter, center_x, center_y, radius, colors['needle_color'], 
                               current_value_animated, min_value, max_value, 
                               start_angle=-120, span_angle=300, needle_type='triangle')
 
+        # The dot is outlined with the scale pen.
+        painter.setPen(QPen(colors['scale_color'], 2))
         painter.setBrush(QBrush(colors['center_dot_color']))
         painter.drawEllipse(QPointF(center_x, center_y), 8, 8)
 
@@ -150,7 +157,7 @@ class AnalogBasicGaugeDrawer(AnalogGaugeDrawer):
         name_rect_width = rect.width() * 0.7
         name_rect = QRectF(0, 0, name_rect_width, name_rect_height)
         name_rect.moveCenter(QPointF(rect.center().x(), rect.y() + rect.height() * 0.30))
-        self._draw_sensor_name(painter, name_rect, sensor_name, colors)
+        self._draw_cached_sensor_name(painter, rect, name_rect, sensor_name, colors, gauge_style)
 
         self._draw_value_text(painter, 
                               rect.adjusted(rect.width() * 0.2, rect.height() * 0.4, -rect.width() * 0.2, -rect.height() * 0.1), 
@@ -169,11 +176,7 @@ class AnalogClassicBasicGaugeDrawer(AnalogGaugeDrawer):
         center_y = rect.center().y()
         radius = min(rect.width(), rect.height()) / 2 * 0.9 
         
-        path = QPainterPath()
-        path.addEllipse(QRectF(center_x - radius, center_y - radius, radius * 2, radius * 2))
-        self._apply_gauge_frame_and_style(painter, QRectF(center_x - radius, center_y - radius, radius * 2, radius * 2), path, colors['background'], colors['gauge_border_color'], colors['gauge_border_width'], colors['gauge_border_style'], gauge_style)
-
-        self._draw_scale_and_labels(painter, center_x, center_y, radius, colors['scale_color'], start_angle=225, span_angle=270, label_interval=20)
+        self._draw_dial(painter, rect, center_x, center_y, radius, colors, gauge_style, start_angle=225, span_angle=270, label_interval=20)
 
         if self.parent_widget._current_value is not None:
             self._draw_needle(painter, center_x, center_y, radius, colors['needle_color'], 
@@ -189,7 +192,7 @@ class AnalogClassicBasicGaugeDrawer(AnalogGaugeDrawer):
         name_rect_width = rect.width() * 0.7
         name_rect = QRectF(0, 0, name_rect_width, name_rect_height)
         name_rect.moveCenter(QPointF(rect.center().x(), rect.y() + rect.height() * 0.30))
-        self._draw_sensor_name(painter, name_rect, sensor_name, colors)
+        self._draw_cached_sensor_name(painter, rect, name_rect, sensor_name, colors, gauge_style)
 
         self._draw_value_text(painter, 
                               rect.adjusted(rect.width() * 0.2, rect.height() * 0.4, -rect.width() * 0.2, -rect.height() * 0.1), 
@@ -208,11 +211,7 @@ class AnalogClassicFullGaugeDrawer(AnalogGaugeDrawer):
         center_y = rect.center().y()
         radius = min(rect.width(), rect.height()) / 2 * 0.9 
         
-        path = QPainterPath()
-        path.addEllipse(QRectF(center_x - radius, center_y - radius, radius * 2, radius * 2))
-        self._apply_gauge_frame_and_style(painter, QRectF(center_x - radius, center_y - radius, radius * 2, radius * 2), path, colors['background'], colors['gauge_border_color'], colors['gauge_border_width'], colors['gauge_border_style'], gauge_style)
-
-        self._draw_scale_and_labels(painter, center_x, center_y, radius, colors['scale_color'], start_angle=-0, span_angle=360, label_interval=30, label_start_angle_offset=0)
+        self._draw_dial(painter, rect, center_x, center_y, radius, colors, gauge_style, start_angle=-0, span_angle=360, label_interval=30, label_start_angle_offset=0)
 
         if self.parent_widget._current_value is not None:
             self._draw_needle(painter, center_x, center_y, radius, colors['needle_color'], 
@@ -228,7 +227,7 @@ class AnalogClassicFullGaugeDrawer(AnalogGaugeDrawer):
         name_rect_width = rect.width() * 0.7
         name_rect = QRectF(0, 0, name_rect_width, name_rect_height)
         name_rect.moveCenter(QPointF(rect.center().x(), rect.y() + rect.height() * 0.30))
-        self._draw_sensor_name(painter, name_rect, sensor_name, colors)
+        self._draw_cached_sensor_name(painter, rect, name_rect, sensor_name, colors, gauge_style)
 
         self._draw_value_text(painter, 
                               rect.adjusted(rect.width() * 0.2, rect.height() * 0.4, -rect.width() * 0.2, -rect.height() * 0.1),
@@ -248,9 +247,8 @@ class AnalogFullGaugeDrawer(AnalogGaugeDrawer):
         radius_outer = min(rect.width(), rect.height()) / 2 * 0.95
         radius_inner = radius_outer * 0.75 
 
-        path = QPainterPath()
-        path.addEllipse(QRectF(center_x - radius_outer, center_y - radius_outer, radius_outer * 2, radius_outer * 2))
-        self._apply_gauge_frame_and_style(painter, QRectF(center_x - radius_outer, center_y - radius_outer, radius_outer * 2, radius_outer * 2), path, colors['background'], colors['gauge_border_color'], colors['gauge_border_width'], colors['gauge_border_style'], gauge_style)
+        self._draw_cached_layer(painter, 'frame', colors, gauge_style,
+                                lambda layer_painter: self._draw_frame(layer_painter, center_x, center_y, radius_outer, colors, gauge_style))
 
         arc_rect = QRectF(center_x - radius_outer, center_y - radius_outer, radius_outer * 2, radius_outer * 2)
         
@@ -278,7 +276,9 @@ class AnalogFullGaugeDrawer(AnalogGaugeDrawer):
         painter.setBrush(QBrush(colors['background']))
         painter.drawEllipse(QPointF(center_x, center_y), int(radius_inner), int(radius_inner))
 
-        self._draw_scale_and_labels(painter, center_x, center_y, radius_outer, colors['scale_color'], start_angle=90, span_angle=360, label_interval=30, label_start_angle_offset=0)
+        # The scale is drawn over the value fill, so it has a layer of its own.
+        self._draw_cached_layer(painter, 'scale', colors, gauge_style,
+                                lambda layer_painter: self._draw_scale_and_labels(layer_painter, center_x, center_y, radius_outer, colors['scale_color'], start_angle=90, span_angle=360, label_interval=30, label_start_angle_offset=0))
 
         if self.parent_widget._current_value is not None:
             self._draw_needle(painter, center_x, center_y, radius_outer, colors['needle_color'], 
@@ -294,7 +294,7 @@ class AnalogFullGaugeDrawer(AnalogGaugeDrawer):
         name_rect_width = rect.width() * 0.7
         name_rect = QRectF(0, 0, name_rect_width, name_rect_height)
         name_rect.moveCenter(QPointF(rect.center().x(), rect.y() + rect.height() * 0.30))
-        self._draw_sensor_name(painter, name_rect, sensor_name, colors)
+        self._draw_cached_sensor_name(painter, rect, name_rect, sensor_name, colors, gauge_style)
 
         self._draw_value_text(painter, 
                               rect.adjusted(rect.width() * 0.2, rect.height() * 0.4, -rect.width() * 0.2, -rect.height() * 0.1), 
@@ -313,11 +313,7 @@ class AnalogModernBasicGaugeDrawer(AnalogGaugeDrawer):
         center_y = rect.center().y()
         radius = min(rect.width(), rect.height()) / 2 * 0.9 
         
-        path = QPainterPath()
-        path.addEllipse(QRectF(center_x - radius, center_y - radius, radius * 2, radius * 2))
-        self._apply_gauge_frame_and_style(painter, QRectF(center_x - radius, center_y - radius, radius * 2, radius * 2), path, colors['background'], colors['gauge_border_color'], colors['gauge_border_width'], colors['gauge_border_style'], gauge_style)
-
-        self._draw_scale_and_labels(painter, center_x, center_y, radius, colors['scale_color'], start_angle=225, span_angle=270, label_interval=20)
+        self._draw_dial(painter, rect, center_x, center_y, radius, colors, gauge_style, start_angle=225, span_angle=270, label_interval=20)
 
         if self.parent_widget._current_value is not None:
             self._draw_needle(painter, center_x, center_y, radius, colors['needle_color'], 
@@ -333,7 +329,7 @@ class AnalogModernBasicGaugeDrawer(AnalogGaugeDrawer):
         name_rect_width = rect.width() * 0.7
         name_rect = QRectF(0, 0, name_rect_width, name_rect_height)
         name_rect.moveCenter(QPointF(rect.center().x(), rect.y() + rect.height() * 0.30))
-        self._draw_sensor_name(painter, name_rect, sensor_name, colors)
+        self._draw_cached_sensor_name(painter, rect, name_rect, sensor_name, colors, gauge_style)
 
         self._draw_value_text(painter, 
                               rect.adjusted(rect.width() * 0.2, rect.height() * 0.4, -rect.width() * 0.2, -rect.height() * 0.1),
@@ -353,9 +349,8 @@ class AnalogModernFullGaugeDrawer(AnalogGaugeDrawer):
         radius_outer = min(rect.width(), rect.height()) / 2 * 0.95
         radius_inner = radius_outer * 0.75 
 
-        path = QPainterPath()
-        path.addEllipse(QRectF(center_x - radius_outer, center_y - radius_outer, radius_outer * 2, radius_outer * 2))
-        self._apply_gauge_frame_and_style(painter, QRectF(center_x - radius_outer, center_y - radius_outer, radius_outer * 2, radius_outer * 2), path, colors['background'], colors['gauge_border_color'], colors['gauge_border_width'], colors['gauge_border_style'], gauge_style)
+        self._draw_cached_layer(painter, 'frame', colors, gauge_style,
+                                lambda layer_painter: self._draw_frame(layer_painter, center_x, center_y, radius_outer, colors, gauge_style))
 
         arc_rect = QRectF(center_x - radius_outer, center_y - radius_outer, radius_outer * 2, radius_outer * 2)
         
@@ -383,7 +378,9 @@ class AnalogModernFullGaugeDrawer(AnalogGaugeDrawer):
         painter.setBrush(QBrush(colors['background']))
         painter.drawEllipse(QPointF(center_x, center_y), int(radius_inner), int(radius_inner))
 
-        self._draw_scale_and_labels(painter, center_x, center_y, radius_outer, colors['scale_color'], start_angle=90, span_angle=360, label_interval=30, label_start_angle_offset=0)
+        # The scale is drawn over the value fill, so it has a layer of its own.
+        self._draw_cached_layer(painter, 'scale', colors, gauge_style,
+                                lambda layer_painter: self._draw_scale_and_labels(layer_painter, center_x, center_y, radius_outer, colors['scale_color'], start_angle=90, span_angle=360, label_interval=30, label_start_angle_offset=0))
 
         if self.parent_widget._current_value is not None:
             self._draw_needle(painter, center_x, center_y, radius_outer, colors['needle_color'], 
@@ -399,7 +396,7 @@ class AnalogModernFullGaugeDrawer(AnalogGaugeDrawer):
         name_rect_width = rect.width() * 0.7
         name_rect = QRectF(0, 0, name_rect_width, name_rect_height)
         name_rect.moveCenter(QPointF(rect.center().x(), rect.y() + rect.height() * 0.30))
-        self._draw_sensor_name(painter, name_rect, sensor_name, colors)
+        self._draw_cached_sensor_name(painter, rect, name_rect, sensor_name, colors, gauge_style)
 
         self._draw_value_text(painter, 
                               rect.adjusted(rect.width() * 0.2, rect.height() * 0.4, -rect.width() * 0.2, -rect.height() * 0.1), 
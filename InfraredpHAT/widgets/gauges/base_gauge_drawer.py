@@ -1,18 +1,27 @@
 # widgets/gauges/base_gauge_drawer.py
 from PyQt5.QtCore import Qt, QRectF, QPointF
-from PyQt5.QtGui import QPainter, QBrush, QColor, QFont, QPen, QPainterPath, QFontMetrics, QLinearGradient, QTransform
+from PyQt5.QtGui import QPainter, QBrush, QColor, QFont, QPen, QPainterPath, QFontMetrics, QLinearGradient, QTransform, QPixmap
 import logging
 import math
 
+from .text_fit import fit_font, widest_digit_run
+
 logger = logging.getLogger(__name__)
 
 class BaseGaugeDrawer:
     """
     Base class for all gauge drawing logic. Provides common helper methods
     and an interface for drawing.
+
+    Parts of a gauge that do not depend on the current value (dial, scale,
+    ticks, labels, sensor name) can be drawn through _draw_cached_layer(): they
+    are rendered once into a pixmap and only blitted on later paints, so an
+    animated repaint only draws the needle, the value fill and the value text.
     """
     def __init__(self, parent_widget):
         self.parent_widget = parent_widget # Reference to the SensorDisplayWidget instance
+        # layer name -> (key, colors, pixmap), see _draw_cached_layer()
+        self._layer_cache = {}
 
     def _get_themed_color(self, key, default_value=None):
         return self.parent_widget._get_themed_color(key, default_value)
@@ -29,6 +38,68 @@ class BaseGaugeDrawer:
     def _format_value(self, value):
         return self.parent_widget._format_value(value)
     
+    def _value_fit_text(self, display_text, unit=''):
+        """
+        The text to fit value text on: the widest of display_text and the range
+        ends at the configured precision, with every digit as '0'. The fitted
+        font then stays the same while the value changes within the range.
+        """
+        candidates = [display_text] + [f"{self._format_value(value)}{unit}"
+                                       for value in (self.parent_widget._min_value, self.parent_widget._max_value)]
+        return max((widest_digit_run(text) for text in candidates), key=len)
+
+    def _layer_key(self, painter, layer_rect, gauge_style):
+        """Everything a static layer may depend on besides the colors."""
+        widget = self.parent_widget
+        device = painter.device()
+        dpr = device.devicePixelRatioF() if device is not None else 1.0
+        return (layer_rect.x(), layer_rect.y(), layer_rect.width(), layer_rect.height(), dpr,
+                widget._min_value, widget._max_value, tuple(sorted(widget.thresholds.items())),
+                gauge_style, widget.sensor_name, widget.sensor_category, widget.metric_type, widget._precision)
+
+    def _draw_cached_layer(self, painter, layer, colors, gauge_style, draw_layer, layer_rect=None):
+        """
+        Draws a static part of the gauge from a cached pixmap.
+        draw_layer(layer_painter) is only called to (re)render the layer, when
+        its size, the device pixel ratio, range, thresholds, style, sensor or
+        precision change, or when the widget hands in another colors mapping
+        (theme, gauge type or alert state changed). It draws in the same
+        coordinates as the untransformed painter; whatever it draws outside
+        layer_rect (default: the whole paint device) is cut off.
+        """
+        target = QRectF(layer_rect if layer_rect is not None else painter.window()).toAlignedRect()
+        if target.isEmpty():
+            return
+        key = self._layer_key(painter, target, gauge_style)
+        cached = self._layer_cache.get(layer)
+        if cached is None or cached[0] != key or cached[1] is not colors:
+            pixmap = self._render_layer(painter, target, key[4], draw_layer)
+            cached = self._layer_cache[layer] = (key, colors, pixmap)
+        painter.drawPixmap(target.topLeft(), cached[2])
+
+    def _render_layer(self, painter, target, dpr, draw_layer):
+        pixmap = QPixmap(max(1, math.ceil(target.width() * dpr)), max(1, math.ceil(target.height() * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        layer_painter = QPainter(pixmap)
+        try:
+            layer_painter.setRenderHints(painter.renderHints())
+            layer_painter.setFont(painter.font())
+            layer_painter.setPen(painter.pen())
+            layer_painter.setBrush(painter.brush())
+            layer_painter.translate(-target.x(), -target.y())
+            draw_layer(layer_painter)
+        finally:
+            layer_painter.end()
+        return pixmap
+
+    def _draw_cached_sensor_name(self, painter, rect, name_rect, name, colors, gauge_style):
+        """_draw_sensor_name() through a cached layer as wide as rect and three times as high as name_rect."""
+        layer_rect = QRectF(rect.x(), name_rect.y() - name_rect.height(), rect.width(), name_rect.height() * 3)
+        self._draw_cached_layer(painter, 'sensor_name', colors, gauge_style,
+                                lambda layer_painter: self._draw_sensor_name(layer_painter, name_rect, name, colors),
+                                layer_rect)
+
     def _draw_sensor_name(self, painter, rect, name, colors):
         """
         Draws a shortened sensor name with a theme-aware symbol inside the specified rect.
@@ -50,14 +121,9 @@ class BaseGaugeDrawer:
             if initial_font_size > 30: initial_font_size = 30
             if initial_font_size < min_font_size: initial_font_size = min_font_size
 
-            font = QFont(self._get_themed_font_family('font_family', 'Inter'), initial_font_size, QFont.Bold)
-            
-            metrics = QFontMetrics(font)
-            
             display_full_text = f"{sensor_category} {symbol}"
-            while metrics.horizontalAdvance(display_full_text) > (rect.width() * max_text_width_ratio) and font.pointSize() > min_font_size:
-                font.setPointSize(font.pointSize() - 1)
-                metrics = QFontMetrics(font)
+            font, metrics = fit_font(self._get_themed_font_family('font_family', 'Inter'), display_full_text,
+                                     rect.width() * max_text_width_ratio, initial_font_size, min_font_size, QFont.Bold)
             
             painter.setFont(font)
 
@@ -0,0 +1,37 @@
+# widgets/gauges/text_fit.py
+"""
+Process-wide cache of fitted fonts for gauge text.
+
+Gauges shrink a font point by point until a text fits its box. The result
+only depends on the font family, weight, text, start size and box width, so
+it is computed once and shared by all gauges; steady-state repaints do no
+text layout.
+"""
+import re
+from functools import lru_cache
+
+from PyQt5.QtGui import QFont, QFontMetrics
+
+FIT_CACHE_SIZE = 512
+
+_DIGIT_RE = re.compile(r'\d')
+
+
+@lru_cache(maxsize=FIT_CACHE_SIZE)
+def fit_font(family, text, max_width, start_size, min_size=8, weight=QFont.Normal):
+    """
+    Returns (font, metrics) for the largest point size from start_size down to
+    min_size at which text is at most max_width wide.
+    The font is shared by all callers: copy it (QFont(font)) before changing it.
+    """
+    font = QFont(family, start_size, weight)
+    metrics = QFontMetrics(font)
+    while metrics.horizontalAdvance(text) > max_width and font.pointSize() > min_size:
+        font.setPointSize(font.pointSize() - 1)
+        metrics = QFontMetrics(font)
+    return font, metrics
+
+
+def widest_digit_run(text):
+    """text with every digit replaced by '0', the widest digit in common fonts."""
+    return _DIGIT_RE.sub('0', text)
@@ -11,17 +11,52 @@ from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as Navigatio
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm 
+import matplotlib.dates as mdates
+import numpy as np
 
 import logging
 
+from widgets.plot_decimation import decimate, DECIMATION_MINMAX
+
 logger = logging.getLogger(__name__)
 
+
+class _SeriesCanvas(FigureCanvas):
+    """
+    Qt canvas for MatplotlibWidget. Series lines are animated, i.e. blitted by
+    the widget and skipped by regular figure draws, so exports (savefig, the
+    toolbar's save button) temporarily turn animation off to include them.
+    """
+    def __init__(self, figure):
+        super().__init__(figure)
+        self.exporting = False
+
+    def print_figure(self, *args, **kwargs):
+        animated = self.figure.findobj(lambda artist: artist.get_animated())
+        for artist in animated:
+            artist.set_animated(False)
+        self.exporting = True
+        try:
+            return super().print_figure(*args, **kwargs)
+        finally:
+            self.exporting = False
+            for artist in animated:
+                artist.set_animated(True)
+            # The export may have drawn at another size or DPI; re-cache the on-screen background.
+            self.draw_idle()
+
+
 class MatplotlibWidget(QWidget):
     """
     A Qt widget that embeds a Matplotlib figure for plotting sensor data.
     Provides basic plotting functionality and theme integration.
     """
-    def __init__(self, theme_colors, settings_manager, parent=None, hide_toolbar=False):
+    # Fraction of the data span added ahead of the newest x value when the view has
+    # to be recomputed, so the next few ticks still fit and can be blitted.
+    X_VIEW_HEADROOM = 0.1
+    Y_VIEW_MARGIN = 0.05
+
+    def __init__(self, theme_colors, settings_manager, parent=None, hide_toolbar=False, persistent_artists=True):
         super().__init__(parent)
         self.setObjectName("MatplotlibWidget")
         
@@ -29,13 +64,23 @@ class MatplotlibWidget(QWidget):
         self.settings_manager = settings_manager
         self.hide_toolbar = hide_toolbar
 
+        # Persistent-artist mode: lines and threshold markers are created once per
+        # series set and then updated with set_data, redrawing only the axes region
+        # by blitting over a cached background.
+        self.persistent_artists = persistent_artists
+        self._series_signature = None
+        self._line_artists = []
+        self._threshold_values = []
+        self._background = None
+
         self.figure = Figure()
-        self.canvas = FigureCanvas(self.figure)
+        self.canvas = _SeriesCanvas(self.figure)
         self.toolbar = NavigationToolbar(self.canvas, self)
         
         self.toolbar.setVisible(not self.hide_toolbar) 
 
         self.ax = self.figure.add_subplot(111) 
+        self.canvas.mpl_connect('draw_event', self._on_canvas_draw)
         
         self.status_label = QLabel("Loading plot data...")
         self.status_label.setAlignment(Qt.AlignCenter)
@@ -164,6 +209,146 @@ class MatplotlibWidget(QWidget):
         self.hide_toolbar = hide
         logger.debug(f"MatplotlibWidget: Toolbar visibility set to {'hidden' if hide else 'visible'}.")
 
+    def get_target_point_count(self, points_per_pixel=2):
+        """
+        Returns how many points per series are worth plotting: points_per_pixel
+        for every horizontal device pixel of the canvas.
+        """
+        width_px = self.canvas.width() * self.canvas.devicePixelRatioF()
+        return max(int(width_px * points_per_pixel), 100)
+
+    def _prepare_series_arrays(self, x_data, y_data, time_series):
+        """
+        Drops missing points (None in lists, NaN in arrays) and decimates the rest.
+        NumPy arrays, such as those from SensorDataStore.get_plot_series, are
+        filtered without a Python-level loop.
+        Returns (x, y) NumPy arrays, or None if the series has no valid points.
+        """
+        if isinstance(y_data, np.ndarray) and y_data.dtype.kind == 'f':
+            valid = ~np.isnan(y_data)
+            x_values = np.asarray(x_data)[valid]
+            y_values = y_data[valid]
+        else:
+            filtered_data = [(x, y) for x, y in zip(x_data, y_data) if y is not None]
+            if not filtered_data:
+                return None
+            x_values, y_values = zip(*filtered_data)
+        if len(y_values) == 0:
+            return None
+        return self._decimate_series(x_values, y_values, time_series)
+
+    def _decimate_series(self, x_data, y_data, time_series):
+        """
+        Reduces a series to what the canvas can actually show, using the decimation
+        method selected in settings ('UI' / 'plot_decimation').
+        Returns NumPy arrays ready for ax.plot.
+        """
+        x_array = np.asarray(x_data, dtype='datetime64[ms]') if time_series else np.asarray(x_data)
+        y_array = np.asarray(y_data, dtype=np.float64)
+
+        method = self.settings_manager.get_setting('UI', 'plot_decimation', fallback=DECIMATION_MINMAX)
+        width_px = self.get_target_point_count(points_per_pixel=1)
+        try:
+            return decimate(x_array, y_array, method, width_px)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"MatplotlibWidget: Decimation failed ({e}). Plotting all {len(y_array)} points.")
+            return x_array, y_array
+
+    def _reset_persistent_artists(self):
+        """Forgets the cached artists so the next plot_series call rebuilds the figure."""
+        self._series_signature = None
+        self._line_artists = []
+        self._threshold_values = []
+        self._background = None
+
+    def _make_series_signature(self, series_data, plot_title, x_label, y_label, time_series, show_legend):
+        """Describes everything about a plot that is not per-tick data."""
+        return (plot_title, x_label, y_label, time_series, show_legend,
+                tuple((series.get('label'), str(series.get('color')),
+                       series.get('low_threshold') is None, series.get('high_threshold') is None)
+                      for series in series_data))
+
+    def _on_canvas_draw(self, event):
+        """
+        After every full draw, caches the axes background (without the animated
+        series lines) and paints the lines on top of it. Draws made for an export
+        render the lines themselves and are left alone.
+        """
+        if event.canvas is not self.canvas or self.canvas.exporting or not self._line_artists:
+            return
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        for line in self._line_artists:
+            line.draw(event.renderer)
+
+    def _to_axis_units(self, x_array, time_series):
+        return mdates.date2num(x_array) if time_series else np.asarray(x_array, dtype=np.float64)
+
+    def _view_needs_update(self, x_min, x_max, y_min, y_max):
+        """
+        True when the data no longer fits the current view, or only fills a small
+        part of it (for example after switching to a shorter time range).
+        """
+        view_x0, view_x1 = self.ax.get_xlim()
+        view_y0, view_y1 = self.ax.get_ylim()
+        if x_min < view_x0 or x_max > view_x1 or y_min < view_y0 or y_max > view_y1:
+            return True
+        return (x_max - x_min) < 0.5 * (view_x1 - view_x0)
+
+    def _set_view_limits(self, x_min, x_max, y_min, y_max):
+        x_span = x_max - x_min
+        if x_span <= 0:
+            x_span = 1.0 / (24 * 60) # One minute in Matplotlib date units; harmless for numeric axes.
+        self.ax.set_xlim(x_min, x_max + x_span * self.X_VIEW_HEADROOM)
+
+        y_span = y_max - y_min
+        y_margin = y_span * self.Y_VIEW_MARGIN if y_span > 0 else max(abs(y_max) * 0.1, 0.5)
+        self.ax.set_ylim(y_min - y_margin, y_max + y_margin)
+
+    def _update_persistent_series(self, series_data, time_series, draw_now):
+        """
+        Updates the existing Line2D artists in place. Returns False if the figure
+        has to be rebuilt instead (a series has no data or a threshold moved).
+        """
+        prepared = []
+        for series in series_data:
+            arrays = self._prepare_series_arrays(series.get('x_data', []), series.get('y_data', []), time_series)
+            if arrays is None:
+                return False
+            prepared.append(arrays)
+
+        thresholds = [(series.get('low_threshold'), series.get('high_threshold')) for series in series_data]
+        if thresholds != self._threshold_values:
+            return False
+
+        x_min = y_min = float('inf')
+        x_max = y_max = float('-inf')
+        for line, (x_array, y_array) in zip(self._line_artists, prepared):
+            line.set_data(x_array, y_array)
+            x_numeric = self._to_axis_units(x_array, time_series)
+            x_min, x_max = min(x_min, x_numeric[0]), max(x_max, x_numeric[-1])
+            y_min, y_max = min(y_min, np.nanmin(y_array)), max(y_max, np.nanmax(y_array))
+        for low, high in thresholds:
+            for value in (low, high):
+                if value is not None:
+                    y_min, y_max = min(y_min, value), max(y_max, value)
+
+        if self.status_label.isVisible():
+            self.hide_status_message()
+
+        if self._view_needs_update(x_min, x_max, y_min, y_max):
+            self._set_view_limits(x_min, x_max, y_min, y_max)
+            if draw_now:
+                self.draw()
+        elif draw_now:
+            if self._background is None:
+                self.draw()
+            else:
+                self.canvas.restore_region(self._background)
+                for line in self._line_artists:
+                    self.ax.draw_artist(line)
+                self.canvas.blit(self.ax.bbox)
+        return True
+
     def plot_series(self, series_data, plot_title="", x_label="", y_label="",
                     time_series=False, show_legend=True, draw_now=True, clear_plot=True):
         """
@@ -180,7 +365,14 @@ class MatplotlibWidget(QWidget):
         """
         logger.debug(f"MatplotlibWidget.plot_series: Plotting {len(series_data)} series. Clear plot: {clear_plot}.")
 
+        signature = None
+        if self.persistent_artists and clear_plot and series_data:
+            signature = self._make_series_signature(series_data, plot_title, x_label, y_label, time_series, show_legend)
+            if signature == self._series_signature and self._update_persistent_series(series_data, time_series, draw_now):
+                return
+
         if clear_plot:
+            self._reset_persistent_artists()
             self.ax.clear()
             self._apply_matplotlib_theme_elements() 
         
@@ -208,6 +400,7 @@ class MatplotlibWidget(QWidget):
 
         plt.rcParams['axes.prop_cycle'] = plt.cycler(color=matplotlib_line_colors_hex)
 
+        new_lines = []
         for i, series in enumerate(series_data):
             x_data = series.get('x_data', [])
             y_data = series.get('y_data', [])
@@ -221,14 +414,14 @@ class MatplotlibWidget(QWidget):
                 plot_kwargs = {'label': label, 'color': specific_color_hex, 'linewidth': 2}
 
 
-            filtered_data = [(x, y) for x, y in zip(x_data, y_data) if y is not None]
-            if not filtered_data:
+            prepared = self._prepare_series_arrays(x_data, y_data, time_series)
+            if prepared is None:
                 logger.warning(f"MatplotlibWidget: No valid data points for series '{label}'. Skipping plot for this series.")
+                signature = None
                 continue
+            filtered_x_data, filtered_y_data = prepared
             
-            filtered_x_data, filtered_y_data = zip(*filtered_data) 
-            
-            self.ax.plot(filtered_x_data, filtered_y_data, **plot_kwargs)
+            new_lines.extend(self.ax.plot(filtered_x_data, filtered_y_data, **plot_kwargs))
 
             # Plot thresholds
             low_threshold = series.get('low_threshold')
@@ -269,6 +462,18 @@ class MatplotlibWidget(QWidget):
         
         self.figure.tight_layout() 
 
+        if signature is not None:
+            # The view is managed by _set_view_limits from now on, with headroom so
+            # the following updates can be blitted.
+            for line in new_lines:
+                line.set_animated(True)
+            self._line_artists = new_lines
+            self._threshold_values = [(series.get('low_threshold'), series.get('high_threshold')) for series in series_data]
+            self._series_signature = signature
+            x_min, x_max = self.ax.dataLim.intervalx
+            y_min, y_max = self.ax.dataLim.intervaly
+            self._set_view_limits(x_min, x_max, y_min, y_max)
+
         self.hide_status_message() 
         if draw_now:
             self.draw()
@@ -313,6 +518,7 @@ class MatplotlibWidget(QWidget):
     def clear_plot(self, message=""):
         """Clears the plot and optionally displays a message."""
         logger.debug(f"MatplotlibWidget.clear_plot: Clearing plot with message: '{message}'.")
+        self._reset_persistent_artists()
         self.ax.clear()
         
         self._apply_matplotlib_theme_elements() 
@@ -337,6 +543,8 @@ class MatplotlibWidget(QWidget):
         """
         logger.debug("MatplotlibWidget.update_theme_colors: Called with new theme colors.")
         self.theme_colors.update(new_theme_colors)
+        # Rebuild the figure (legend, threshold colors) on the next plot_series call.
+        self._series_signature = None
 
         for key, value in self.theme_colors.items():
             if isinstance(value, str) and value.startswith('#'): 
@@ -46,7 +46,11 @@ class NativeProgressBarWidget(QProgressBar):
         self.setFormat(formatted_text)
         self.setValue(display_value)
 
-        self.setProperty("alert_state", alert_state_prop)
+        # The QSS covers every alert state; re-polish only when the selected state changes.
+        if self.property("alert_state") != alert_state_prop:
+            self.setProperty("alert_state", alert_state_prop)
+            self.style().unpolish(self)
+            self.style().polish(self)
 
         self.update() # Force a repaint to ensure paintEvent is called
 
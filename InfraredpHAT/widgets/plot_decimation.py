@@ -0,0 +1,129 @@
+# widgets/plot_decimation.py
+# -*- coding: utf-8 -*-
+"""
+Vectorized decimation of plot series before they are handed to Matplotlib.
+
+Both methods return the indexes of the points to keep, in ascending order, so
+callers can apply them to x and y arrays alike. x must be sorted ascending.
+"""
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DECIMATION_NONE = "None"
+DECIMATION_MINMAX = "Min/Max Envelope"
+DECIMATION_LTTB = "LTTB"
+DECIMATION_METHODS = [DECIMATION_MINMAX, DECIMATION_LTTB, DECIMATION_NONE]
+
+
+def _first_index_per_bucket(bucket_ids, hits):
+    """
+    For sorted bucket ids, returns the first index in each bucket where hits is True.
+    """
+    candidates = np.flatnonzero(hits)
+    _, first = np.unique(bucket_ids[candidates], return_index=True)
+    return candidates[first]
+
+
+def minmax_envelope_indices(x, y, n_buckets):
+    """
+    Splits the x range into n_buckets equal-width buckets (one per device pixel)
+    and keeps the first, last, minimum and maximum point of each bucket.
+
+    Every extreme survives, so spikes and threshold crossings stay visible even
+    though at most four points per bucket are drawn.
+    """
+    n = len(x)
+    if n_buckets <= 0 or n <= 4 * n_buckets:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    span = x[-1] - x[0]
+    if span <= 0:
+        bucket_ids = (np.arange(n) * n_buckets) // n
+    else:
+        bucket_ids = np.minimum(((x - x[0]) / span * n_buckets).astype(np.int64), n_buckets - 1)
+
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket_ids)) + 1))
+    ends = np.concatenate((starts[1:], [n])) - 1
+    # Dense 0..k-1 ids so per-bucket extremes can be broadcast back to each point.
+    dense_ids = np.repeat(np.arange(len(starts)), np.diff(np.concatenate((starts, [n]))))
+
+    bucket_min = np.minimum.reduceat(y, starts)
+    bucket_max = np.maximum.reduceat(y, starts)
+    min_indices = _first_index_per_bucket(dense_ids, y == bucket_min[dense_ids])
+    max_indices = _first_index_per_bucket(dense_ids, y == bucket_max[dense_ids])
+
+    return np.unique(np.concatenate((starts, ends, min_indices, max_indices)))
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling to n_out points.
+
+    The classic algorithm anchors each triangle on the point picked in the previous
+    bucket, which forces a Python loop. This variant anchors on the previous
+    bucket's mean instead, so all buckets are evaluated in one vectorized pass.
+    The first and last points are always kept.
+    """
+    n = len(x)
+    if n_out < 3 or n <= n_out:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Interior points 1..n-2 are split into n_out-2 buckets of near-equal size.
+    n_buckets = n_out - 2
+    interior = np.arange(1, n - 1)
+    bucket_ids = ((interior - 1) * n_buckets) // (n - 2)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket_ids)) + 1))
+    counts = np.diff(np.concatenate((starts, [len(interior)])))
+
+    x_in, y_in = x[interior], y[interior]
+    mean_x = np.add.reduceat(x_in, starts) / counts
+    mean_y = np.add.reduceat(y_in, starts) / counts
+
+    # Anchors: previous bucket mean (first point for bucket 0) and next bucket
+    # mean (last point for the final bucket).
+    prev_x = np.concatenate(([x[0]], mean_x[:-1]))
+    prev_y = np.concatenate(([y[0]], mean_y[:-1]))
+    next_x = np.concatenate((mean_x[1:], [x[-1]]))
+    next_y = np.concatenate((mean_y[1:], [y[-1]]))
+
+    ax, ay = prev_x[bucket_ids], prev_y[bucket_ids]
+    cx, cy = next_x[bucket_ids], next_y[bucket_ids]
+    areas = np.abs((ax - cx) * (y_in - ay) - (ax - x_in) * (cy - ay))
+
+    bucket_max = np.maximum.reduceat(areas, starts)
+    picked = _first_index_per_bucket(bucket_ids, areas == bucket_max[bucket_ids])
+    return np.concatenate(([0], interior[picked], [n - 1]))
+
+
+def decimate(x, y, method, target_pixels):
+    """
+    Applies the named decimation method to a series.
+    :param x: Sorted x values as a NumPy array (numeric or datetime64).
+    :param y: y values as a NumPy float array, same length as x.
+    :param method: One of DECIMATION_METHODS.
+    :param target_pixels: Plot width in device pixels.
+    :return: (x, y) with the decimated points.
+    """
+    if method == DECIMATION_NONE or target_pixels <= 0:
+        return x, y
+
+    x_numeric = x.astype('datetime64[ms]').astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+    if method == DECIMATION_LTTB:
+        indices = lttb_indices(x_numeric, y, 2 * target_pixels)
+    elif method == DECIMATION_MINMAX:
+        indices = minmax_envelope_indices(x_numeric, y, target_pixels)
+    else:
+        logger.warning(f"Unknown plot decimation method '{method}'. Plotting all points.")
+        return x, y
+
+    if len(indices) < len(x):
+        logger.debug(f"Plot decimation ({method}): {len(x)} -> {len(indices)} points.")
+    return x[indices], y[indices]
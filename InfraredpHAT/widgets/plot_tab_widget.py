@@ -42,12 +42,19 @@ class PlotTabWidget(QWidget):
 
         self.polling_timer = QTimer(self)
         self.polling_timer.timeout.connect(self._request_plot_update)
+
+        # Set by the RenderScheduler. While paused the polling timer is stopped and
+        # skipped refreshes are remembered so the plot catches up once on resume.
+        self._rendering_active = True
+        self._plot_dirty = False
+        self._plotted_data_version = None
         
         self.setup_ui()
         self.setup_connections()
         self.populate_initial_view()
 
-        self.polling_timer.start(self.plot_update_interval_ms)
+        if self._rendering_active:
+            self.polling_timer.start(self.plot_update_interval_ms)
 
     def setup_ui(self):
         """Sets up the static UI layout."""
@@ -157,29 +164,33 @@ class PlotTabWidget(QWidget):
         unit = self.last_n_unit_label.text()
         return f"Last {value} {unit}"
         
-    def _prepare_series_from_history(self, history, metrics):
+    def _prepare_series(self, metrics, time_range_str):
         series_to_plot = []
+        target_points = self.plot_widget.get_target_point_count()
         for sensor_type, metric_type in metrics:
-            x_data = [dp.get('timestamp') for dp in history]
-            y_data = [dp['sensors'].get(sensor_type, {}).get(metric_type) for dp in history]
-            
-            valid_points = [(x, y) for x, y in zip(x_data, y_data) if x is not None and y is not None]
-            if not valid_points: continue
+            x_data, y_data = self.data_store.get_plot_series(sensor_type, metric_type, time_range=time_range_str,
+                                                             max_points=target_points)
+            if len(y_data) == 0: continue
 
-            x_filtered, y_filtered = zip(*valid_points)
             unit = self.settings_manager.get_unit(sensor_type, metric_type) or ""
             low_threshold = self.settings_manager.get_threshold(sensor_type, metric_type, 'warning_low_value')
             high_threshold = self.settings_manager.get_threshold(sensor_type, metric_type, 'critical_high_value')
 
             series_to_plot.append({
                 'label': f"{sensor_type} {metric_type.capitalize()} ({unit})".strip(),
-                'x_data': list(x_filtered), 'y_data': list(y_filtered),
+                'x_data': x_data, 'y_data': y_data,
                 'low_threshold': low_threshold, 'high_threshold': high_threshold
             })
         return series_to_plot
 
     @pyqtSlot()
     def _execute_plot_update(self):
+        if not self._rendering_active:
+            self._plot_dirty = True
+            return
+        self._plot_dirty = False
+        self._plotted_data_version = self.data_store.data_version
+
         selected_metrics = self._get_selected_metrics()
         if not selected_metrics:
             self.plot_widget.clear_plot("No sensors selected.")
@@ -190,12 +201,7 @@ class PlotTabWidget(QWidget):
             self.plot_widget.clear_plot("Time range mode not supported.")
             return
         
-        history = self.data_store.get_data_history(time_range=time_range_str)
-        if not history:
-            self.plot_widget.clear_plot("No data available for this time range.")
-            return
-            
-        series_to_plot = self._prepare_series_from_history(history, selected_metrics)
+        series_to_plot = self._prepare_series(selected_metrics, time_range_str)
         if not series_to_plot:
             self.plot_widget.clear_plot("No valid data points for this selection.")
             return
@@ -217,4 +223,26 @@ class PlotTabWidget(QWidget):
         self.plot_update_interval_ms = int(interval_ms)
         if self.polling_timer.isActive():
             self.polling_timer.stop()
-        self.polling_timer.start(self.plot_update_interval_ms)
\ No newline at end of file
+        if self._rendering_active:
+            self.polling_timer.start(self.plot_update_interval_ms)
+
+    def set_rendering_active(self, active):
+        """
+        Starts or pauses plot polling. Called by the RenderScheduler when the tab is
+        shown or hidden. On resume the plot is redrawn once if new data arrived or
+        a refresh was skipped while paused.
+        """
+        if active == self._rendering_active:
+            return
+        self._rendering_active = active
+        logger.debug(f"PlotTabWidget: Rendering {'resumed' if active else 'paused'}.")
+        if not active:
+            self.polling_timer.stop()
+            if self.plot_update_debounce_timer.isActive():
+                self.plot_update_debounce_timer.stop()
+                self._plot_dirty = True
+            return
+
+        self.polling_timer.start(self.plot_update_interval_ms)
+        if self._plot_dirty or self._plotted_data_version != self.data_store.data_version:
+            self._request_plot_update()
\ No newline at end of file
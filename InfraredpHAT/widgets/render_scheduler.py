@@ -0,0 +1,114 @@
+# widgets/render_scheduler.py
+# -*- coding: utf-8 -*-
+import logging
+
+from PyQt5.QtCore import QObject, QEvent, Qt, pyqtSlot
+from PyQt5.QtGui import QGuiApplication
+
+logger = logging.getLogger(__name__)
+
+
+class RenderScheduler(QObject):
+    """
+    Decides which tab of a QTabWidget is allowed to render.
+
+    Only the current tab is active. Every tab is paused while the main window is
+    hidden, minimized or not exposed (which is how a blanked or powered-down
+    screen is reported by the platform), or while the application is hidden or
+    suspended. Tabs opt in by implementing set_rendering_active(active); they
+    are expected to stop their timers while paused, remember that they are
+    dirty, and catch up once when they are resumed.
+    """
+    def __init__(self, tab_widget, window=None, parent=None):
+        """
+        Initializes the scheduler.
+        :param tab_widget: The QTabWidget whose tabs are scheduled.
+        :param window: Top-level window whose visibility gates all rendering. May
+                       be attached later with attach_window().
+        """
+        super().__init__(parent)
+        self.tab_widget = tab_widget
+        self._window = None
+        self._window_handle = None
+        # Without a window to watch, rendering is only gated by the application state.
+        self._window_visible = True
+        self._window_exposed = True
+        self._application_active = True
+        self._rendering_allowed = None
+
+        self.tab_widget.currentChanged.connect(self._on_current_tab_changed)
+        app = QGuiApplication.instance()
+        if app is not None:
+            app.applicationStateChanged.connect(self._on_application_state_changed)
+
+        if window is not None:
+            self.attach_window(window)
+        else:
+            self.apply()
+
+    def attach_window(self, window):
+        """Watches a top-level window for show, hide, minimize and expose changes."""
+        if self._window is not None:
+            self._window.removeEventFilter(self)
+        self._window = window
+        self._window.installEventFilter(self)
+        self._attach_window_handle()
+        self._window_visible = window.isVisible() and not window.isMinimized()
+        self.apply()
+
+    def _attach_window_handle(self):
+        # The QWindow behind a QWidget only exists once the widget has been shown,
+        # and expose events are delivered to it rather than to the widget.
+        handle = self._window.windowHandle() if self._window is not None else None
+        if handle is None or handle is self._window_handle:
+            return
+        if self._window_handle is not None:
+            self._window_handle.removeEventFilter(self)
+        self._window_handle = handle
+        self._window_handle.installEventFilter(self)
+        self._window_exposed = handle.isExposed() or not self._window.isVisible()
+
+    @property
+    def rendering_allowed(self):
+        """True while the window is on screen and the application is not hidden."""
+        return self._window_visible and self._window_exposed and self._application_active
+
+    def eventFilter(self, obj, event):
+        if obj is self._window:
+            if event.type() in (QEvent.Show, QEvent.Hide, QEvent.WindowStateChange):
+                if event.type() == QEvent.Show:
+                    self._attach_window_handle()
+                self._window_visible = self._window.isVisible() and not self._window.isMinimized()
+                self.apply()
+        elif obj is self._window_handle and event.type() == QEvent.Expose:
+            self._window_exposed = self._window_handle.isExposed()
+            self.apply()
+        return False
+
+    @pyqtSlot(int)
+    def _on_current_tab_changed(self, index):
+        self.apply(force=True)
+
+    @pyqtSlot(Qt.ApplicationState)
+    def _on_application_state_changed(self, state):
+        self._application_active = state not in (Qt.ApplicationHidden, Qt.ApplicationSuspended)
+        self.apply()
+
+    def apply(self, force=False):
+        """
+        Pushes the current active/paused state to every tab.
+        :param force: Re-apply even if the window state has not changed, e.g. after
+                      the current tab changed.
+        """
+        allowed = self.rendering_allowed
+        if not force and allowed == self._rendering_allowed:
+            return
+        if allowed != self._rendering_allowed:
+            logger.info(f"RenderScheduler: Rendering {'resumed' if allowed else 'paused'}.")
+        self._rendering_allowed = allowed
+
+        current_index = self.tab_widget.currentIndex()
+        for index in range(self.tab_widget.count()):
+            tab = self.tab_widget.widget(index)
+            if hasattr(tab, 'set_rendering_active'):
+                tab.set_rendering_active(allowed and index == current_index)
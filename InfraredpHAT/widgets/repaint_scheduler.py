@@ -0,0 +1,89 @@
+# widgets/repaint_scheduler.py
+# -*- coding: utf-8 -*-
+import logging
+import math
+import time
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSlot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_FPS = 15
+
+
+class RepaintScheduler(QObject):
+    """
+    Coalesces gauge repaints and restyles into frame ticks.
+
+    Widgets call request_repaint() instead of update(), and request_restyle()
+    instead of re-applying a stylesheet right away. Requests made before the
+    next tick are merged, so a snapshot updating every gauge costs one tick,
+    and ticks are at least 1 / max_fps apart. The first request after an idle
+    period is served on the next event loop iteration.
+    """
+    def __init__(self, max_fps=DEFAULT_MAX_FPS, parent=None):
+        super().__init__(parent)
+        self.set_max_fps(max_fps)
+        # Dicts rather than sets, to serve requests in order. widget -> None / restyle callable
+        self._repaints = {}
+        self._restyles = {}
+        self._last_tick = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+
+    @property
+    def max_fps(self):
+        return 1.0 / self._min_interval_s
+
+    def set_max_fps(self, max_fps):
+        """Caps the tick rate. Values below 1 are treated as 1."""
+        self._min_interval_s = 1.0 / max(1, max_fps)
+        logger.debug(f"RepaintScheduler: Max frame rate set to {self.max_fps:g} FPS.")
+
+    def request_repaint(self, widget):
+        """Calls widget.update() on the next tick."""
+        self._repaints[widget] = None
+        self._schedule()
+
+    def request_restyle(self, widget, restyle):
+        """Calls restyle() on the next tick. A later request for the same widget replaces an earlier one."""
+        self._restyles[widget] = restyle
+        self._schedule()
+
+    def _schedule(self):
+        if self._timer.isActive():
+            return
+        delay_s = 0.0
+        if self._last_tick is not None:
+            delay_s = max(0.0, self._last_tick + self._min_interval_s - time.monotonic())
+        self._timer.start(int(math.ceil(delay_s * 1000)))
+
+    @pyqtSlot()
+    def _tick(self):
+        self._last_tick = time.monotonic()
+        restyles, self._restyles = self._restyles, {}
+        repaints, self._repaints = self._repaints, {}
+        # Widgets deleted since their request raise RuntimeError and are skipped.
+        for restyle in restyles.values():
+            try:
+                restyle()
+            except RuntimeError:
+                pass
+        for widget in repaints:
+            try:
+                widget.update()
+            except RuntimeError:
+                pass
+
+
+_scheduler = None
+
+
+def repaint_scheduler():
+    """The process-wide RepaintScheduler, created on first use. GUI thread only."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = RepaintScheduler()
+    return _scheduler
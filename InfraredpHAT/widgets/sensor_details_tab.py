@@ -52,6 +52,13 @@ class SensorDetailsTab(QWidget):
         self.plot_time_range_combo = None
         self.plot_metric_type_combo = None
         self.plot_widget_right = None
+        self.plot_update_timer = None
+
+        # Set by the RenderScheduler. While paused the plot timer is stopped and
+        # skipped refreshes are remembered so the plot catches up once on resume.
+        self._rendering_active = True
+        self._plot_dirty = False
+        self._plotted_data_version = None
 
         self.setup_ui()
         self.setup_connections()
@@ -68,7 +75,8 @@ class SensorDetailsTab(QWidget):
         
         self.plot_update_timer = QTimer(self)
         self.plot_update_timer.timeout.connect(self.update_all_plots)
-        self.plot_update_timer.start(self.plot_update_interval_ms)
+        if self._rendering_active:
+            self.plot_update_timer.start(self.plot_update_interval_ms)
         logger.info("SensorDetailsTab initialized and timer started.")
 
     def setup_ui(self):
@@ -294,8 +302,13 @@ class SensorDetailsTab(QWidget):
     @pyqtSlot()
     def update_all_plots(self):
         """Fetches data and updates the plot for the current selections."""
+        if not self._rendering_active:
+            self._plot_dirty = True
+            return
         if not self.current_selected_sensor_type or not self.plot_widget_right:
             return
+        self._plot_dirty = False
+        self._plotted_data_version = self.data_store.data_version
 
         selected_display_name = self.plot_metric_type_combo.currentText()
         metrics_to_plot = self.plot_metric_display_to_actual_map.get(selected_display_name, [])
@@ -304,27 +317,20 @@ class SensorDetailsTab(QWidget):
             return
 
         time_range = self.plot_time_range_combo.currentText()
-        history = self.data_store.get_data_history(time_range=time_range)
+        target_points = self.plot_widget_right.get_target_point_count()
 
         series_to_plot = []
-        if not history:
-            self.plot_widget_right.clear_plot("No data available for this time range.")
-            return
-
         for metric_type in metrics_to_plot:
-            x_data = [dp.get('timestamp') for dp in history]
-            y_data = [dp['sensors'].get(self.current_selected_sensor_type, {}).get(metric_type) for dp in history]
-            valid_points = [(x, y) for x, y in zip(x_data, y_data) if x is not None and y is not None]
-            
-            if valid_points:
-                x_filtered, y_filtered = zip(*valid_points)
+            x_data, y_data = self.data_store.get_plot_series(self.current_selected_sensor_type, metric_type,
+                                                             time_range=time_range, max_points=target_points)
+            if len(y_data):
                 unit = self.settings_manager.get_unit(self.current_selected_sensor_type, metric_type) or ""
                 low_threshold = self.settings_manager.get_threshold(self.current_selected_sensor_type, metric_type, 'warning_low_value')
                 high_threshold = self.settings_manager.get_threshold(self.current_selected_sensor_type, metric_type, 'critical_high_value')
 
                 series_to_plot.append({
                     'label': f"{metric_type.capitalize()} ({unit})".strip(),
-                    'x_data': list(x_filtered), 'y_data': list(y_filtered),
+                    'x_data': x_data, 'y_data': y_data,
                     'low_threshold': low_threshold, 'high_threshold': high_threshold
                 })
 
@@ -354,9 +360,32 @@ class SensorDetailsTab(QWidget):
         """Sets the update interval for the plot timer."""
         logger.info(f"Setting plot update interval to {interval_ms} ms.")
         self.plot_update_interval_ms = int(interval_ms)
-        if self.plot_update_timer and self.plot_update_timer.isActive():
+        if self.plot_update_timer is None:
+            return
+        if self.plot_update_timer.isActive():
+            self.plot_update_timer.stop()
+        if self._rendering_active:
+            self.plot_update_timer.start(self.plot_update_interval_ms)
+
+    def set_rendering_active(self, active):
+        """
+        Starts or pauses plot rendering. Called by the RenderScheduler when the tab
+        is shown or hidden. On resume the plot is redrawn once if new data arrived
+        or a refresh was skipped while paused.
+        """
+        if active == self._rendering_active:
+            return
+        self._rendering_active = active
+        logger.debug(f"SensorDetailsTab: Rendering {'resumed' if active else 'paused'}.")
+        if self.plot_update_timer is None:
+            return
+        if not active:
             self.plot_update_timer.stop()
+            return
+
         self.plot_update_timer.start(self.plot_update_interval_ms)
+        if self._plot_dirty or self._plotted_data_version != self.data_store.data_version:
+            self.update_all_plots()
 
     @pyqtSlot(str, str, object)
     def _on_settings_updated(self, section, key, value):
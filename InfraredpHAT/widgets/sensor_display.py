@@ -8,6 +8,7 @@ import logging
 import math
 import re
 import os
+from types import MappingProxyType
 
 # Import your existing SettingsManager
 from data_management.settings import SettingsManager 
@@ -32,6 +33,7 @@ from .gauges.speedometer_gauge_drawer import SpeedometerGaugeDrawer
 from .gauges.combined_arc_needle_gauge_drawer import CombinedArcNeedleGaugeDrawer
 from .gauges.speedometer_ticked_gauge_drawer import SpeedometerTickedGaugeDrawer
 from .gauges.ring_gauge_drawer import RingGaugeDrawer
+from .repaint_scheduler import repaint_scheduler
 
 
 
@@ -125,6 +127,11 @@ class SensorDisplayWidget(QGroupBox):
         # --- SNIPPET END ---
     }
 
+    # Resolved gauge colors, shared by all widgets:
+    # (theme key, gauge type, gauge style, alert state) -> read-only colors, see _theme_key().
+    # Entries of other theme keys are dropped when a new combination is resolved.
+    _palette_cache = {}
+
     def __init__(self, sensor_name, sensor_category, metric_type,
                  gauge_type="Standard", gauge_style="Full",
                  min_value=0.0, max_value=100.0,
@@ -156,8 +163,12 @@ class SensorDisplayWidget(QGroupBox):
         self._precision = precision
         self._alert_state = "normal" 
         self._na_state = False 
+        # (formatted value, alert state) last requested for painting, see update_value().
+        self._displayed_key = None
+        self._progress_bar_qss = None
 
         self.theme_colors = {} 
+        self._theme_colors_are_fallback = False
         
         self.thresholds = dict(thresholds) if thresholds is not None else {'low_threshold': None, 'high_threshold': None} 
         logger.debug(f"SensorDisplayWidget '{self.objectName()}' initialized with thresholds: {self.thresholds}")
@@ -273,11 +284,50 @@ class SensorDisplayWidget(QGroupBox):
 
 # In file: sensor_display.py
 
-    def _get_current_gauge_colors(self):
+    def _get_current_gauge_colors(self, alert_state=None):
+        """
+        Returns the colors to draw the gauge with for the current theme, gauge
+        type, gauge style and alert state (or the given alert_state), as a
+        read-only mapping. Resolved once per combination and shared between
+        widgets, until update_theme_colors() switches to another theme.
+        """
+        if alert_state is None:
+            alert_state = self._alert_state
+        theme_key = self._theme_key()
+        key = (theme_key, self._gauge_type, self._gauge_style, alert_state)
+        colors = SensorDisplayWidget._palette_cache.get(key)
+        if colors is not None:
+            return colors
+        colors = MappingProxyType(self._resolve_gauge_colors(alert_state))
+        # Drop colors resolved from any other theme, or an older version of this one.
+        SensorDisplayWidget._palette_cache = {k: v for k, v in SensorDisplayWidget._palette_cache.items()
+                                              if k[0] == theme_key}
+        SensorDisplayWidget._palette_cache[key] = colors
+        return colors
+
+    def _theme_key(self):
+        """
+        Identifies the theme colors in use: the SettingsManager's theme version,
+        which changes whenever its colors are loaded or changed, or 'fallback'
+        for the built-in fallback colors.
+        """
+        if self._theme_colors_are_fallback:
+            return 'fallback'
+        settings_manager = self.main_window.settings_manager
+        if settings_manager.get_theme_colors() is not self.theme_colors:
+            # A new theme was loaded and update_theme_colors() has not run yet;
+            # keep these colors out of the new theme's entries.
+            return ('pending', id(self.theme_colors))
+        return settings_manager.theme_version()
+
+    def _resolve_gauge_colors(self, alert_state=None):
         """
         Determines the set of colors to use for drawing the gauge based on the
-        current theme and the sensor's alert state.
+        current theme and the sensor's alert state (or the given alert_state).
         """
+        if alert_state is None:
+            alert_state = self._alert_state
+
         # 1. Define base colors for the 'normal' state
         base_bg = self._get_themed_color('gauge_background_normal', QColor('#F0F8FF'))
         base_border = self._get_themed_string_property('gauge_border_normal', '1px solid #87CEFA')
@@ -289,7 +339,7 @@ class SensorDisplayWidget(QGroupBox):
         base_label = self._get_themed_color('analog_gauge_label_color', QColor('#2C3E50'))
 
         # 2. Conditionally override colors based on the specific alert state
-        if self._alert_state == 'critical':
+        if alert_state == 'critical':
             base_bg = self._get_themed_color('gauge_background_alert', QColor('#FFDCDC'))
             base_border = self._get_themed_string_property('gauge_border_alert', '1px solid #FF6666')
             base_fill = self._get_themed_color('gauge_critical_color', QColor('#CC0000'))
@@ -298,7 +348,7 @@ class SensorDisplayWidget(QGroupBox):
             base_needle = self._get_themed_color('analog_gauge_needle_alert_color', QColor('#FF4500'))
             base_center_dot = self._get_themed_color('analog_gauge_center_dot_alert_color', QColor('#CC0000'))
             base_label = self._get_themed_color('analog_gauge_text_alert_color', QColor('#FFFFFF'))
-        elif self._alert_state == 'warning':
+        elif alert_state == 'warning':
             base_bg = self._get_themed_color('gauge_background_alert', QColor('#FFF3CD'))
             base_border = self._get_themed_string_property('gauge_border_alert', '1px solid #FFC107')
             base_fill = self._get_themed_color('gauge_warning_color', QColor('#FFD700'))
@@ -406,7 +456,7 @@ class SensorDisplayWidget(QGroupBox):
             colors['gauge_border_color'] = self._get_themed_color(f"{prefix}border_color", colors['gauge_border_color'])
 
             # ...and then applies the alert colors if needed.
-            if self._alert_state != "normal":
+            if alert_state != "normal":
                 colors['background'] = self._get_themed_color(f"{prefix}background_alert", colors['background'])
                 colors['border'] = self._get_themed_string_property(f"{prefix}border_alert", colors['border'])
                 colors['fill_color'] = self._get_themed_color(f"{prefix}fill_alert", colors['fill_color'])
@@ -419,7 +469,7 @@ class SensorDisplayWidget(QGroupBox):
                 colors['gauge_border_style'] = self._get_themed_string_property(f"{prefix}border_alert_style", colors['gauge_border_style'])
                 colors['gauge_border_color'] = self._get_themed_color(f"{prefix}border_alert_color", colors['gauge_border_color'])
 
-        logger.debug(f"SensorDisplayWidget: Resolved colors for {self.objectName()} (Alert: {self._alert_state}): {dict(list(colors.items())[:5])}...")
+        logger.debug(f"SensorDisplayWidget: Resolved colors for {self.objectName()} (Alert: {alert_state}): {dict(list(colors.items())[:5])}...")
         return colors    
 
     def paintEvent(self, event):
@@ -437,7 +487,9 @@ class SensorDisplayWidget(QGroupBox):
         painter.setRenderHint(QPainter.SmoothPixmapTransform)
 
         rect = self.contentsRect()
-        logger.debug(f"SensorDisplayWidget: paintEvent triggered for {self.objectName()}. Current _value: {self._current_value}, Type: {self._gauge_type}, Style: {self._gauge_style}. Rect: {rect.x()},{rect.y()},{rect.width()},{rect.height()}")
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            logger.debug(f"SensorDisplayWidget: paintEvent triggered for {self.objectName()}. Current _value: {self._current_value}, Type: {self._gauge_type}, Style: {self._gauge_style}. Rect: {rect.x()},{rect.y()},{rect.width()},{rect.height()}")
 
         # --- DEBUG STEP: Draw a simple red rectangle directly in paintEvent ---
         # This will test if the QPainter is fundamentally able to draw anything in this context.
@@ -451,12 +503,13 @@ class SensorDisplayWidget(QGroupBox):
 
         colors = self._get_current_gauge_colors()
         
-        logger.debug(f"SensorDisplayWidget: paintEvent for {self.objectName()} - Colors prepared for drawer: "
-                     f"alert_state={self._alert_state}, "
-                     f"text_color={colors['text_color'].name()}, "
-                     f"fill_color={colors['fill_color'].name()}, "
-                     f"gauge_warning_color={colors['warning_color'].name()}, "
-                     f"gauge_critical_color={colors['critical_color'].name()}")
+        if debug_enabled:
+            logger.debug(f"SensorDisplayWidget: paintEvent for {self.objectName()} - Colors prepared for drawer: "
+                         f"alert_state={self._alert_state}, "
+                         f"text_color={colors['text_color'].name()}, "
+                         f"fill_color={colors['fill_color'].name()}, "
+                         f"gauge_warning_color={colors['warning_color'].name()}, "
+                         f"gauge_critical_color={colors['critical_color'].name()}")
 
         if self.gauge_drawer:
             try:
@@ -503,7 +556,7 @@ class SensorDisplayWidget(QGroupBox):
     @current_value_animated.setter
     def current_value_animated(self, value):
         self._current_value_animated = value
-        self.update() 
+        repaint_scheduler().request_repaint(self)
 
     @pyqtSlot(object) 
     def update_value(self, raw_value):
@@ -547,15 +600,14 @@ class SensorDisplayWidget(QGroupBox):
         # --- 4. Handle native progress bar updates (if applicable) ---
         is_native_progressbar_type = "Progress Bar -" in self._gauge_type and "Custom" not in self._gauge_type
         if is_native_progressbar_type:
+            # The stylesheet covers every alert state; only the alert_state property changes here.
             if not self._na_state:
                 display_value = int(max(self._min_value, min(self._max_value, self._current_value)))
                 self.progressBar.setValue(display_value)
-                self.progressBar.setProperty("alert_state", self._alert_state)
+                self._set_progress_bar_alert_state(self._alert_state)
             else:
                 self.progressBar.setValue(0)
-                self.progressBar.setProperty("alert_state", "normal")
-            self.progressBar.setStyleSheet(self._get_progress_bar_qss())
-            self.progressBar.style().polish(self.progressBar)
+                self._set_progress_bar_alert_state("normal")
 
         # --- 5. Emit alert signals if state changed ---
         if old_alert_state != self._alert_state:
@@ -566,7 +618,12 @@ class SensorDisplayWidget(QGroupBox):
                 self._clear_alert()
 
         # --- 6. Request a repaint for all custom-drawn gauges ---
-        self.update()    
+        # Repaints are coalesced by the repaint scheduler, and skipped while the
+        # value shows the same at the configured precision.
+        displayed_key = (self._format_value(self._current_value), self._alert_state)
+        if displayed_key != self._displayed_key:
+            self._displayed_key = displayed_key
+            repaint_scheduler().request_repaint(self)
     
     #def _check_and_set_alert_state(self, value):
     #    """Evaluates the alert state based on current value and thresholds."""
@@ -806,8 +863,7 @@ class SensorDisplayWidget(QGroupBox):
         if is_native_progressbar_type:
             self.value_label.setVisible(False) 
             self.progressBar.setVisible(True)   
-            self.progressBar.setStyleSheet(self._get_progress_bar_qss())
-            self.progressBar.style().polish(self.progressBar)
+            self._apply_progress_bar_qss()
             if self._gauge_type == "Progress Bar - Vertical":
                 self.progressBar.setOrientation(Qt.Vertical)
                 self.progressBar.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Expanding)
@@ -835,10 +891,32 @@ class SensorDisplayWidget(QGroupBox):
             
         self.update() 
     
+    def _set_progress_bar_alert_state(self, alert_state):
+        """Sets the progress bar's alert_state property, re-polishing it only if the state changed."""
+        if self.progressBar.property("alert_state") == alert_state:
+            return
+        self.progressBar.setProperty("alert_state", alert_state)
+        # Qt re-evaluates property selectors on polish; the stylesheet itself is not re-parsed.
+        self.progressBar.style().unpolish(self.progressBar)
+        self.progressBar.style().polish(self.progressBar)
+
+    def _apply_progress_bar_qss(self):
+        """Regenerates the progress bar stylesheet and re-applies it if it changed."""
+        qss = self._get_progress_bar_qss()
+        if qss == self._progress_bar_qss:
+            return
+        self._progress_bar_qss = qss
+        self.progressBar.setStyleSheet(qss)
+        self.progressBar.style().polish(self.progressBar)
+
     def _get_progress_bar_qss(self):
-        """Generates dynamic QSS for the QProgressBar based on theme colors and orientation."""
+        """
+        Generates QSS for the QProgressBar based on theme colors and orientation.
+        Rules for every alert state are included and selected by the progress
+        bar's alert_state property, so the stylesheet does not change with it.
+        """
         logger.debug(f"  _get_progress_bar_qss for type: {self._gauge_type}")
-        colors = self._get_current_gauge_colors()
+        colors = self._get_current_gauge_colors("normal")
         
         bg_color = colors['background'].name() if isinstance(colors['background'], QColor) else colors['background']
         chunk_color = colors['fill_color'].name() if isinstance(colors['fill_color'], QColor) else colors['fill_color']
@@ -888,8 +966,7 @@ class SensorDisplayWidget(QGroupBox):
             """
 
         # Alert states (apply to both horizontal and vertical)
-        if self._alert_state == "warning":
-            qss += f"""
+        qss += f"""
             QProgressBar[alert_state="warning"] {{
                 background-color: {alert_bg_color};
                 border-color: {self._get_themed_color('gauge_warning_color', QColor('#FFD700')).name()};
@@ -898,9 +975,6 @@ class SensorDisplayWidget(QGroupBox):
             QProgressBar::chunk[alert_state="warning"] {{
                 background-color: {self._get_themed_color('gauge_warning_color', QColor('#FFD700')).name()};
             }}
-            """
-        elif self._alert_state == "critical":
-            qss += f"""
             QProgressBar[alert_state="critical"] {{
                 background-color: {alert_bg_color};
                 border-color: {alert_border_color_qcolor.name()};
@@ -941,8 +1015,7 @@ class SensorDisplayWidget(QGroupBox):
          )
          self.progressBar.setGeometry(adjusted_rect)
          
-         self.progressBar.setStyleSheet(self._get_progress_bar_qss()) 
-         self.progressBar.style().polish(self.progressBar)
+         repaint_scheduler().request_restyle(self, self._apply_progress_bar_qss)
 
         self.update() 
 
@@ -951,6 +1024,7 @@ class SensorDisplayWidget(QGroupBox):
         logger.info(f"SensorDisplayWidget: '{self.title()}' updating theme colors.")
         
         self.theme_colors = self.main_window.settings_manager.get_theme_colors() 
+        self._theme_colors_are_fallback = not self.theme_colors
         
         if not self.theme_colors:
             logger.warning("SensorDisplayWidget: Theme colors are empty after update. Widget may not display correctly.")
@@ -965,8 +1039,7 @@ class SensorDisplayWidget(QGroupBox):
         self.value_label.style().polish(self.value_label)
         
         if self.progressBar and self.progressBar.isVisible():
-             self.progressBar.setStyleSheet(self._get_progress_bar_qss())
-             self.progressBar.style().polish(self.progressBar)
+             repaint_scheduler().request_restyle(self, self._apply_progress_bar_qss)
 
         self.update() 
         logger.debug(f"SensorDisplayWidget: '{self.title()}' theme colors updated and repainted.")
@@ -11,6 +11,10 @@ import re
 
 from data_management.settings import SettingsManager
 from widgets.sensor_display import SensorDisplayWidget
+from widgets.repaint_scheduler import DEFAULT_MAX_FPS
+from sensors.bh1750_sensor import BH1750_MODES, BH1750_MTREG_DEFAULT, BH1750_MTREG_MIN, BH1750_MTREG_MAX
+from sensors.htu21d_sensor import RESOLUTIONS as HTU21D_RESOLUTIONS
+from sensors.bmp180_sensor import PRESSURE_CONVERSION_TIME_S as BMP180_PRESSURE_CONVERSION_TIME_S
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +73,12 @@ class SettingsTab(QWidget):
         self.populate_general_settings_section(general_form_layout)
         content_layout.addWidget(general_settings_group)
 
+        sensor_hardware_group = QGroupBox("Sensor Hardware")
+        sensor_hardware_group.setObjectName("SensorHardwareGroup")
+        sensor_hardware_form_layout = QFormLayout(sensor_hardware_group)
+        self.populate_sensor_hardware_section(sensor_hardware_form_layout)
+        content_layout.addWidget(sensor_hardware_group)
+
         sensor_config_group = QGroupBox("Sensor Presence & Precision")
         sensor_config_group.setObjectName("SensorConfigGroup")
         self.sensor_config_layout = QVBoxLayout(sensor_config_group)
@@ -116,6 +126,12 @@ class SettingsTab(QWidget):
         self.data_store_max_points_edit = QLineEdit()
         self.data_store_max_points_edit.setValidator(QIntValidator()) 
         layout.addRow("Data Store Max Points:", self.data_store_max_points_edit)
+
+        self.gauge_max_fps_edit = QLineEdit()
+        self.gauge_max_fps_edit.setValidator(QIntValidator(1, 60))
+        self.gauge_max_fps_edit.setToolTip("Upper bound for gauge repaints per second. Value updates arriving "
+                                           "faster are combined into one repaint.")
+        layout.addRow("Gauge Max Frame Rate (FPS):", self.gauge_max_fps_edit)
         
         self.alert_sound_checkbox = QCheckBox("Enable Alert Sound")
         layout.addRow(self.alert_sound_checkbox)
@@ -123,6 +139,44 @@ class SettingsTab(QWidget):
         self.data_log_enabled_checkbox = QCheckBox("Enable Sensor Data Logging to File")
         layout.addRow(self.data_log_enabled_checkbox)
 
+        self.data_log_binary_checkbox = QCheckBox("Also Write Compact Binary Data Log")
+        layout.addRow(self.data_log_binary_checkbox)
+
+    def populate_sensor_hardware_section(self, layout):
+        self.bh1750_mode_combo = QComboBox()
+        for mode in BH1750_MODES:
+            self.bh1750_mode_combo.addItem(mode.replace('_', ' ').title().replace('Res2', 'Res 2'), mode)
+        layout.addRow("BH1750 Measurement Mode:", self.bh1750_mode_combo)
+
+        self.bh1750_mtreg_edit = QLineEdit()
+        self.bh1750_mtreg_edit.setValidator(QIntValidator(BH1750_MTREG_MIN, BH1750_MTREG_MAX))
+        self.bh1750_mtreg_edit.setToolTip(f"Measurement time register ({BH1750_MTREG_MIN}-{BH1750_MTREG_MAX}, default {BH1750_MTREG_DEFAULT}). "
+                                          "Higher values increase sensitivity and conversion time.")
+        layout.addRow("BH1750 Measurement Time (MTreg):", self.bh1750_mtreg_edit)
+
+        self.htu21d_resolution_combo = QComboBox()
+        for resolution in HTU21D_RESOLUTIONS:
+            humidity_bits, temperature_bits = resolution.split('_')
+            self.htu21d_resolution_combo.addItem(f"Humidity {humidity_bits[2:]} bit, Temperature {temperature_bits[1:]} bit", resolution)
+        layout.addRow("HTU21D Resolution:", self.htu21d_resolution_combo)
+
+        self.bmp180_oversampling_combo = QComboBox()
+        for oversampling, mode in enumerate(["Ultra Low Power", "Standard", "High Resolution", "Ultra High Resolution"]):
+            conversion_ms = BMP180_PRESSURE_CONVERSION_TIME_S[oversampling] * 1000
+            self.bmp180_oversampling_combo.addItem(f"{mode} ({1 << oversampling} samples, {conversion_ms:.0f} ms)", oversampling)
+        layout.addRow("BMP180 Pressure Oversampling:", self.bmp180_oversampling_combo)
+
+        self.bmp180_temperature_every_edit = QLineEdit()
+        self.bmp180_temperature_every_edit.setValidator(QIntValidator(1, 1000))
+        self.bmp180_temperature_every_edit.setToolTip("Measure temperature with every Nth pressure reading and reuse it in between. "
+                                                      "Temperature is measured more often while it is changing.")
+        layout.addRow("BMP180 Temperature Every N Readings:", self.bmp180_temperature_every_edit)
+
+        self.bmp180_pipeline_checkbox = QCheckBox("Pipeline BMP180 Pressure Conversions")
+        self.bmp180_pipeline_checkbox.setToolTip("Start the next pressure conversion right after each reading. "
+                                                 "Readings return without waiting, but each is one sampling interval old.")
+        layout.addRow(self.bmp180_pipeline_checkbox)
+
     def _clear_layout(self, layout):
         if layout is not None:
             while layout.count():
@@ -287,7 +341,15 @@ class SettingsTab(QWidget):
         self.sampling_rate_edit.editingFinished.connect(lambda: self._on_int_setting_changed('General', 'sampling_rate_ms', self.sampling_rate_edit))
         self.alert_sound_checkbox.toggled.connect(self._on_alert_sound_changed)
         self.data_log_enabled_checkbox.toggled.connect(self._on_data_log_enabled_changed)
+        self.data_log_binary_checkbox.toggled.connect(self._on_data_log_binary_changed)
         self.data_store_max_points_edit.editingFinished.connect(lambda: self._on_int_setting_changed('General', 'data_store_max_points', self.data_store_max_points_edit))
+        self.gauge_max_fps_edit.editingFinished.connect(lambda: self._on_int_setting_changed('UI', 'gauge_max_fps', self.gauge_max_fps_edit))
+        self.bh1750_mode_combo.currentIndexChanged.connect(self._on_bh1750_mode_changed)
+        self.htu21d_resolution_combo.currentIndexChanged.connect(self._on_htu21d_resolution_changed)
+        self.bh1750_mtreg_edit.editingFinished.connect(lambda: self._on_int_setting_changed('Sensor_Hardware', 'bh1750_mtreg', self.bh1750_mtreg_edit))
+        self.bmp180_oversampling_combo.currentIndexChanged.connect(self._on_bmp180_oversampling_changed)
+        self.bmp180_temperature_every_edit.editingFinished.connect(lambda: self._on_int_setting_changed('Sensor_Hardware', 'bmp180_temperature_every', self.bmp180_temperature_every_edit))
+        self.bmp180_pipeline_checkbox.toggled.connect(self._on_bmp180_pipeline_changed)
         
         # This connection is fine, it connects to the method defined below.
         self.settings_manager.settings_updated.connect(self._on_settings_updated) 
@@ -306,8 +368,26 @@ class SettingsTab(QWidget):
         self.mock_mode_checkbox.setChecked(self.settings_manager.get_boolean_setting('General', 'mock_mode', fallback=False))
         self.sampling_rate_edit.setText(str(self.settings_manager.get_int_setting('General', 'sampling_rate_ms', fallback=3000)))
         self.data_store_max_points_edit.setText(str(self.settings_manager.get_int_setting('General', 'data_store_max_points', fallback=1000)))
+        self.gauge_max_fps_edit.setText(str(self.settings_manager.get_int_setting('UI', 'gauge_max_fps', fallback=DEFAULT_MAX_FPS)))
         self.alert_sound_checkbox.setChecked(self.settings_manager.get_boolean_setting('General', 'alert_sound_enabled', fallback=True))
         self.data_log_enabled_checkbox.setChecked(self.settings_manager.get_boolean_setting('General', 'data_log_enabled', fallback=False))
+        self.data_log_binary_checkbox.setChecked(self.settings_manager.get_boolean_setting('General', 'data_log_binary_enabled', fallback=True))
+
+        sensor_options = self.settings_manager.get_sensor_options()
+        self.bh1750_mode_combo.blockSignals(True)
+        self.bh1750_mode_combo.setCurrentIndex(max(self.bh1750_mode_combo.findData(sensor_options['BH1750']['mode']), 0))
+        self.bh1750_mode_combo.blockSignals(False)
+        self.bh1750_mtreg_edit.setText(str(sensor_options['BH1750']['mtreg']))
+        self.htu21d_resolution_combo.blockSignals(True)
+        self.htu21d_resolution_combo.setCurrentIndex(max(self.htu21d_resolution_combo.findData(sensor_options['HTU21D']['resolution']), 0))
+        self.htu21d_resolution_combo.blockSignals(False)
+        self.bmp180_oversampling_combo.blockSignals(True)
+        self.bmp180_oversampling_combo.setCurrentIndex(max(self.bmp180_oversampling_combo.findData(sensor_options['BMP180']['oversampling']), 0))
+        self.bmp180_oversampling_combo.blockSignals(False)
+        self.bmp180_temperature_every_edit.setText(str(sensor_options['BMP180']['temperature_every']))
+        self.bmp180_pipeline_checkbox.blockSignals(True)
+        self.bmp180_pipeline_checkbox.setChecked(sensor_options['BMP180']['pipeline_pressure'])
+        self.bmp180_pipeline_checkbox.blockSignals(False)
         
         for key, checkbox in self.sensor_config_widgets.items():
             if isinstance(key, str): 
@@ -349,8 +429,18 @@ class SettingsTab(QWidget):
         self.settings_manager.set_setting('General', 'mock_mode', self.mock_mode_checkbox.isChecked())
         self.settings_manager.set_setting('General', 'sampling_rate_ms', self.sampling_rate_edit.text())
         self.settings_manager.set_setting('General', 'data_store_max_points', self.data_store_max_points_edit.text())
+        self.settings_manager.set_setting('UI', 'gauge_max_fps', self.gauge_max_fps_edit.text())
         self.settings_manager.set_setting('General', 'alert_sound_enabled', self.alert_sound_checkbox.isChecked())
         self.settings_manager.set_setting('General', 'data_log_enabled', self.data_log_enabled_checkbox.isChecked())
+        self.settings_manager.set_setting('General', 'data_log_binary_enabled', self.data_log_binary_checkbox.isChecked())
+
+        # Apply Sensor Hardware
+        self.settings_manager.set_setting('Sensor_Hardware', 'bh1750_mode', self.bh1750_mode_combo.currentData())
+        self.settings_manager.set_setting('Sensor_Hardware', 'bh1750_mtreg', self.bh1750_mtreg_edit.text())
+        self.settings_manager.set_setting('Sensor_Hardware', 'htu21d_resolution', self.htu21d_resolution_combo.currentData())
+        self.settings_manager.set_setting('Sensor_Hardware', 'bmp180_oversampling', self.bmp180_oversampling_combo.currentData())
+        self.settings_manager.set_setting('Sensor_Hardware', 'bmp180_temperature_every', self.bmp180_temperature_every_edit.text())
+        self.settings_manager.set_setting('Sensor_Hardware', 'bmp180_pipeline_pressure', self.bmp180_pipeline_checkbox.isChecked())
         
         # Apply Sensor Presence
         for key, checkbox in self.sensor_config_widgets.items():
@@ -430,6 +520,34 @@ class SettingsTab(QWidget):
         logger.debug(f"SettingsTab: Data logging enabled changed to {checked}.")
         self.settings_manager.set_setting('General', 'data_log_enabled', checked)
 
+    @pyqtSlot(bool)
+    def _on_data_log_binary_changed(self, checked):
+        logger.debug(f"SettingsTab: Binary data logging enabled changed to {checked}.")
+        self.settings_manager.set_setting('General', 'data_log_binary_enabled', checked)
+
+    @pyqtSlot(int)
+    def _on_bh1750_mode_changed(self, index):
+        mode = self.bh1750_mode_combo.itemData(index)
+        logger.debug(f"SettingsTab: BH1750 measurement mode changed to {mode}.")
+        self.settings_manager.set_setting('Sensor_Hardware', 'bh1750_mode', mode)
+
+    @pyqtSlot(int)
+    def _on_htu21d_resolution_changed(self, index):
+        resolution = self.htu21d_resolution_combo.itemData(index)
+        logger.debug(f"SettingsTab: HTU21D resolution changed to {resolution}.")
+        self.settings_manager.set_setting('Sensor_Hardware', 'htu21d_resolution', resolution)
+
+    @pyqtSlot(int)
+    def _on_bmp180_oversampling_changed(self, index):
+        oversampling = self.bmp180_oversampling_combo.itemData(index)
+        logger.debug(f"SettingsTab: BMP180 oversampling changed to {oversampling}.")
+        self.settings_manager.set_setting('Sensor_Hardware', 'bmp180_oversampling', oversampling)
+
+    @pyqtSlot(bool)
+    def _on_bmp180_pipeline_changed(self, checked):
+        logger.debug(f"SettingsTab: BMP180 pressure pipelining changed to {checked}.")
+        self.settings_manager.set_setting('Sensor_Hardware', 'bmp180_pipeline_pressure', checked)
+
     @pyqtSlot(str, int)
     def _on_sensor_presence_changed(self, sensor_type, state):
         is_present = (state == Qt.Checked)
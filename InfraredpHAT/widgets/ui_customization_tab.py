@@ -15,6 +15,7 @@ import collections
 from data_management.settings import SettingsManager
 from widgets.sensor_display import SensorDisplayWidget 
 from widgets.matplotlib_widget import MatplotlibWidget 
+from widgets.plot_decimation import DECIMATION_METHODS, DECIMATION_MINMAX
 
 logger = logging.getLogger(__name__)
 
@@ -146,6 +147,11 @@ class UICustomizationTab(QWidget):
         self.notification_method_combo.setCurrentText(self.settings_manager.get_setting('General', 'notification_method', fallback='Status Bar'))
         general_ui_layout.addRow("Notification Method:", self.notification_method_combo)
 
+        self.plot_decimation_combo = QComboBox()
+        self.plot_decimation_combo.addItems(DECIMATION_METHODS)
+        self.plot_decimation_combo.setCurrentText(self.settings_manager.get_setting('UI', 'plot_decimation', fallback=DECIMATION_MINMAX))
+        general_ui_layout.addRow("Plot Decimation:", self.plot_decimation_combo)
+
         main_layout.addWidget(general_ui_group)
 
         # --- Theme Selection Section ---
@@ -181,6 +187,9 @@ class UICustomizationTab(QWidget):
         self.notification_method_combo.currentTextChanged.connect(
             lambda text: self.settings_manager.set_setting('General', 'notification_method', text)
         )
+        self.plot_decimation_combo.currentTextChanged.connect(
+            lambda text: self.settings_manager.set_setting('UI', 'plot_decimation', text)
+        )
         self.settings_manager.settings_updated.connect(self._on_settings_updated)
 
     @pyqtSlot(dict)